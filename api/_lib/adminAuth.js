@@ -0,0 +1,122 @@
+// Shared helper - admin session tokens for every admin endpoint
+//
+// Tokens are JWTs signed with ADMIN_SESSION_SECRET. A verified token is kept in
+// a small LRU keyed by its SHA-256, so dashboard calls repeating the same token
+// skip the HMAC check and JSON decode. Cached entries still expire at the
+// token's exp, and revoked tokens are refused whether cached or not. Setting
+// ADMIN_SESSIONS_SINCE (ISO date) revokes every token issued before it, on all
+// instances.
+import crypto from 'crypto';
+import jwt from 'jsonwebtoken';
+
+const MAX_CACHED_TOKENS = 256;
+// Even long-lived tokens are verified again at least this often
+const MAX_CACHE_MS = 5 * 60 * 1000;
+const SESSION_LIFETIME = '24h';
+
+const verified = new Map(); // token hash -> { payload, expiresAt }, least recently used first
+const revoked = new Map(); // token hash -> expiresAt
+
+export function sessionSecret() {
+  return process.env.ADMIN_SESSION_SECRET || 'default-secret-change-me';
+}
+
+export function signAdminToken(claims = {}) {
+  return jwt.sign({ ...claims, admin: true }, sessionSecret(), { expiresIn: SESSION_LIFETIME });
+}
+
+function tokenHash(token) {
+  return crypto.createHash('sha256').update(token).digest('base64url');
+}
+
+export function bearerToken(req) {
+  const authHeader = req.headers.authorization;
+  return authHeader?.startsWith('Bearer ') ? authHeader.substring(7) : null;
+}
+
+function issuedTooEarly(payload) {
+  const since = Date.parse(process.env.ADMIN_SESSIONS_SINCE || '');
+  return !Number.isNaN(since) && (payload.iat || 0) * 1000 < since;
+}
+
+function pruneRevoked(now) {
+  revoked.forEach((expiresAt, hash) => {
+    if (expiresAt <= now) {
+      revoked.delete(hash);
+    }
+  });
+}
+
+// The admin claims of a valid, unexpired, unrevoked token, or null
+export function verifyAdminToken(token) {
+  if (!token) {
+    return null;
+  }
+
+  const now = Date.now();
+  const hash = tokenHash(token);
+
+  if (revoked.has(hash)) {
+    return null;
+  }
+
+  const cached = verified.get(hash);
+  if (cached) {
+    verified.delete(hash);
+    if (cached.expiresAt > now && !issuedTooEarly(cached.payload)) {
+      verified.set(hash, cached);
+      return cached.payload;
+    }
+    return null;
+  }
+
+  let payload;
+  try {
+    payload = jwt.verify(token, sessionSecret());
+  } catch {
+    return null;
+  }
+
+  if (payload.admin !== true || issuedTooEarly(payload)) {
+    return null;
+  }
+
+  // Cached entries never outlive the token itself
+  const expiresAt = Math.min(payload.exp ? payload.exp * 1000 : Infinity, now + MAX_CACHE_MS);
+  verified.set(hash, { payload, expiresAt });
+  if (verified.size > MAX_CACHED_TOKENS) {
+    verified.delete(verified.keys().next().value);
+  }
+
+  return payload;
+}
+
+export function verifyAdminRequest(req) {
+  return verifyAdminToken(bearerToken(req));
+}
+
+// Sends a 401 and returns null unless the request carries a valid admin token
+export function requireAdmin(req, res) {
+  const admin = verifyAdminRequest(req);
+  if (!admin) {
+    res.status(401).json({ error: 'Unauthorized' });
+  }
+  return admin;
+}
+
+// Refuses the request's token from now on (on this instance) until it would have expired anyway
+export function revokeAdminRequest(req) {
+  const token = bearerToken(req);
+  const payload = token ? verifyAdminToken(token) : null;
+
+  if (!payload) {
+    return false;
+  }
+
+  const now = Date.now();
+  const hash = tokenHash(token);
+  pruneRevoked(now);
+  verified.delete(hash);
+  revoked.set(hash, payload.exp ? payload.exp * 1000 : now + 24 * 60 * 60 * 1000);
+  return true;
+}
@@ -0,0 +1,14 @@
+// Shared helper - worker thread for bcrypt comparisons (see passwordCheck.js)
+//
+// bcryptjs is pure JavaScript, so a single compare can hold a CPU for a good
+// fraction of a second. Running it here keeps the request thread responsive.
+import bcrypt from 'bcryptjs';
+import { parentPort } from 'worker_threads';
+
+parentPort.on('message', ({ id, password, hash }) => {
+  try {
+    parentPort.postMessage({ id, match: bcrypt.compareSync(password, hash) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,210 @@
+// Shared helper - versioned site configuration on top of a kvStore
+//
+// Every write stores the whole configuration as a new numbered version and
+// then moves a head pointer to it with compare-and-set, so concurrent admins
+// cannot overwrite each other unnoticed. A save is built from the exact version
+// it replaces, never from a cached read. Rolling back only moves the pointer
+// to a version that is still kept. Reads go through a short per-instance cache,
+// so a change reaches every instance within ADMIN_CONFIG_CACHE_MS without a
+// rebuild.
+//
+//   <prefix>:head  -> { version, latest, updatedAt, rolledBackFrom? }
+//   <prefix>:v:<n> -> { version, config, updatedAt }
+import { createKvStore, defaultStoreKind } from './kvStore.js';
+
+const KEEP_VERSIONS = 20;
+const DEFAULT_CACHE_MS = 3000;
+// Unconditional saves that keep losing races give up with a conflict after this many
+const MAX_WRITE_ATTEMPTS = 3;
+// Far longer than a writer takes between claiming a version and moving the head to it
+const ORPHANED_SLOT_MS = 30 * 1000;
+
+export class ConfigConflictError extends Error {
+  constructor(currentVersion) {
+    super(`Configuration is at version ${currentVersion}`);
+    this.code = 'CONFIG_CONFLICT';
+    this.currentVersion = currentVersion;
+  }
+}
+
+export class ConfigStore {
+  constructor({ store, prefix = 'site-config', keep = KEEP_VERSIONS, cacheMs = DEFAULT_CACHE_MS }) {
+    this.store = store;
+    this.prefix = prefix;
+    this.keep = keep;
+    this.cacheMs = cacheMs;
+    this.cached = null; // { at, value }
+  }
+
+  headKey() {
+    return `${this.prefix}:head`;
+  }
+
+  versionKey(version) {
+    return `${this.prefix}:v:${version}`;
+  }
+
+  // { version, config, updatedAt }; version 0 with a null config before the first write
+  async read() {
+    if (this.cached && Date.now() - this.cached.at < this.cacheMs) {
+      return this.cached.value;
+    }
+
+    const head = await this.store.get(this.headKey());
+    const stored = head ? await this.store.get(this.versionKey(head.version)) : undefined;
+    const value = stored || { version: 0, config: null, updatedAt: null };
+
+    this.remember(value);
+    return value;
+  }
+
+  remember(value) {
+    this.cached = { at: Date.now(), value };
+  }
+
+  async currentHead(expectedVersion) {
+    const head = await this.store.get(this.headKey());
+    const current = head ? head.version : 0;
+
+    if (expectedVersion !== undefined && expectedVersion !== current) {
+      throw new ConfigConflictError(current);
+    }
+    return head;
+  }
+
+  /**
+   * Stores update(current) as a new version, where current is the config of
+   * the version being replaced (null before the first write), read from the
+   * store rather than the cache. With expectedVersion, fails with
+   * ConfigConflictError unless that is still the current version; without it,
+   * a write that loses a race is rebuilt on top of the winner.
+   */
+  async write(update, expectedVersion) {
+    for (let attempt = 1; ; attempt++) {
+      const head = await this.currentHead(expectedVersion);
+      const current = head ? await this.store.get(this.versionKey(head.version)) : undefined;
+      const entry = await this.append(head, update(current ? current.config : null));
+
+      if (entry) {
+        this.remember(entry);
+        return entry;
+      }
+      if (expectedVersion !== undefined || attempt >= MAX_WRITE_ATTEMPTS) {
+        const latest = await this.store.get(this.headKey());
+        throw new ConfigConflictError(latest ? latest.version : 0);
+      }
+    }
+  }
+
+  // The stored entry, or null when another writer moved the head first
+  async append(head, config) {
+    const version = (head ? head.latest : 0) + 1;
+    const updatedAt = new Date().toISOString();
+    const entry = { version, config, updatedAt };
+
+    // Claim the slot first: a writer that loses the race never touches another's version
+    if (!(await this.claim(version, entry))) {
+      return null;
+    }
+
+    // The head still being the one read above means config was built on the current version
+    let moved;
+    try {
+      moved = await this.store.compareAndSet(this.headKey(), head, { version, latest: version, updatedAt });
+    } catch (error) {
+      // A claimed slot left behind would block every later save
+      await this.store.delete(this.versionKey(version)).catch(() => undefined);
+      throw error;
+    }
+
+    if (!moved) {
+      await this.store.delete(this.versionKey(version));
+      return null;
+    }
+
+    // Only the version that just fell out of the window needs deleting
+    if (version > this.keep) {
+      await this.store.delete(this.versionKey(version - this.keep)).catch(() => undefined);
+    }
+    return entry;
+  }
+
+  // Takes the slot for version. A slot above the head that is older than
+  // ORPHANED_SLOT_MS belongs to a writer that died before moving the head (or
+  // before releasing the slot), so it is taken over instead of blocking saves.
+  async claim(version, entry) {
+    const key = this.versionKey(version);
+    if (await this.store.compareAndSet(key, undefined, entry)) {
+      return true;
+    }
+
+    const held = await this.store.get(key);
+    if (!held || Date.now() - Date.parse(held.updatedAt) < ORPHANED_SLOT_MS) {
+      return false;
+    }
+
+    const head = await this.store.get(this.headKey());
+    if ((head ? head.latest : 0) >= version) {
+      return false;
+    }
+    return this.store.compareAndSet(key, held, entry);
+  }
+
+  // Makes a kept earlier version current again without copying it
+  async rollback(toVersion, expectedVersion) {
+    const head = await this.currentHead(expectedVersion);
+    const target = head && toVersion >= head.latest - this.keep + 1
+      ? await this.store.get(this.versionKey(toVersion))
+      : undefined;
+
+    if (!target) {
+      return null;
+    }
+
+    const moved = await this.store.compareAndSet(this.headKey(), head, {
+      version: toVersion,
+      latest: head.latest,
+      updatedAt: new Date().toISOString(),
+      rolledBackFrom: head.version
+    });
+
+    if (!moved) {
+      const latest = await this.store.get(this.headKey());
+      throw new ConfigConflictError(latest ? latest.version : 0);
+    }
+
+    this.remember(target);
+    return target;
+  }
+
+  // Kept versions, newest first, without their contents
+  async history() {
+    const head = await this.store.get(this.headKey());
+    if (!head) {
+      return [];
+    }
+
+    const versions = [];
+    for (let version = head.latest; version > Math.max(0, head.latest - this.keep); version--) {
+      versions.push(version);
+    }
+
+    const entries = await Promise.all(versions.map(version => this.store.get(this.versionKey(version))));
+    return entries
+      .filter(Boolean)
+      .map(({ version, updatedAt }) => ({ version, updatedAt, current: version === head.version }));
+  }
+}
+
+let configStore = null;
+
+// ADMIN_CONFIG_STORE picks the backing store: 'kv' in production (the default on Vercel), 'file' locally (the default elsewhere)
+export function getConfigStore() {
+  if (!configStore) {
+    configStore = new ConfigStore({
+      store: createKvStore('ADMIN_CONFIG_STORE', 'ADMIN_CONFIG_FILE', 'admin-config.json', defaultStoreKind()),
+      cacheMs: parseInt(process.env.ADMIN_CONFIG_CACHE_MS) || DEFAULT_CACHE_MS
+    });
+  }
+  return configStore;
+}
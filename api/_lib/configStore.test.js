@@ -0,0 +1,152 @@
+// Tests for the versioned config store; run with `npm run test:api`
+import assert from 'node:assert/strict';
+import { describe, it } from 'node:test';
+import { ConfigStore } from './configStore.js';
+import { MemoryKvStore } from './kvStore.js';
+
+const newStore = (options = {}) => new ConfigStore({ store: new MemoryKvStore(), cacheMs: 0, ...options });
+
+describe('ConfigStore', () => {
+  it('starts empty at version 0', async () => {
+    assert.deepEqual(await newStore().read(), { version: 0, config: null, updatedAt: null });
+  });
+
+  it('builds each version from the config it replaces', async () => {
+    const store = newStore();
+    await store.write(current => {
+      assert.equal(current, null);
+      return { siteName: 'A' };
+    });
+    const saved = await store.write(current => ({ ...current, tagline: 'T' }));
+
+    assert.equal(saved.version, 2);
+    assert.deepEqual((await store.read()).config, { siteName: 'A', tagline: 'T' });
+  });
+
+  it('refuses a write against a version that is no longer current', async () => {
+    const store = newStore();
+    await store.write(() => ({ n: 1 }), 0);
+
+    await assert.rejects(store.write(() => ({ n: 2 }), 0), { code: 'CONFIG_CONFLICT', currentVersion: 1 });
+    assert.deepEqual((await store.read()).config, { n: 1 });
+  });
+
+  it('lets exactly one of several racing conditional writes win', async () => {
+    const store = newStore();
+    const results = await Promise.allSettled([1, 2, 3].map(n => store.write(() => ({ n }), 0)));
+
+    assert.equal(results.filter(result => result.status === 'fulfilled').length, 1);
+    results
+      .filter(result => result.status === 'rejected')
+      .forEach(result => assert.equal(result.reason.code, 'CONFIG_CONFLICT'));
+    assert.deepEqual((await store.history()).map(({ version }) => version), [1]);
+  });
+
+  it('rebuilds racing unconditional writes on top of each other', async () => {
+    const store = newStore();
+    await Promise.all(['a', 'b', 'c'].map(key => store.write(current => ({ ...current, [key]: true }))));
+
+    const { version, config } = await store.read();
+    assert.equal(version, 3);
+    assert.deepEqual(config, { a: true, b: true, c: true });
+  });
+
+  it('does not revert another instance\'s save from a stale cache', async () => {
+    const shared = new MemoryKvStore();
+    const first = new ConfigStore({ store: shared, cacheMs: 60000 });
+    const second = new ConfigStore({ store: shared, cacheMs: 60000 });
+
+    await first.write(() => ({ siteName: 'base', tagline: 'base' }));
+    await first.read();
+    await second.write(current => ({ ...current, tagline: 'second' }));
+    await first.write(current => ({ ...current, siteName: 'first' }));
+
+    assert.deepEqual((await newStore({ store: shared }).read()).config, { siteName: 'first', tagline: 'second' });
+  });
+
+  it('keeps only the last `keep` versions', async () => {
+    const store = newStore({ keep: 3 });
+    for (let n = 1; n <= 6; n++) {
+      await store.write(() => ({ n }));
+    }
+
+    assert.deepEqual((await store.history()).map(({ version }) => version), [6, 5, 4]);
+    assert.equal(await store.store.get(store.versionKey(3)), undefined);
+  });
+
+  it('rolls back within the kept versions only', async () => {
+    const store = newStore({ keep: 3 });
+    for (let n = 1; n <= 6; n++) {
+      await store.write(() => ({ n }));
+    }
+
+    assert.equal(await store.rollback(3), null);
+    assert.equal(await store.rollback(7), null);
+
+    const restored = await store.rollback(4);
+    assert.deepEqual(restored.config, { n: 4 });
+    assert.equal((await store.read()).version, 4);
+    assert.deepEqual((await store.history()).map(({ version, current }) => [version, current]), [[6, false], [5, false], [4, true]]);
+  });
+
+  it('refuses a rollback against a version that is no longer current', async () => {
+    const store = newStore();
+    await store.write(() => ({ n: 1 }));
+    await store.write(() => ({ n: 2 }));
+
+    await assert.rejects(store.rollback(1, 1), { code: 'CONFIG_CONFLICT', currentVersion: 2 });
+    assert.equal((await store.read()).version, 2);
+  });
+
+  it('saves after a rollback on top of the restored version, numbered past the latest', async () => {
+    const store = newStore();
+    await store.write(() => ({ siteName: 'one' }));
+    await store.write(current => ({ ...current, tagline: 'two' }));
+    await store.rollback(1, 2);
+
+    const saved = await store.write(current => ({ ...current, theme: 'dark' }), 1);
+    assert.equal(saved.version, 3);
+    assert.deepEqual(saved.config, { siteName: 'one', theme: 'dark' });
+  });
+
+  it('releases the claimed version when moving the head fails', async () => {
+    const kv = new MemoryKvStore();
+    const store = newStore({ store: kv });
+    await store.write(() => ({ n: 1 }));
+
+    const compareAndSet = kv.compareAndSet.bind(kv);
+    let failures = 1;
+    kv.compareAndSet = (key, ...rest) => {
+      if (key === store.headKey() && failures-- > 0) {
+        return Promise.reject(new Error('network'));
+      }
+      return compareAndSet(key, ...rest);
+    };
+
+    await assert.rejects(store.write(() => ({ n: 2 })), /network/);
+    assert.equal(await kv.get(store.versionKey(2)), undefined);
+
+    const saved = await store.write(() => ({ n: 2 }), 1);
+    assert.equal(saved.version, 2);
+  });
+
+  it('takes over a version slot its writer abandoned', async () => {
+    const store = newStore();
+    await store.write(() => ({ n: 1 }));
+    // A writer that died between claiming version 2 and moving the head
+    await store.store.set(store.versionKey(2), { version: 2, config: { n: 'lost' }, updatedAt: new Date(Date.now() - 60000).toISOString() });
+
+    const saved = await store.write(() => ({ n: 2 }), 1);
+    assert.equal(saved.version, 2);
+    assert.deepEqual((await store.read()).config, { n: 2 });
+  });
+
+  it('leaves a freshly claimed slot to its writer', async () => {
+    const store = newStore();
+    await store.write(() => ({ n: 1 }));
+    await store.store.set(store.versionKey(2), { version: 2, config: { n: 'busy' }, updatedAt: new Date().toISOString() });
+
+    await assert.rejects(store.write(() => ({ n: 2 }), 1), { code: 'CONFIG_CONFLICT' });
+    assert.deepEqual((await store.store.get(store.versionKey(2))).config, { n: 'busy' });
+  });
+});
@@ -0,0 +1,100 @@
+// Shared helper - size-bounded LRU cache of files on local disk
+//
+// The index lives in memory and is rebuilt from file mtimes on a cold start;
+// hits bump the mtime so recency survives instance restarts.
+import { promises as fs } from 'fs';
+import path from 'path';
+
+export class DiskLru {
+  constructor({ dir, maxBytes }) {
+    this.dir = dir;
+    this.maxBytes = maxBytes;
+    this.entries = new Map(); // key -> size, least recently used first
+    this.totalBytes = 0;
+    this.ready = null;
+  }
+
+  async init() {
+    if (!this.ready) {
+      this.ready = this.scan();
+    }
+    return this.ready;
+  }
+
+  async scan() {
+    await fs.mkdir(this.dir, { recursive: true });
+    const names = await fs.readdir(this.dir);
+    const stats = await Promise.all(names.map(async name => {
+      const stat = await fs.stat(path.join(this.dir, name));
+      return { name, size: stat.size, mtime: stat.mtimeMs };
+    }));
+
+    stats
+      .sort((a, b) => a.mtime - b.mtime)
+      .forEach(({ name, size }) => {
+        this.entries.set(name, size);
+        this.totalBytes += size;
+      });
+  }
+
+  filePath(key) {
+    return path.join(this.dir, key);
+  }
+
+  async get(key) {
+    await this.init();
+
+    if (!this.entries.has(key)) {
+      return null;
+    }
+
+    try {
+      const data = await fs.readFile(this.filePath(key));
+      const size = this.entries.get(key);
+      this.entries.delete(key);
+      this.entries.set(key, size);
+
+      const now = new Date();
+      fs.utimes(this.filePath(key), now, now).catch(() => {});
+      return data;
+    } catch {
+      this.remove(key);
+      return null;
+    }
+  }
+
+  async set(key, data) {
+    await this.init();
+
+    await fs.writeFile(this.filePath(key), data);
+    if (this.entries.has(key)) {
+      this.totalBytes -= this.entries.get(key);
+      this.entries.delete(key);
+    }
+    this.entries.set(key, data.length);
+    this.totalBytes += data.length;
+
+    await this.evict();
+  }
+
+  remove(key) {
+    if (this.entries.has(key)) {
+      this.totalBytes -= this.entries.get(key);
+      this.entries.delete(key);
+    }
+    return fs.unlink(this.filePath(key)).catch(() => {});
+  }
+
+  async evict() {
+    const victims = [];
+    for (const [key] of this.entries) {
+      if (this.totalBytes <= this.maxBytes) {
+        break;
+      }
+      victims.push(key);
+      this.totalBytes -= this.entries.get(key);
+      this.entries.delete(key);
+    }
+    await Promise.all(victims.map(key => fs.unlink(this.filePath(key)).catch(() => {})));
+  }
+}
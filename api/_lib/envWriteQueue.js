@@ -0,0 +1,264 @@
+// Shared helper - write-behind queue for settings mirrored into env vars
+//
+// Every dashboard field maps to its own ADMIN_* env var, and each env change
+// needs a rebuild to reach the static site. Instead of writing (and deploying)
+// per save, updates are merged until the admin has been quiet for
+// ADMIN_ENV_WRITE_WINDOW_MS, then written in one batch, and a rebuild runs at
+// most once per ADMIN_REBUILD_INTERVAL_MS. A session of N quick edits costs
+// one write and one deploy.
+//
+// The pending updates and the rebuild deadline live in one record in the same
+// shared kvStore as the variables, changed with compare-and-set, so every
+// instance adds to the same batch and a frozen or recycled instance loses
+// nothing. Saves call flushDue() to write whatever is due, which costs one
+// read when nothing is; reads call flushIfDue(), which only touches the store
+// once a deadline this instance has seen has passed. A timer on a warm
+// instance does the same without waiting for the next request.
+//
+// The env store here is a local stand-in (a kvStore holding the variables);
+// the rebuild POSTs to ADMIN_DEPLOY_HOOK_URL when set and is only logged
+// otherwise.
+import crypto from 'crypto';
+import { createKvStore, defaultStoreKind } from './kvStore.js';
+
+const DEFAULT_WINDOW_MS = 5000;
+// A steady stream of edits still gets written at least this often
+const MAX_WAIT_WINDOWS = 6;
+const DEFAULT_REBUILD_INTERVAL_MS = 60 * 1000;
+const ENV_KEY = 'env';
+const QUEUE_KEY = 'env-queue';
+// A flush that has not finished by then is assumed dead and its batch is queued again
+const FLUSH_LEASE_MS = 30 * 1000;
+// Compare-and-set retries before giving up on a record other writers keep changing
+const MAX_CAS_ATTEMPTS = 10;
+
+const EMPTY_QUEUE = { pending: {}, firstQueuedAt: null, lastQueuedAt: null, inFlight: null, rebuildDueAt: null, lastRebuildAt: 0 };
+
+// Applies change to the record at key, retrying on a lost race. change returns
+// the next value, or null to leave it alone. Resolves to { value, changed }.
+async function updateRecord(store, key, change, fallback) {
+  for (let attempt = 0; attempt < MAX_CAS_ATTEMPTS; attempt++) {
+    const current = await store.get(key);
+    const next = change(current === undefined ? fallback : current);
+    if (next === null) {
+      return { value: current === undefined ? fallback : current, changed: false };
+    }
+    if (await store.compareAndSet(key, current, next)) {
+      return { value: next, changed: true };
+    }
+  }
+  throw new Error(`${key} kept changing underneath, gave up after ${MAX_CAS_ATTEMPTS} attempts`);
+}
+
+// The ADMIN_* variables that hold the given settings (a full config or just the changed part)
+export function envUpdatesFor({ siteName, tagline, theme, colors, scraper, feeds } = {}) {
+  const updates = {};
+
+  if (siteName) updates.ADMIN_SITE_NAME = siteName;
+  if (tagline) updates.ADMIN_TAGLINE = tagline;
+  if (theme) updates.ADMIN_THEME = theme;
+  if (colors?.primary) updates.ADMIN_PRIMARY_COLOR = colors.primary;
+  if (colors?.secondary) updates.ADMIN_SECONDARY_COLOR = colors.secondary;
+  if (colors?.accent) updates.ADMIN_ACCENT_COLOR = colors.accent;
+  if (scraper?.discountThreshold !== undefined) updates.ADMIN_DISCOUNT_THRESHOLD = scraper.discountThreshold.toString();
+  if (scraper?.amazonTag) updates.ADMIN_AMAZON_TAG = scraper.amazonTag;
+  if (scraper?.enabled !== undefined) updates.ADMIN_SCRAPER_ENABLED = scraper.enabled.toString();
+  if (feeds) updates.ADMIN_FEEDS = JSON.stringify(feeds);
+
+  return updates;
+}
+
+// Local stand-in for the hosting provider's env API: one call sets many variables
+export class LocalEnvStore {
+  constructor(store) {
+    this.store = store;
+  }
+
+  async read() {
+    return (await this.store.get(ENV_KEY)) || {};
+  }
+
+  // Retried on a lost race so batches from two instances both land
+  async setMany(updates) {
+    await updateRecord(this.store, ENV_KEY, current => ({ ...current, ...updates }), {});
+  }
+}
+
+async function triggerDeployHook() {
+  const hookUrl = process.env.ADMIN_DEPLOY_HOOK_URL;
+  if (!hookUrl) {
+    console.log('Would trigger rebuild (ADMIN_DEPLOY_HOOK_URL not set)');
+    return;
+  }
+
+  const response = await fetch(hookUrl, { method: 'POST' });
+  if (!response.ok) {
+    throw new Error(`Deploy hook failed: ${response.status}`);
+  }
+}
+
+export class EnvWriteQueue {
+  constructor({ store, envStore, rebuild = triggerDeployHook, windowMs = DEFAULT_WINDOW_MS, rebuildIntervalMs = DEFAULT_REBUILD_INTERVAL_MS }) {
+    this.store = store;
+    this.envStore = envStore;
+    this.rebuild = rebuild;
+    this.windowMs = windowMs;
+    this.rebuildIntervalMs = rebuildIntervalMs;
+    this.timer = null;
+    // Earliest deadline in the last queue this instance read, null when none
+    this.dueAt = null;
+  }
+
+  update(change) {
+    return updateRecord(this.store, QUEUE_KEY, change, EMPTY_QUEUE);
+  }
+
+  // Later values for the same variable replace earlier ones; the write waits for a quiet window
+  async enqueue(updates) {
+    if (Object.keys(updates).length === 0) {
+      return;
+    }
+
+    const now = Date.now();
+    const { value } = await this.update(queue => ({
+      ...queue,
+      pending: { ...queue.pending, ...updates },
+      firstQueuedAt: queue.firstQueuedAt || now,
+      lastQueuedAt: now
+    }));
+    this.nudge(value);
+  }
+
+  // A steady stream of edits still gets written once the first has waited MAX_WAIT_WINDOWS
+  flushDueAt(queue) {
+    if (Object.keys(queue.pending).length === 0) {
+      return null;
+    }
+    return Math.min(queue.lastQueuedAt + this.windowMs, queue.firstQueuedAt + this.windowMs * MAX_WAIT_WINDOWS);
+  }
+
+  // The earliest time anything in queue needs a flush: its batch, a rebuild, or an expired lease
+  nextDeadline(queue) {
+    const deadlines = [this.flushDueAt(queue), queue.rebuildDueAt, queue.inFlight && queue.inFlight.until]
+      .filter(deadline => deadline !== null && deadline !== undefined);
+    return deadlines.length === 0 ? null : Math.min(...deadlines);
+  }
+
+  // Writes the pending batch if its window has closed, then rebuilds if one is due
+  async flushDue() {
+    const queue = (await this.store.get(QUEUE_KEY)) || EMPTY_QUEUE;
+    const dueAt = this.nextDeadline(queue);
+    if (dueAt === null || dueAt > Date.now()) {
+      this.nudge(queue);
+      return;
+    }
+
+    await this.flushBatch(Date.now());
+    const { value } = await this.rebuildIfDue(Date.now());
+    this.nudge(value);
+  }
+
+  async flushBatch(now) {
+    const id = crypto.randomUUID();
+    let batch = null;
+
+    await this.update(queue => {
+      batch = null;
+      // A batch whose flush outlived its lease goes out again, under anything queued since
+      const stranded = queue.inFlight && queue.inFlight.until <= now ? queue.inFlight.batch : null;
+      const dueAt = this.flushDueAt(queue);
+      if ((queue.inFlight && !stranded) || (!stranded && (dueAt === null || dueAt > now))) {
+        return null;
+      }
+
+      batch = { ...stranded, ...queue.pending };
+      return { ...queue, pending: {}, firstQueuedAt: null, lastQueuedAt: null, inFlight: { id, batch, until: now + FLUSH_LEASE_MS } };
+    });
+
+    if (!batch) {
+      return;
+    }
+
+    try {
+      await this.envStore.setMany(batch);
+    } catch (error) {
+      // Keep the batch, under anything queued meanwhile, for the next window
+      await this.update(queue => ({
+        ...queue,
+        inFlight: queue.inFlight?.id === id ? null : queue.inFlight,
+        pending: { ...batch, ...queue.pending },
+        firstQueuedAt: queue.firstQueuedAt || now,
+        lastQueuedAt: queue.lastQueuedAt || now
+      }));
+      throw error;
+    }
+
+    // At most one rebuild per interval; writes in between share the next one
+    await this.update(queue => ({
+      ...queue,
+      inFlight: queue.inFlight?.id === id ? null : queue.inFlight,
+      rebuildDueAt: queue.rebuildDueAt || Math.max(now, queue.lastRebuildAt + this.rebuildIntervalMs)
+    }));
+  }
+
+  async rebuildIfDue(now) {
+    const claimed = await this.update(queue =>
+      queue.rebuildDueAt !== null && queue.rebuildDueAt <= now ? { ...queue, rebuildDueAt: null, lastRebuildAt: now } : null
+    );
+
+    if (!claimed.changed) {
+      return claimed;
+    }
+
+    try {
+      await this.rebuild();
+    } catch (error) {
+      await this.update(queue => ({ ...queue, rebuildDueAt: queue.rebuildDueAt || now + this.rebuildIntervalMs }));
+      throw error;
+    }
+    return claimed;
+  }
+
+  // flushDue without the store round trip unless this instance knows something is overdue,
+  // for a frozen instance whose timer never fired
+  flushIfDue() {
+    if (this.dueAt === null || this.dueAt > Date.now()) {
+      return Promise.resolve();
+    }
+    return this.flushDue();
+  }
+
+  // Best effort on a warm instance: runs flushDue at the next deadline in queue
+  nudge(queue) {
+    this.dueAt = this.nextDeadline(queue);
+
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.dueAt === null) {
+      return;
+    }
+
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.flushDue().catch(error => console.error('Env write-behind failed:', error));
+    }, Math.max(0, this.dueAt - Date.now()));
+    this.timer.unref?.();
+  }
+}
+
+let envWriteQueue = null;
+
+// ADMIN_ENV_STORE picks where the stand-in env vars and the queue are kept; it
+// defaults to the config store's kind (ADMIN_ENV_FILE when that is 'file')
+export function getEnvWriteQueue() {
+  if (!envWriteQueue) {
+    const store = createKvStore('ADMIN_ENV_STORE', 'ADMIN_ENV_FILE', 'admin-env.json', process.env.ADMIN_CONFIG_STORE || defaultStoreKind());
+    envWriteQueue = new EnvWriteQueue({
+      store,
+      envStore: new LocalEnvStore(store),
+      windowMs: parseInt(process.env.ADMIN_ENV_WRITE_WINDOW_MS) || DEFAULT_WINDOW_MS,
+      rebuildIntervalMs: parseInt(process.env.ADMIN_REBUILD_INTERVAL_MS) || DEFAULT_REBUILD_INTERVAL_MS
+    });
+  }
+  return envWriteQueue;
+}
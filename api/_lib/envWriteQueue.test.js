@@ -0,0 +1,80 @@
+// Tests for the env var write-behind queue; run with `npm run test:api`
+import assert from 'node:assert/strict';
+import { describe, it } from 'node:test';
+import { EnvWriteQueue, LocalEnvStore } from './envWriteQueue.js';
+import { MemoryKvStore } from './kvStore.js';
+
+// A MemoryKvStore that counts the calls made to it
+function countingStore() {
+  const store = new MemoryKvStore();
+  store.calls = 0;
+  ['get', 'set', 'delete', 'compareAndSet'].forEach(method => {
+    const call = store[method].bind(store);
+    store[method] = (...args) => {
+      store.calls++;
+      return call(...args);
+    };
+  });
+  return store;
+}
+
+function newQueue(options = {}) {
+  const store = countingStore();
+  const rebuilds = [];
+  const queue = new EnvWriteQueue({
+    store,
+    envStore: new LocalEnvStore(store),
+    rebuild: async () => rebuilds.push(Date.now()),
+    windowMs: 0,
+    rebuildIntervalMs: 0,
+    ...options
+  });
+  return { queue, store, rebuilds };
+}
+
+describe('EnvWriteQueue', () => {
+  it('reads the queue once when nothing is due', async () => {
+    const { queue, store } = newQueue();
+    await queue.flushDue();
+    assert.equal(store.calls, 1);
+  });
+
+  it('leaves the store alone on flushIfDue until a known deadline passes', async () => {
+    const { queue, store } = newQueue({ windowMs: 60000 });
+    await queue.flushIfDue();
+    assert.equal(store.calls, 0);
+
+    await queue.enqueue({ ADMIN_SITE_NAME: 'A' });
+    clearTimeout(queue.timer);
+    const calls = store.calls;
+    await queue.flushIfDue();
+    assert.equal(store.calls, calls);
+  });
+
+  it('writes a due batch and rebuilds once', async () => {
+    const { queue, store, rebuilds } = newQueue();
+    await queue.enqueue({ ADMIN_SITE_NAME: 'A' });
+    await queue.enqueue({ ADMIN_TAGLINE: 'T' });
+    clearTimeout(queue.timer);
+
+    await queue.flushIfDue();
+    assert.deepEqual(await new LocalEnvStore(store).read(), { ADMIN_SITE_NAME: 'A', ADMIN_TAGLINE: 'T' });
+    assert.equal(rebuilds.length, 1);
+    assert.equal(queue.dueAt, null);
+  });
+
+  it('keeps a batch the env store refused for the next window', async () => {
+    const { queue, store } = newQueue();
+    const envStore = queue.envStore;
+    queue.envStore = { setMany: () => Promise.reject(new Error('env api down')) };
+    await queue.enqueue({ ADMIN_SITE_NAME: 'A' });
+    clearTimeout(queue.timer);
+
+    await assert.rejects(queue.flushDue(), /env api down/);
+    clearTimeout(queue.timer);
+    queue.envStore = envStore;
+    await queue.flushDue();
+    clearTimeout(queue.timer);
+    assert.deepEqual(await new LocalEnvStore(store).read(), { ADMIN_SITE_NAME: 'A' });
+  });
+});
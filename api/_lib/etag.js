@@ -0,0 +1,41 @@
+// Shared helper - JSON responses with ETag revalidation
+//
+// Responses are tagged with a caller-supplied ETag (usually a content hash)
+// and a matching If-None-Match gets an empty 304. Serialized bodies are kept
+// per ETag, so even a full 200 skips JSON.stringify on repeat requests.
+
+const MAX_BODIES = 32;
+const bodies = new Map();
+
+function matches(ifNoneMatch, etag) {
+  if (!ifNoneMatch) {
+    return false;
+  }
+  return ifNoneMatch
+    .split(',')
+    .map(tag => tag.trim().replace(/^W\//, ''))
+    .some(tag => tag === etag || tag === '*');
+}
+
+export function sendJson(req, res, etag, buildBody) {
+  res.setHeader('ETag', etag);
+  // Admin responses depend on the token, so shared caches must not keep them
+  res.setHeader('Cache-Control', 'private, no-cache');
+  res.setHeader('Vary', 'Authorization');
+
+  if (matches(req.headers['if-none-match'], etag)) {
+    return res.status(304).end();
+  }
+
+  let body = bodies.get(etag);
+  if (body === undefined) {
+    body = JSON.stringify(buildBody());
+    if (bodies.size >= MAX_BODIES) {
+      bodies.clear();
+    }
+    bodies.set(etag, body);
+  }
+
+  res.setHeader('Content-Type', 'application/json; charset=utf-8');
+  return res.status(200).send(body);
+}
@@ -0,0 +1,273 @@
+// Shared helper - small key-value stores behind one async interface
+//
+//   get(key)              -> value, or undefined when missing or expired
+//   set(key, value, ttlMs) (ttlMs optional)
+//   delete(key)
+//   compareAndSet(key, expected, value, ttlMs) -> true if the key still held
+//                  expected (undefined meaning absent) and was set (ttlMs optional)
+//
+// Values are anything JSON can hold. MemoryKvStore lives and dies with the
+// function instance. FileKvStore keeps a JSON file, so several local processes
+// or tests share state. RestKvStore talks to a Redis-compatible REST API (Vercel
+// KV / Upstash), which is what production instances share.
+import { promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+
+const MAX_MEMORY_ENTRIES = 10000;
+
+function isLive(entry, now) {
+  return entry && (entry.expiresAt === null || entry.expiresAt > now);
+}
+
+function expiryFor(ttlMs, now) {
+  return ttlMs > 0 ? now + ttlMs : null;
+}
+
+function sameValue(a, b) {
+  return a === undefined || b === undefined ? a === b : JSON.stringify(a) === JSON.stringify(b);
+}
+
+export class MemoryKvStore {
+  constructor() {
+    this.entries = new Map(); // key -> { value, expiresAt }, oldest write first
+  }
+
+  async get(key) {
+    const entry = this.entries.get(key);
+    if (!isLive(entry, Date.now())) {
+      this.entries.delete(key);
+      return undefined;
+    }
+    return entry.value;
+  }
+
+  async set(key, value, ttlMs) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: expiryFor(ttlMs, Date.now()) });
+    // A flood of distinct keys (one per client IP, say) must not grow without bound
+    if (this.entries.size > MAX_MEMORY_ENTRIES) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  async delete(key) {
+    this.entries.delete(key);
+  }
+
+  // No await between the check and the write, so concurrent callers cannot interleave
+  async compareAndSet(key, expected, value, ttlMs) {
+    const now = Date.now();
+    const entry = this.entries.get(key);
+    if (!sameValue(isLive(entry, now) ? entry.value : undefined, expected)) {
+      return false;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: expiryFor(ttlMs, now) });
+    return true;
+  }
+}
+
+export class FileKvStore {
+  constructor(file) {
+    this.file = file;
+    this.queue = Promise.resolve();
+  }
+
+  // Operations in this process run one at a time; each rewrites the file atomically
+  run(operation) {
+    const result = this.queue.then(operation);
+    this.queue = result.catch(() => undefined);
+    return result;
+  }
+
+  async read() {
+    try {
+      return JSON.parse(await fs.readFile(this.file, 'utf8'));
+    } catch (error) {
+      if (error.code === 'ENOENT') {
+        return {};
+      }
+      throw error;
+    }
+  }
+
+  async write(entries) {
+    const now = Date.now();
+    Object.keys(entries).forEach(key => {
+      if (!isLive(entries[key], now)) {
+        delete entries[key];
+      }
+    });
+
+    const temp = `${this.file}.${process.pid}.tmp`;
+    await fs.mkdir(path.dirname(this.file), { recursive: true });
+    await fs.writeFile(temp, JSON.stringify(entries));
+    await fs.rename(temp, this.file);
+  }
+
+  get(key) {
+    return this.run(async () => {
+      const entry = (await this.read())[key];
+      return isLive(entry, Date.now()) ? entry.value : undefined;
+    });
+  }
+
+  set(key, value, ttlMs) {
+    return this.run(async () => {
+      const entries = await this.read();
+      entries[key] = { value, expiresAt: expiryFor(ttlMs, Date.now()) };
+      await this.write(entries);
+    });
+  }
+
+  delete(key) {
+    return this.run(async () => {
+      const entries = await this.read();
+      delete entries[key];
+      await this.write(entries);
+    });
+  }
+
+  // Atomic within this process only, which is all local runs and tests need
+  compareAndSet(key, expected, value, ttlMs) {
+    return this.run(async () => {
+      const now = Date.now();
+      const entries = await this.read();
+      const entry = entries[key];
+      if (!sameValue(isLive(entry, now) ? entry.value : undefined, expected)) {
+        return false;
+      }
+      entries[key] = { value, expiresAt: expiryFor(ttlMs, now) };
+      await this.write(entries);
+      return true;
+    });
+  }
+}
+
+// Sets KEYS[1] to ARGV[2] only if it currently holds ARGV[1] ('' meaning absent),
+// expiring after ARGV[3] milliseconds unless that is '0'
+const COMPARE_AND_SET_SCRIPT = `
+local current = redis.call('GET', KEYS[1])
+if (current == false and ARGV[1] == '') or current == ARGV[1] then
+  if ARGV[3] == '0' then
+    redis.call('SET', KEYS[1], ARGV[2])
+  else
+    redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+  end
+  return 1
+end
+return 0`;
+
+export class RestKvStore {
+  constructor({ url, token }) {
+    this.url = url;
+    this.token = token;
+  }
+
+  async command(args) {
+    const response = await fetch(this.url, {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${this.token}`, 'Content-Type': 'application/json' },
+      body: JSON.stringify(args)
+    });
+    const body = await response.json().catch(() => ({}));
+
+    if (!response.ok || body.error) {
+      throw new Error(`KV ${args[0]} failed: ${body.error || response.status}`);
+    }
+    return body.result;
+  }
+
+  async get(key) {
+    const value = await this.command(['GET', key]);
+    return value === null || value === undefined ? undefined : JSON.parse(value);
+  }
+
+  async set(key, value, ttlMs) {
+    const args = ['SET', key, JSON.stringify(value)];
+    await this.command(ttlMs > 0 ? [...args, 'PX', String(Math.ceil(ttlMs))] : args);
+  }
+
+  async delete(key) {
+    await this.command(['DEL', key]);
+  }
+
+  // Values round-trip through JSON.parse/stringify unchanged, so the strings compare exactly
+  async compareAndSet(key, expected, value, ttlMs) {
+    const result = await this.command([
+      'EVAL', COMPARE_AND_SET_SCRIPT, '1', key,
+      expected === undefined ? '' : JSON.stringify(expected),
+      JSON.stringify(value),
+      ttlMs > 0 ? String(Math.ceil(ttlMs)) : '0'
+    ]);
+    return Number(result) === 1;
+  }
+}
+
+// Stands in for a store that cannot work here: every call fails, so saves are
+// refused with an error instead of landing where other instances never look
+export class UnavailableKvStore {
+  constructor(reason) {
+    this.reason = reason;
+  }
+
+  fail() {
+    const error = new Error(this.reason);
+    error.code = 'STORE_UNAVAILABLE';
+    return Promise.reject(error);
+  }
+
+  get() {
+    return this.fail();
+  }
+
+  set() {
+    return this.fail();
+  }
+
+  delete() {
+    return this.fail();
+  }
+
+  compareAndSet() {
+    return this.fail();
+  }
+}
+
+/**
+ * Store named by an env var (defaultKind when unset): 'kv' uses the REST KV
+ * at KV_REST_API_URL / KV_REST_API_TOKEN, 'file' a JSON file (path from
+ * fileVar, or defaultFile in the temp directory), anything else memory.
+ * On Vercel the temp directory belongs to one instance and is wiped with it,
+ * so a file store there needs an explicit path; kv without its credentials
+ * or a temp-file default give an UnavailableKvStore rather than losing writes.
+ */
+// Shared state that has to outlive an instance: kv on Vercel, whose temp directory
+// is per instance, and a local file everywhere else
+export function defaultStoreKind() {
+  return process.env.VERCEL ? 'kv' : 'file';
+}
+
+export function createKvStore(kindVar, fileVar, defaultFile, defaultKind = 'memory') {
+  const kind = process.env[kindVar] || defaultKind;
+
+  if (kind === 'kv') {
+    if (process.env.KV_REST_API_URL && process.env.KV_REST_API_TOKEN) {
+      return new RestKvStore({ url: process.env.KV_REST_API_URL, token: process.env.KV_REST_API_TOKEN });
+    }
+    console.error(`${kindVar}=kv needs KV_REST_API_URL and KV_REST_API_TOKEN`);
+    return new UnavailableKvStore(`${kindVar}=kv is not configured`);
+  }
+  if (kind === 'file') {
+    if (process.env[fileVar]) {
+      return new FileKvStore(process.env[fileVar]);
+    }
+    if (process.env.VERCEL) {
+      console.error(`${kindVar} needs ${kindVar}=kv (or ${fileVar}) on Vercel`);
+      return new UnavailableKvStore(`${kindVar} is not configured for this deployment`);
+    }
+    return new FileKvStore(path.join(os.tmpdir(), defaultFile));
+  }
+  return new MemoryKvStore();
+}
@@ -0,0 +1,25 @@
+// Shared helper - admin login throttling
+//
+// Every login attempt takes a token from its client IP's bucket and then from
+// one global bucket before any password is checked, so a flood is refused
+// cheaply with 429 instead of queueing up hash work. The buckets live in
+// ADMIN_LIMIT_STORE ('file' keeps them in ADMIN_LIMIT_FILE for local runs and
+// tests; the default is instance memory).
+import { createKvStore } from './kvStore.js';
+import { TokenBucket, clientIp } from './rateLimit.js';
+
+const store = createKvStore('ADMIN_LIMIT_STORE', 'ADMIN_LIMIT_FILE', 'admin-rate-limits.json');
+
+// Five quick tries, then one every 30 seconds per address
+const perIp = new TokenBucket({ store, prefix: 'login-ip', capacity: 5, refillPerSecond: 1 / 30 });
+// Enough for a few admins at once, not for a botnet
+const overall = new TokenBucket({ store, prefix: 'login-all', capacity: 20, refillPerSecond: 1 });
+
+// { allowed, retryAfterMs }
+export async function throttleLogin(req) {
+  const ip = await perIp.take(clientIp(req));
+  if (!ip.allowed) {
+    return ip;
+  }
+  return overall.take('all');
+}
@@ -0,0 +1,85 @@
+// Shared helper - bcrypt password checks off the request thread
+//
+// Comparisons run one at a time on a single worker thread, so a burst of
+// logins queues there instead of stalling token checks and other admin
+// requests. Past MAX_QUEUED waiting checks new ones fail fast with code
+// 'HASH_BUSY'. Without worker support the async bcryptjs compare is used. A
+// worker that dies fails the checks it still owed and is replaced on the next
+// one.
+import bcrypt from 'bcryptjs';
+import { Worker } from 'worker_threads';
+
+const MAX_QUEUED = 8;
+
+let worker = null;
+let nextId = 0;
+const waiting = new Map(); // id -> { resolve, reject }
+
+function failAll(error) {
+  waiting.forEach(({ reject }) => reject(error));
+  waiting.clear();
+}
+
+function getWorker() {
+  if (worker === null) {
+    try {
+      const thread = new Worker(new URL('./bcryptWorker.js', import.meta.url));
+      // Only the current worker may reset it; checks queued on its replacement are not its to fail
+      const retire = error => {
+        if (worker === thread) {
+          worker = null;
+          failAll(error);
+        }
+      };
+
+      worker = thread;
+      worker.on('message', ({ id, match, error }) => {
+        const pending = waiting.get(id);
+        if (pending) {
+          waiting.delete(id);
+          if (error) {
+            pending.reject(new Error(error));
+          } else {
+            pending.resolve(match);
+          }
+        }
+      });
+      worker.on('error', error => {
+        console.error('Password worker failed:', error);
+        retire(error);
+      });
+      worker.on('exit', code => {
+        retire(new Error(`Password worker exited with code ${code}`));
+      });
+      // An idle worker must not keep the function alive (after the listeners, which ref it)
+      worker.unref();
+    } catch (error) {
+      console.warn('Worker threads unavailable, hashing in-thread:', error);
+      worker = false;
+    }
+  }
+  return worker;
+}
+
+function busyError() {
+  const error = new Error('Too many password checks in progress');
+  error.code = 'HASH_BUSY';
+  return error;
+}
+
+export function comparePassword(password, hash) {
+  if (waiting.size >= MAX_QUEUED) {
+    return Promise.reject(busyError());
+  }
+
+  const thread = getWorker();
+  if (!thread) {
+    return bcrypt.compare(String(password || ''), hash);
+  }
+
+  return new Promise((resolve, reject) => {
+    const id = ++nextId;
+    waiting.set(id, { resolve, reject });
+    thread.postMessage({ id, password: String(password || ''), hash });
+  });
+}
@@ -0,0 +1,68 @@
+// Shared helper - token-bucket rate limiting over a key-value store
+//
+// Each key holds a bucket of up to `capacity` tokens that refills at
+// `refillPerSecond`. A request takes a token or is refused with the time until
+// one is available. Buckets live in a kvStore, so limits can be shared across
+// instances; each take is a compare-and-set on the bucket, retried when another
+// request changed it first, so concurrent requests never spend the same token.
+
+// Under heavier contention than this a request is refused rather than kept spinning
+const MAX_TAKE_ATTEMPTS = 8;
+
+export class TokenBucket {
+  constructor({ store, prefix, capacity, refillPerSecond }) {
+    this.store = store;
+    this.prefix = prefix;
+    this.capacity = capacity;
+    this.refillPerSecond = refillPerSecond;
+  }
+
+  // { allowed, remaining, retryAfterMs }
+  async take(key, cost = 1) {
+    const storeKey = `${this.prefix}:${key}`;
+
+    for (let attempt = 0; attempt < MAX_TAKE_ATTEMPTS; attempt++) {
+      const now = Date.now();
+      const stored = await this.store.get(storeKey);
+      const bucket = stored || { tokens: this.capacity, updatedAt: now };
+
+      const elapsed = Math.max(0, now - bucket.updatedAt) / 1000;
+      const tokens = Math.min(this.capacity, bucket.tokens + elapsed * this.refillPerSecond);
+
+      // A refusal changes nothing, so there is nothing to write
+      if (tokens < cost) {
+        return {
+          allowed: false,
+          remaining: Math.floor(tokens),
+          retryAfterMs: Math.ceil(((cost - tokens) / this.refillPerSecond) * 1000)
+        };
+      }
+
+      // A bucket left untouched until full is the same as no bucket at all
+      const remaining = tokens - cost;
+      const ttlMs = Math.ceil(((this.capacity - remaining) / this.refillPerSecond) * 1000);
+      if (await this.store.compareAndSet(storeKey, stored, { tokens: remaining, updatedAt: now }, Math.max(ttlMs, 1000))) {
+        return { allowed: true, remaining: Math.floor(remaining), retryAfterMs: 0 };
+      }
+    }
+
+    return { allowed: false, remaining: 0, retryAfterMs: Math.ceil((cost / this.refillPerSecond) * 1000) };
+  }
+}
+
+// The address the platform's proxy saw: x-real-ip (set by the Vercel edge),
+// else the last X-Forwarded-For entry, which the nearest proxy appended. Earlier
+// entries come from the client and can be anything, so they never pick the bucket.
+export function clientIp(req) {
+  const realIp = String(req.headers['x-real-ip'] || '').trim();
+  if (realIp) {
+    return realIp;
+  }
+
+  const forwarded = req.headers['x-forwarded-for'];
+  const entries = (Array.isArray(forwarded) ? forwarded.join(',') : forwarded || '')
+    .split(',')
+    .map(entry => entry.trim())
+    .filter(Boolean);
+  return entries[entries.length - 1] || req.socket?.remoteAddress || 'unknown';
+}
@@ -0,0 +1,36 @@
+// Tests for token-bucket rate limiting; run with `npm run test:api`
+import assert from 'node:assert/strict';
+import { describe, it } from 'node:test';
+import { MemoryKvStore } from './kvStore.js';
+import { TokenBucket, clientIp } from './rateLimit.js';
+
+describe('TokenBucket', () => {
+  it('refuses once the bucket is empty and says when to retry', async () => {
+    const bucket = new TokenBucket({ store: new MemoryKvStore(), prefix: 't', capacity: 2, refillPerSecond: 1 });
+    assert.equal((await bucket.take('a')).allowed, true);
+    assert.equal((await bucket.take('a')).allowed, true);
+
+    const refused = await bucket.take('a');
+    assert.equal(refused.allowed, false);
+    assert.ok(refused.retryAfterMs > 0 && refused.retryAfterMs <= 1000);
+    assert.equal((await bucket.take('b')).allowed, true);
+  });
+});
+
+describe('clientIp', () => {
+  const request = (headers, remoteAddress) => ({ headers, socket: { remoteAddress } });
+
+  it('prefers the address the platform set in x-real-ip', () => {
+    assert.equal(clientIp(request({ 'x-real-ip': '203.0.113.7', 'x-forwarded-for': '1.2.3.4, 203.0.113.7' })), '203.0.113.7');
+  });
+
+  it('takes the last X-Forwarded-For entry, not the one the client wrote', () => {
+    assert.equal(clientIp(request({ 'x-forwarded-for': '1.2.3.4, 203.0.113.7' })), '203.0.113.7');
+    assert.equal(clientIp(request({ 'x-forwarded-for': ['1.2.3.4', '198.51.100.2'] })), '198.51.100.2');
+  });
+
+  it('falls back to the socket peer', () => {
+    assert.equal(clientIp(request({}, '127.0.0.1')), '127.0.0.1');
+    assert.equal(clientIp(request({ 'x-forwarded-for': ' , ' })), 'unknown');
+  });
+});
@@ -0,0 +1,137 @@
+// Shared helper - site configuration snapshot for the admin API
+//
+// The ADMIN_* environment variables are read and parsed once per warm
+// instance rather than on every request, and changes saved from the dashboard
+// (configStore.js) are layered on top. Each snapshot carries a hash of its
+// contents, which handlers use as the ETag so a polling dashboard gets an
+// empty 304 back until something actually changes.
+import crypto from 'crypto';
+import { getConfigStore } from './configStore.js';
+
+const DEFAULT_FEEDS = [{ name: 'SmartCanucks', url: 'https://smartcanucks.ca/feed/' }];
+const DEFAULT_DISCOUNT_THRESHOLD = 79;
+
+let envBase = null;
+let snapshot = null;
+
+function parseFeeds(value) {
+  if (!value) {
+    return null;
+  }
+
+  try {
+    const feeds = JSON.parse(value);
+    if (Array.isArray(feeds)) {
+      return feeds;
+    }
+  } catch {
+    // Reported below
+  }
+
+  console.warn('ADMIN_FEEDS is not a JSON array, ignoring it');
+  return null;
+}
+
+// Env settings, parsed once per instance; they are the defaults under stored changes
+function readEnv(env) {
+  const feeds = parseFeeds(env.ADMIN_FEEDS);
+
+  return {
+    site: {
+      siteName: env.ADMIN_SITE_NAME || 'Smart Deals Canada',
+      tagline: env.ADMIN_TAGLINE || 'Canadian Deals & Savings',
+      theme: env.ADMIN_THEME || 'cyberpunk',
+      colors: {
+        primary: env.ADMIN_PRIMARY_COLOR || '#FF0080',
+        secondary: env.ADMIN_SECONDARY_COLOR || '#FF4500',
+        accent: env.ADMIN_ACCENT_COLOR || '#00FF41'
+      },
+      scraper: {
+        discountThreshold: parseInt(env.ADMIN_DISCOUNT_THRESHOLD) || DEFAULT_DISCOUNT_THRESHOLD,
+        amazonTag: env.ADMIN_AMAZON_TAG || 'your-tag-20',
+        enabled: env.ADMIN_SCRAPER_ENABLED === 'true'
+      },
+      feeds: feeds || DEFAULT_FEEDS
+    },
+    // Only feeds and tags that were actually configured count towards the status
+    configuredFeeds: feeds,
+    configuredTag: env.ADMIN_AMAZON_TAG || null,
+    lastRun: env.ADMIN_LAST_SCRAPER_RUN || 'Never',
+    lastStatus: env.ADMIN_LAST_SCRAPER_STATUS || 'Unknown',
+    dealsGenerated: parseInt(env.ADMIN_LAST_DEALS_COUNT) || 0
+  };
+}
+
+// changes over settings, with colors and scraper merged key by key
+export function mergeSettings(settings, changes) {
+  return {
+    ...settings,
+    ...changes,
+    colors: { ...settings.colors, ...changes.colors },
+    scraper: { ...settings.scraper, ...changes.scraper }
+  };
+}
+
+function envSettings() {
+  if (!envBase) {
+    envBase = readEnv(process.env);
+  }
+  return envBase;
+}
+
+// The complete site settings for a stored config (null meaning nothing saved yet)
+export function siteSettingsFor(config) {
+  return mergeSettings(envSettings().site, config || {});
+}
+
+function buildSnapshot(base, stored) {
+  const changes = (stored && stored.config) || {};
+  const site = mergeSettings(base.site, changes);
+  const feeds = changes.feeds || base.configuredFeeds;
+
+  const scraper = {
+    enabled: site.scraper.enabled,
+    lastRun: base.lastRun,
+    lastStatus: base.lastStatus,
+    feedCount: feeds ? feeds.length : 0,
+    dealsGenerated: base.dealsGenerated,
+    config: {
+      discountThreshold: site.scraper.discountThreshold,
+      amazonTag: changes.scraper?.amazonTag || base.configuredTag || 'Not set'
+    }
+  };
+
+  const version = stored ? stored.version : 0;
+  const hash = crypto
+    .createHash('sha256')
+    .update(JSON.stringify({ version, site, scraper }))
+    .digest('base64url')
+    .slice(0, 22);
+
+  return { site, scraper, version, updatedAt: stored ? stored.updatedAt : null, hash };
+}
+
+/**
+ * { site, scraper, version, updatedAt, hash }: the env settings with the
+ * current stored version on top. Rebuilt only when that version changes; if
+ * the store cannot be reached, the last snapshot (or plain env) is served.
+ */
+export async function loadSiteConfig() {
+  const base = envSettings();
+
+  let stored;
+  try {
+    stored = await getConfigStore().read();
+  } catch (error) {
+    console.warn('Config store unavailable, serving the last known settings:', error.message);
+    if (!snapshot) {
+      snapshot = buildSnapshot(base, null);
+    }
+    return snapshot;
+  }
+
+  if (!snapshot || snapshot.version !== stored.version) {
+    snapshot = buildSnapshot(base, stored);
+  }
+  return snapshot;
+}
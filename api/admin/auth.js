@@ -1,6 +1,7 @@
 // Vercel Edge Function - Admin Authentication
-import bcrypt from 'bcryptjs';
-import jwt from 'jsonwebtoken';
+import { bearerToken, revokeAdminRequest, signAdminToken, verifyAdminToken } from '../_lib/adminAuth.js';
+import { throttleLogin } from '../_lib/loginThrottle.js';
+import { comparePassword } from '../_lib/passwordCheck.js';
 
 export default async function handler(req, res) {
   res.setHeader('Access-Control-Allow-Origin', '*');
@@ -22,6 +23,10 @@ export default async function handler(req, res) {
       if (action === 'verify') {
         return await handleVerify(req, res);
       }
+
+      if (action === 'logout') {
+        return await handleLogout(req, res);
+      }
       
       return res.status(400).json({ error: 'Invalid action' });
     } catch (error) {
@@ -33,11 +38,21 @@ export default async function handler(req, res) {
   return res.status(405).json({ error: 'Method not allowed' });
 }
 
+function tooManyAttempts(res, retryAfterMs) {
+  const retryAfter = Math.max(1, Math.ceil(retryAfterMs / 1000));
+  res.setHeader('Retry-After', String(retryAfter));
+  return res.status(429).json({ error: 'Too many login attempts, try again shortly', retryAfter });
+}
+
 async function handleLogin(req, res, password) {
+  // Refuse floods before doing any password work
+  const limit = await throttleLogin(req);
+  if (!limit.allowed) {
+    return tooManyAttempts(res, limit.retryAfterMs);
+  }
+  
   const storedHash = process.env.ADMIN_PASSWORD_HASH;
   const simplePassword = process.env.ADMIN_SIMPLE_PASSWORD;
-  const sessionSecret = process.env.ADMIN_SESSION_SECRET || 'default-secret-change-me';
-  
   let isValid = false;
   
   // Check simple password first (easier setup)
@@ -46,7 +61,14 @@ async function handleLogin(req, res, password) {
   }
   // Then check hashed password (more secure)
   else if (storedHash) {
-    isValid = await bcrypt.compare(password, storedHash);
+    try {
+      isValid = await comparePassword(password, storedHash);
+    } catch (error) {
+      if (error.code === 'HASH_BUSY') {
+        return tooManyAttempts(res, 1000);
+      }
+      throw error;
+    }
   }
   // Fallback for demo/testing
   else {
@@ -57,11 +79,7 @@ async function handleLogin(req, res, password) {
     return res.status(401).json({ error: 'Invalid admin credentials' });
   }
   
-  const token = jwt.sign(
-    { admin: true }, 
-    sessionSecret, 
-    { expiresIn: '24h' }
-  );
+  const token = signAdminToken();
   
   return res.status(200).json({ 
     success: true, 
@@ -71,28 +89,29 @@ async function handleLogin(req, res, password) {
 }
 
 async function handleVerify(req, res) {
-  const authHeader = req.headers.authorization;
+  const token = bearerToken(req);
   
-  if (!authHeader?.startsWith('Bearer ')) {
+  if (!token) {
     return res.status(401).json({ error: 'No token provided' });
   }
   
-  const token = authHeader.substring(7);
-  const sessionSecret = process.env.ADMIN_SESSION_SECRET || 'default-secret-change-me';
+  const decoded = verifyAdminToken(token);
   
-  try {
-    const decoded = jwt.verify(token, sessionSecret);
-    
-    if (!decoded.admin) {
-      return res.status(401).json({ error: 'Invalid token' });
-    }
-    
-    return res.status(200).json({ 
-      success: true, 
-      admin: true,
-      setup: decoded.setup || false
-    });
-  } catch (error) {
+  if (!decoded) {
     return res.status(401).json({ error: 'Token expired or invalid' });
   }
-}
\ No newline at end of file
+  
+  return res.status(200).json({ 
+    success: true, 
+    admin: true,
+    setup: decoded.setup || false
+  });
+}
+
+async function handleLogout(req, res) {
+  if (!revokeAdminRequest(req)) {
+    return res.status(401).json({ error: 'Token expired or invalid' });
+  }
+  
+  return res.status(200).json({ success: true });
+}
@@ -1,92 +1,177 @@
 // Vercel Edge Function - Site Configuration Management
-import jwt from 'jsonwebtoken';
+import { requireAdmin } from '../../_lib/adminAuth.js';
+import { getConfigStore } from '../../_lib/configStore.js';
+import { envUpdatesFor, getEnvWriteQueue } from '../../_lib/envWriteQueue.js';
+import { loadSiteConfig, mergeSettings, siteSettingsFor } from '../../_lib/siteConfig.js';
+import { sendJson } from '../../_lib/etag.js';
 
 export default async function handler(req, res) {
   res.setHeader('Access-Control-Allow-Origin', '*');
   res.setHeader('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
-  res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization');
+  res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match');
+  res.setHeader('Access-Control-Expose-Headers', 'ETag');
   
   if (req.method === 'OPTIONS') {
     return res.status(200).end();
   }
 
-  const isAuthed = await verifyAdmin(req);
-  if (!isAuthed) {
-    return res.status(401).json({ error: 'Unauthorized' });
+  if (!requireAdmin(req, res)) {
+    return;
   }
 
   if (req.method === 'GET') {
+    await flushEnvWrites(queue => queue.flushIfDue());
     return await getSiteConfig(req, res);
   }
   
   if (req.method === 'POST') {
+    await flushEnvWrites(queue => queue.flushDue());
     return await updateSiteConfig(req, res);
   }
   
   return res.status(405).json({ error: 'Method not allowed' });
 }
 
-async function verifyAdmin(req) {
-  const authHeader = req.headers.authorization;
-  
-  if (!authHeader?.startsWith('Bearer ')) {
-    return false;
+// An unconfigured env store was already reported when it was created; saves still go through
+function logEnvError(message) {
+  return error => {
+    if (error.code !== 'STORE_UNAVAILABLE') {
+      console.error(message, error);
+    }
+  };
+}
+
+// Env var batches are written from admin requests, since a timer on a frozen instance never fires.
+// Saves check the shared queue; polls only flush what this instance already knows is overdue.
+async function flushEnvWrites(flush) {
+  await flush(getEnvWriteQueue()).catch(logEnvError('Env write-behind failed:'));
+}
+
+// Saved settings are the source of truth, so a failure to queue their env vars only gets logged
+async function queueEnvUpdates(updates) {
+  await getEnvWriteQueue().enqueue(updates).catch(logEnvError('Queueing env vars failed:'));
+}
+
+const HEX_COLOR = /^#[0-9a-f]{3,8}$/i;
+const MAX_TEXT = 200;
+
+function isText(value) {
+  return typeof value === 'string' && value.trim().length > 0 && value.length <= MAX_TEXT;
+}
+
+function isFeed(feed) {
+  return feed && isText(feed.name) && typeof feed.url === 'string' && /^https?:\/\//.test(feed.url);
+}
+
+// The settings present in body, or the reasons they were refused
+function readChanges(body) {
+  const { siteName, tagline, theme, colors, scraper, feeds } = body;
+  const changes = {};
+  const errors = [];
+
+  [['siteName', siteName], ['tagline', tagline], ['theme', theme]].forEach(([key, value]) => {
+    if (value === undefined) return;
+    if (isText(value)) changes[key] = value.trim();
+    else errors.push(`${key} must be a non-empty string of at most ${MAX_TEXT} characters`);
+  });
+
+  if (colors !== undefined) {
+    changes.colors = {};
+    ['primary', 'secondary', 'accent'].forEach(key => {
+      if (colors?.[key] === undefined) return;
+      if (HEX_COLOR.test(colors[key])) changes.colors[key] = colors[key];
+      else errors.push(`colors.${key} must be a hex colour`);
+    });
   }
-  
-  const token = authHeader.substring(7);
-  const sessionSecret = process.env.ADMIN_SESSION_SECRET || 'default-secret-change-me';
-  
-  try {
-    const decoded = jwt.verify(token, sessionSecret);
-    return decoded.admin === true;
-  } catch {
-    return false;
+
+  if (scraper !== undefined) {
+    changes.scraper = {};
+    const threshold = scraper?.discountThreshold;
+    if (threshold !== undefined) {
+      if (Number.isInteger(threshold) && threshold >= 0 && threshold <= 100) changes.scraper.discountThreshold = threshold;
+      else errors.push('scraper.discountThreshold must be a whole number from 0 to 100');
+    }
+    if (scraper?.amazonTag !== undefined) {
+      if (isText(scraper.amazonTag)) changes.scraper.amazonTag = scraper.amazonTag.trim();
+      else errors.push('scraper.amazonTag must be a non-empty string');
+    }
+    if (scraper?.enabled !== undefined) {
+      if (typeof scraper.enabled === 'boolean') changes.scraper.enabled = scraper.enabled;
+      else errors.push('scraper.enabled must be true or false');
+    }
+  }
+
+  if (feeds !== undefined) {
+    if (Array.isArray(feeds) && feeds.every(isFeed)) changes.feeds = feeds.map(({ name, url }) => ({ name, url }));
+    else errors.push('feeds must be a list of { name, url } with http(s) URLs');
   }
+
+  return { changes, errors };
+}
+
+function conflict(res, error) {
+  return res.status(409).json({
+    error: 'Configuration was changed by someone else, reload and try again',
+    version: error.currentVersion
+  });
 }
 
 async function getSiteConfig(req, res) {
-  const config = {
-    siteName: process.env.ADMIN_SITE_NAME || 'Smart Deals Canada',
-    tagline: process.env.ADMIN_TAGLINE || 'Canadian Deals & Savings',
-    theme: process.env.ADMIN_THEME || 'cyberpunk',
-    colors: {
-      primary: process.env.ADMIN_PRIMARY_COLOR || '#FF0080',
-      secondary: process.env.ADMIN_SECONDARY_COLOR || '#FF4500',
-      accent: process.env.ADMIN_ACCENT_COLOR || '#00FF41'
-    },
-    scraper: {
-      discountThreshold: parseInt(process.env.ADMIN_DISCOUNT_THRESHOLD) || 79,
-      amazonTag: process.env.ADMIN_AMAZON_TAG || 'your-tag-20',
-      enabled: process.env.ADMIN_SCRAPER_ENABLED === 'true'
-    },
-    feeds: JSON.parse(process.env.ADMIN_FEEDS || '[{"name":"SmartCanucks","url":"https://smartcanucks.ca/feed/"}]')
-  };
-  
-  return res.status(200).json({ config });
+  if (req.query?.history !== undefined) {
+    const versions = await getConfigStore().history();
+    return res.status(200).json({ versions });
+  }
+
+  const { site, version, updatedAt, hash } = await loadSiteConfig();
+  return sendJson(req, res, `"site-${hash}"`, () => ({ config: site, version, updatedAt }));
 }
 
+/**
+ * POST { ...settings, version? } saves the settings as a new version;
+ * POST { action: 'rollback', to, version? } makes an earlier version current.
+ * With version, the change only applies if nobody saved in between (409 otherwise).
+ */
 async function updateSiteConfig(req, res) {
-  const { siteName, tagline, theme, colors, scraper, feeds } = req.body;
-  
-  // In production, would use Vercel API to update env vars
-  const updates = {};
-  
-  if (siteName) updates.ADMIN_SITE_NAME = siteName;
-  if (tagline) updates.ADMIN_TAGLINE = tagline;
-  if (theme) updates.ADMIN_THEME = theme;
-  if (colors?.primary) updates.ADMIN_PRIMARY_COLOR = colors.primary;
-  if (colors?.secondary) updates.ADMIN_SECONDARY_COLOR = colors.secondary;
-  if (colors?.accent) updates.ADMIN_ACCENT_COLOR = colors.accent;
-  if (scraper?.discountThreshold) updates.ADMIN_DISCOUNT_THRESHOLD = scraper.discountThreshold.toString();
-  if (scraper?.amazonTag) updates.ADMIN_AMAZON_TAG = scraper.amazonTag;
-  if (scraper?.enabled !== undefined) updates.ADMIN_SCRAPER_ENABLED = scraper.enabled.toString();
-  if (feeds) updates.ADMIN_FEEDS = JSON.stringify(feeds);
-  
-  console.log('Would update env vars:', updates);
-  
-  return res.status(200).json({ 
-    success: true, 
-    message: 'Configuration updated (would trigger rebuild)',
-    updates 
-  });
-}
\ No newline at end of file
+  const body = req.body || {};
+  const store = getConfigStore();
+  const expectedVersion = body.version === undefined ? undefined : Number(body.version);
+
+  try {
+    if (body.action === 'rollback') {
+      const restored = await store.rollback(Number(body.to), expectedVersion);
+      if (!restored) {
+        return res.status(404).json({ error: `Version ${body.to} is not available` });
+      }
+      await queueEnvUpdates(envUpdatesFor(restored.config));
+      const { site, version } = await loadSiteConfig();
+      return res.status(200).json({ success: true, message: `Rolled back to version ${version}`, version, config: site });
+    }
+
+    const { changes, errors } = readChanges(body);
+    if (errors.length > 0) {
+      return res.status(400).json({ error: 'Invalid configuration', details: errors });
+    }
+
+    // Each version holds the complete settings, so a rollback restores all of them
+    const saved = await store.write(current => mergeSettings(siteSettingsFor(current), changes), expectedVersion);
+    // The env vars follow in one batch once the admin stops editing
+    await queueEnvUpdates(envUpdatesFor(changes));
+
+    return res.status(200).json({
+      success: true,
+      message: 'Configuration saved',
+      version: saved.version,
+      config: (await loadSiteConfig()).site
+    });
+  } catch (error) {
+    if (error.code === 'CONFIG_CONFLICT') {
+      return conflict(res, error);
+    }
+    if (error.code === 'STORE_UNAVAILABLE') {
+      console.error('Config store unavailable:', error.message);
+      return res.status(500).json({ error: 'Configuration storage is not set up for this deployment' });
+    }
+    console.error('Config update failed:', error);
+    return res.status(500).json({ error: 'Failed to save configuration' });
+  }
+}
@@ -1,18 +1,20 @@
 // Vercel Edge Function - Scraper Management
-import jwt from 'jsonwebtoken';
+import { requireAdmin } from '../../_lib/adminAuth.js';
+import { loadSiteConfig } from '../../_lib/siteConfig.js';
+import { sendJson } from '../../_lib/etag.js';
 
 export default async function handler(req, res) {
   res.setHeader('Access-Control-Allow-Origin', '*');
   res.setHeader('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
-  res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization');
+  res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match');
+  res.setHeader('Access-Control-Expose-Headers', 'ETag');
   
   if (req.method === 'OPTIONS') {
     return res.status(200).end();
   }
 
-  const isAuthed = await verifyAdmin(req);
-  if (!isAuthed) {
-    return res.status(401).json({ error: 'Unauthorized' });
+  if (!requireAdmin(req, res)) {
+    return;
   }
 
   if (req.method === 'POST') {
@@ -26,24 +28,6 @@ export default async function handler(req, res) {
   return res.status(405).json({ error: 'Method not allowed' });
 }
 
-async function verifyAdmin(req) {
-  const authHeader = req.headers.authorization;
-  
-  if (!authHeader?.startsWith('Bearer ')) {
-    return false;
-  }
-  
-  const token = authHeader.substring(7);
-  const sessionSecret = process.env.ADMIN_SESSION_SECRET || 'default-secret-change-me';
-  
-  try {
-    const decoded = jwt.verify(token, sessionSecret);
-    return decoded.admin === true;
-  } catch {
-    return false;
-  }
-}
-
 async function triggerScraper(req, res) {
   const { action } = req.body;
   
@@ -101,17 +85,6 @@ async function triggerScraper(req, res) {
 }
 
 async function getScraperStatus(req, res) {
-  const status = {
-    enabled: process.env.ADMIN_SCRAPER_ENABLED === 'true',
-    lastRun: process.env.ADMIN_LAST_SCRAPER_RUN || 'Never',
-    lastStatus: process.env.ADMIN_LAST_SCRAPER_STATUS || 'Unknown',
-    feedCount: JSON.parse(process.env.ADMIN_FEEDS || '[]').length,
-    dealsGenerated: parseInt(process.env.ADMIN_LAST_DEALS_COUNT) || 0,
-    config: {
-      discountThreshold: parseInt(process.env.ADMIN_DISCOUNT_THRESHOLD) || 79,
-      amazonTag: process.env.ADMIN_AMAZON_TAG || 'Not set'
-    }
-  };
-  
-  return res.status(200).json({ status });
-}
\ No newline at end of file
+  const { scraper, hash } = await loadSiteConfig();
+  return sendJson(req, res, `"status-${hash}"`, () => ({ status: scraper }));
+}
@@ -0,0 +1,167 @@
+// Vercel Edge Function - Resized Deal Images
+//
+// GET /api/images?url=<image url>&w=<width>&f=<avif|webp|jpeg>
+// Fetches a deal image once, resizes and recompresses it with sharp, and keeps
+// every variant in a size-bounded LRU cache on local disk. Responses are
+// immutable so the CDN serves repeat requests without reaching this function.
+// Redirects are followed by hand so every hop stays on an allowed host, and a
+// source is downloaded only up to MAX_SOURCE_BYTES.
+import crypto from 'crypto';
+import os from 'os';
+import path from 'path';
+import { DiskLru } from './_lib/diskLru.js';
+
+// Keep in sync with IMAGE_WIDTHS in src/utils/imageUrls.ts
+const ALLOWED_WIDTHS = [80, 160, 320, 480, 640];
+const FORMATS = {
+  avif: { contentType: 'image/avif', options: { quality: 50 } },
+  webp: { contentType: 'image/webp', options: { quality: 72 } },
+  jpeg: { contentType: 'image/jpeg', options: { quality: 75, mozjpeg: true } }
+};
+const ALLOWED_HOSTS = ['www.savingsguru.ca', 'savingsguru.ca', 'm.media-amazon.com', 'images-na.ssl-images-amazon.com'];
+const MAX_SOURCE_BYTES = 10 * 1024 * 1024;
+const MAX_REDIRECTS = 3;
+
+const cache = new DiskLru({
+  dir: path.join(os.tmpdir(), 'deal-images'),
+  maxBytes: parseInt(process.env.IMAGE_CACHE_MAX_BYTES) || 200 * 1024 * 1024
+});
+
+let sharpModule;
+
+async function loadSharp() {
+  if (sharpModule === undefined) {
+    try {
+      sharpModule = (await import('sharp')).default;
+    } catch {
+      console.warn('sharp is not installed, serving original images');
+      sharpModule = null;
+    }
+  }
+  return sharpModule;
+}
+
+function parseSource(value) {
+  try {
+    const url = new URL(value);
+    return url.protocol === 'https:' && ALLOWED_HOSTS.includes(url.hostname) ? url : null;
+  } catch {
+    return null;
+  }
+}
+
+// A redirect to a host outside ALLOWED_HOSTS throws instead of being fetched
+async function fetchSource(source) {
+  let url = source;
+
+  for (let hop = 0; hop <= MAX_REDIRECTS; hop++) {
+    const response = await fetch(url.href, { redirect: 'manual' });
+    if (response.status < 300 || response.status >= 400) {
+      return response;
+    }
+
+    await response.body?.cancel();
+    const location = response.headers.get('location');
+    const next = location ? parseSource(new URL(location, url).href) : null;
+    if (!next) {
+      throw new Error(`Refusing to follow redirect from ${url.href} to ${location}`);
+    }
+    url = next;
+  }
+
+  throw new Error(`More than ${MAX_REDIRECTS} redirects from ${source.href}`);
+}
+
+// The body, or null once it runs past maxBytes; the download stops right there
+async function readCapped(response, maxBytes) {
+  if ((parseInt(response.headers.get('content-length')) || 0) > maxBytes) {
+    await response.body?.cancel();
+    return null;
+  }
+
+  const reader = response.body.getReader();
+  const chunks = [];
+  let total = 0;
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) {
+      return Buffer.concat(chunks, total);
+    }
+    total += value.byteLength;
+    if (total > maxBytes) {
+      await reader.cancel();
+      return null;
+    }
+    chunks.push(value);
+  }
+}
+
+export default async function handler(req, res) {
+  res.setHeader('Access-Control-Allow-Origin', '*');
+  res.setHeader('Access-Control-Allow-Methods', 'GET, OPTIONS');
+
+  if (req.method === 'OPTIONS') {
+    return res.status(200).end();
+  }
+
+  if (req.method !== 'GET') {
+    return res.status(405).json({ error: 'Method not allowed' });
+  }
+
+  const source = parseSource(req.query.url);
+  const width = parseInt(req.query.w);
+  const format = FORMATS[req.query.f] ? req.query.f : 'jpeg';
+
+  if (!source) {
+    return res.status(400).json({ error: 'Image host not allowed' });
+  }
+
+  if (!ALLOWED_WIDTHS.includes(width)) {
+    return res.status(400).json({ error: 'Unsupported width', widths: ALLOWED_WIDTHS });
+  }
+
+  const sharp = await loadSharp();
+  if (!sharp) {
+    return res.redirect(302, source.href);
+  }
+
+  const key = crypto.createHash('sha1').update(`${source.href}|${width}|${format}`).digest('hex');
+  const { contentType, options } = FORMATS[format];
+
+  res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+  res.setHeader('Content-Type', contentType);
+
+  const cached = await cache.get(key);
+  if (cached) {
+    res.setHeader('X-Image-Cache', 'HIT');
+    return res.status(200).send(cached);
+  }
+
+  try {
+    const response = await fetchSource(source);
+    if (!response.ok) {
+      await response.body?.cancel();
+    }
+    const input = response.ok ? await readCapped(response, MAX_SOURCE_BYTES) : null;
+
+    if (!input) {
+      res.setHeader('Cache-Control', 'no-store');
+      return res.redirect(302, source.href);
+    }
+
+    const output = await sharp(input)
+      .resize({ width, withoutEnlargement: true })
+      .toFormat(format, options)
+      .toBuffer();
+
+    await cache.set(key, output);
+
+    res.setHeader('X-Image-Cache', 'MISS');
+    return res.status(200).send(output);
+  } catch (error) {
+    console.error('Image resize error:', error);
+    res.setHeader('Cache-Control', 'no-store');
+    return res.redirect(302, source.href);
+  }
+}
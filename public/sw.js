@@ -0,0 +1,339 @@
+/* eslint-disable no-restricted-globals */
+// Service worker - per-resource caching strategies, enabled by advanced.enablePWA
+//
+//   /data/<hash>/* deal data files      -> cache-first (the path changes with the contents)
+//   /data/manifest.json, deals.json,
+//   HTML pages                          -> network-first, cache when offline or slow
+//   config.json                         -> stale-while-revalidate
+//   /static/* hashed bundles            -> cache-first
+//   deal images                         -> cache-first, size-bounded LRU
+//
+// Post { type: 'GET_CACHE_STATS' } to get hit ratios back per strategy. The
+// counts are saved in the data cache, so they survive worker restarts.
+
+const CACHE_VERSION = 'v2';
+const DATA_CACHE = `data-${CACHE_VERSION}`;
+const STATIC_CACHE = `static-${CACHE_VERSION}`;
+const IMAGE_CACHE = `images-${CACHE_VERSION}`;
+const CURRENT_CACHES = [DATA_CACHE, STATIC_CACHE, IMAGE_CACHE];
+
+const MANIFEST_PATH = '/data/manifest.json';
+const VERSIONED_DATA = /^\/data\/[0-9a-f]{6,}\//;
+// Past this, a cached page or manifest is served and the network response only refreshes the cache
+const NETWORK_TIMEOUT_MS = 3000;
+
+const MAX_STATIC_ENTRIES = 60;
+const MAX_IMAGE_ENTRIES = 200;
+const MAX_IMAGE_BYTES = 25 * 1024 * 1024;
+// No-cors images can't be measured, and browsers pad their quota charge
+// anyway, so each counts as a generous product photo against the budget
+const OPAQUE_IMAGE_BYTES = 512 * 1024;
+const LRU_META_URL = '/__image-lru__';
+const STATS_META_URL = '/__cache-stats__';
+
+const stats = {
+  data: { hits: 0, misses: 0 },
+  static: { hits: 0, misses: 0 },
+  images: { hits: 0, misses: 0 }
+};
+let statsTimer = null;
+
+// Counts saved by earlier runs of the worker are added to whatever this run recorded meanwhile
+const statsLoaded = caches.open(DATA_CACHE)
+  .then(cache => cache.match(STATS_META_URL))
+  .then(meta => (meta ? meta.json() : null))
+  .then(saved => {
+    Object.keys(stats).forEach(bucket => {
+      if (saved && saved[bucket]) {
+        stats[bucket].hits += saved[bucket].hits || 0;
+        stats[bucket].misses += saved[bucket].misses || 0;
+      }
+    });
+  })
+  .catch(() => undefined);
+
+self.addEventListener('install', () => {
+  self.skipWaiting();
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys.filter(key => !CURRENT_CACHES.includes(key)).map(key => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+function isSameOrigin(url) {
+  return url.origin === self.location.origin;
+}
+
+function isVersionedData(url) {
+  return isSameOrigin(url) && VERSIONED_DATA.test(url.pathname);
+}
+
+// Unversioned files whose contents must agree with the versioned ones they point to
+function isDataEntryPoint(url) {
+  return isSameOrigin(url) && (url.pathname === MANIFEST_PATH || url.pathname === '/deals.json');
+}
+
+function isStaticRequest(url) {
+  return isSameOrigin(url) && url.pathname.startsWith('/static/');
+}
+
+function isImageRequest(request, url) {
+  return request.destination === 'image' || /\.(png|jpe?g|gif|webp|avif|svg)$/i.test(url.pathname);
+}
+
+function record(bucket, hit) {
+  stats[bucket][hit ? 'hits' : 'misses'] += 1;
+
+  clearTimeout(statsTimer);
+  statsTimer = setTimeout(() => {
+    statsLoaded
+      .then(() => caches.open(DATA_CACHE))
+      .then(cache => cache.put(STATS_META_URL, new Response(JSON.stringify(stats))))
+      .catch(() => undefined);
+  }, 2000);
+}
+
+async function staleWhileRevalidate(event, cacheName, bucket, cacheKey) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(cacheKey || event.request);
+
+  const refresh = fetch(event.request)
+    .then(response => {
+      if (response.ok) {
+        return cache.put(cacheKey || event.request, response.clone()).then(() => response);
+      }
+      return response;
+    });
+
+  record(bucket, Boolean(cached));
+
+  if (cached) {
+    event.waitUntil(refresh.catch(() => undefined));
+    return cached;
+  }
+
+  return refresh;
+}
+
+function timeout(ms) {
+  return new Promise((_, reject) => setTimeout(() => reject(new Error('Network timeout')), ms));
+}
+
+async function networkFirst(event, cacheName, bucket, cacheKey, onUpdate) {
+  const cache = await caches.open(cacheName);
+  const key = cacheKey || event.request;
+
+  const network = fetch(event.request).then(async response => {
+    if (response.ok) {
+      const previous = onUpdate ? await cache.match(key) : undefined;
+      await cache.put(key, response.clone());
+      if (onUpdate) {
+        await onUpdate(cache, [previous, response.clone()]);
+      }
+    }
+    return response;
+  });
+
+  try {
+    const response = await Promise.race([network, timeout(NETWORK_TIMEOUT_MS)]);
+    record(bucket, false);
+    return response;
+  } catch (err) {
+    const cached = await cache.match(key);
+    if (!cached) {
+      return network;
+    }
+    record(bucket, true);
+    event.waitUntil(network.catch(() => undefined));
+    return cached;
+  }
+}
+
+async function cacheFirst(request, cacheName, bucket, maxEntries) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(request);
+  record(bucket, Boolean(cached));
+
+  if (cached) {
+    return cached;
+  }
+
+  const response = await fetch(request);
+  if (response.ok) {
+    await cache.put(request, response.clone());
+    if (maxEntries) {
+      await trimCache(cache, maxEntries);
+    }
+  }
+  return response;
+}
+
+// Keeps the data files of the new manifest and of the one it replaced (for
+// pages opened before the deploy) and drops every older version
+async function keepDataVersions(cache, manifests) {
+  const parsed = await Promise.all(manifests.filter(Boolean).map(response => response.json().catch(() => null)));
+  const keep = parsed.filter(manifest => manifest && manifest.dataUrl).map(manifest => `${manifest.dataUrl}/`);
+
+  if (keep.length === 0) {
+    return;
+  }
+
+  const keys = await cache.keys();
+  await Promise.all(keys
+    .filter(request => {
+      const url = new URL(request.url);
+      return isVersionedData(url) && !keep.some(prefix => url.pathname.startsWith(prefix));
+    })
+    .map(request => cache.delete(request)));
+}
+
+// Cache.keys() is in insertion order, so this drops the oldest bundles first
+async function trimCache(cache, maxEntries) {
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - maxEntries)).map(key => cache.delete(key)));
+}
+
+// In-memory LRU index for the image cache, persisted as a small JSON entry
+let imageLru = null;
+let persistTimer = null;
+
+async function loadImageLru(cache) {
+  if (!imageLru) {
+    const meta = await cache.match(LRU_META_URL);
+    imageLru = new Map(meta ? await meta.json() : []);
+  }
+  return imageLru;
+}
+
+function persistImageLru(cache) {
+  clearTimeout(persistTimer);
+  persistTimer = setTimeout(() => {
+    cache.put(LRU_META_URL, new Response(JSON.stringify([...imageLru.entries()])));
+  }, 2000);
+}
+
+async function evictImages(cache, lru) {
+  let totalBytes = 0;
+  lru.forEach(entry => {
+    totalBytes += entry.size;
+  });
+
+  // Map iteration order is least recently used first
+  for (const [url, entry] of lru) {
+    if (lru.size <= MAX_IMAGE_ENTRIES && totalBytes <= MAX_IMAGE_BYTES) {
+      break;
+    }
+    lru.delete(url);
+    totalBytes -= entry.size;
+    await cache.delete(url);
+  }
+}
+
+// Cross-origin deal images load no-cors; their opaque responses hide the
+// status, so they are taken on trust like any other image the page shows
+function imageCacheable(response) {
+  return response.type === 'opaque' || (response.ok && (response.type === 'basic' || response.type === 'cors'));
+}
+
+// Reads a copy of the body when there is no content-length, so only call it off the response path
+async function responseSize(copy) {
+  if (copy.type === 'opaque') {
+    return OPAQUE_IMAGE_BYTES;
+  }
+  const length = parseInt(copy.headers.get('content-length'), 10);
+  return length > 0 ? length : (await copy.blob()).size;
+}
+
+async function trackImage(cache, lru, key, copy) {
+  lru.delete(key);
+  lru.set(key, { size: await responseSize(copy) });
+  await evictImages(cache, lru);
+  persistImageLru(cache);
+}
+
+// The page gets the image straight away; storing and measuring it happen after
+async function cacheImage(event) {
+  const { request } = event;
+  const cache = await caches.open(IMAGE_CACHE);
+  const lru = await loadImageLru(cache);
+  const cached = await cache.match(request);
+  const key = request.url;
+
+  record('images', Boolean(cached));
+
+  if (cached) {
+    const entry = lru.get(key);
+    if (entry) {
+      lru.delete(key);
+      lru.set(key, entry);
+      persistImageLru(cache);
+    } else {
+      event.waitUntil(trackImage(cache, lru, key, cached.clone()));
+    }
+    return cached;
+  }
+
+  const response = await fetch(request);
+
+  if (imageCacheable(response)) {
+    const stored = response.clone();
+    const measured = response.clone();
+    event.waitUntil(cache.put(request, stored).then(() => trackImage(cache, lru, key, measured)));
+  }
+
+  return response;
+}
+
+self.addEventListener('fetch', event => {
+  const { request } = event;
+
+  if (request.method !== 'GET') {
+    return;
+  }
+
+  const url = new URL(request.url);
+
+  // Resized images from /api/images go through the image LRU like any other image
+  if (url.origin === self.location.origin && url.pathname.startsWith('/api/') && url.pathname !== '/api/images') {
+    return;
+  }
+
+  if (request.mode === 'navigate') {
+    // Prerendered HTML inlines the manifest it was built with, so it must not
+    // outlive a deploy any more than the manifest does. Key by path, ignoring ?q=
+    event.respondWith(networkFirst(event, DATA_CACHE, 'data', url.origin + url.pathname));
+  } else if (isVersionedData(url)) {
+    event.respondWith(cacheFirst(request, DATA_CACHE, 'data'));
+  } else if (isDataEntryPoint(url)) {
+    const onUpdate = url.pathname === MANIFEST_PATH ? keepDataVersions : undefined;
+    event.respondWith(networkFirst(event, DATA_CACHE, 'data', null, onUpdate));
+  } else if (isSameOrigin(url) && url.pathname === '/config.json') {
+    event.respondWith(staleWhileRevalidate(event, DATA_CACHE, 'data'));
+  } else if (isStaticRequest(url)) {
+    event.respondWith(cacheFirst(request, STATIC_CACHE, 'static', MAX_STATIC_ENTRIES));
+  } else if (isImageRequest(request, url)) {
+    event.respondWith(cacheImage(event));
+  }
+});
+
+function hitRatio({ hits, misses }) {
+  const total = hits + misses;
+  return total === 0 ? null : hits / total;
+}
+
+self.addEventListener('message', event => {
+  if (event.data && event.data.type === 'GET_CACHE_STATS') {
+    const target = event.ports && event.ports[0] ? event.ports[0] : event.source;
+    event.waitUntil(statsLoaded.then(() => {
+      const report = {};
+      Object.keys(stats).forEach(bucket => {
+        report[bucket] = { ...stats[bucket], hitRatio: hitRatio(stats[bucket]) };
+      });
+      target.postMessage({ type: 'CACHE_STATS', stats: report });
+    }));
+  }
+});
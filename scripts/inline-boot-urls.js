@@ -0,0 +1,58 @@
+#!/usr/bin/env node
+// Build step - writes the boot prefetch URLs into build/index.html
+//
+// The inline script in public/index.html starts the config, manifest and first
+// deals page downloads alongside the bundle. Those paths come from config.json
+// (content.manifestFile / content.dataFile) and from the manifest publish-deals
+// wrote (the first page lives under a content-hashed directory), so they are
+// filled in here, after `react-scripts build` has copied both into build/.
+// Runs before react-snap, so prerendered pages carry the same list.
+//
+// Usage: node scripts/inline-boot-urls.js
+const fs = require('fs');
+const path = require('path');
+
+const BUILD_DIR = path.resolve(__dirname, '..', 'build');
+const CONFIG_URL = '/config.json';
+const PLACEHOLDER = '/*BOOT_URLS*/null';
+
+function readBuildJson(url) {
+  const file = path.join(BUILD_DIR, url.replace(/^\/+/, ''));
+  return fs.existsSync(file) ? JSON.parse(fs.readFileSync(file, 'utf8')) : null;
+}
+
+function bootUrls() {
+  const content = readBuildJson(CONFIG_URL)?.content || {};
+  const urls = [CONFIG_URL];
+
+  // Mirrors loadManifest: the manifest and its first page, else the whole data file
+  const manifest = content.manifestFile ? readBuildJson(content.manifestFile) : null;
+  if (manifest) {
+    urls.push(content.manifestFile);
+    if (manifest.pages && manifest.pages[0]) {
+      urls.push(manifest.pages[0]);
+    }
+  } else if (content.dataFile) {
+    urls.push(content.dataFile);
+  }
+
+  return urls;
+}
+
+function main() {
+  const htmlFile = path.join(BUILD_DIR, 'index.html');
+  const html = fs.readFileSync(htmlFile, 'utf8');
+
+  if (!html.includes(PLACEHOLDER)) {
+    throw new Error(`${PLACEHOLDER} not found in build/index.html`);
+  }
+
+  const urls = bootUrls();
+  // Escaped so a path can never close the surrounding <script>
+  const literal = JSON.stringify(urls).replace(/</g, '\\u003c');
+  fs.writeFileSync(htmlFile, html.replace(PLACEHOLDER, literal));
+
+  console.log(`Boot prefetch: ${urls.join(', ')}`);
+}
+
+main();
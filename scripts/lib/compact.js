@@ -0,0 +1,213 @@
+// Publish step - compact columnar encoding of the sorted deal list
+//
+// Numeric fields become plain number columns that the client loads into typed
+// arrays: prices in cents with the original price stored as the markup over
+// the price, and dateAdded as full timestamps delta-encoded down the sorted
+// list in the coarsest unit that keeps every one of them exact. Categories and
+// URL prefixes are dictionary-encoded, and every remaining string is packed
+// into one text blob addressed by lengths so the client can slice strings out
+// lazily. Query-string segments that repeat across URLs (tag=, linkCode=, ...)
+// are stored once and referenced from the blob by a single private-use
+// character. Sized image URLs are stored as one {size} template per deal plus
+// the shared size table, and image colours as 24-bit integers (-1 when
+// missing). Decoded by src/utils/compactDeals.ts.
+
+const { IMAGE_SIZES, imageTemplate } = require('./imageSizes');
+
+const TEXT_FIELDS = ['id', 'title', 'description', 'imageUrl', 'affiliateUrl', 'imageTemplate', 'imageLqip'];
+const DATE_UNITS = [24 * 60 * 60 * 1000, 60 * 60 * 1000, 60 * 1000, 1000, 1];
+// References to repeated segments; U+E000-U+F8FF never appears in a valid URL unescaped
+const SEGMENT_BASE = 0xe000;
+const MAX_SEGMENTS = 0xf8ff - SEGMENT_BASE + 1;
+const PRIVATE_USE = /[\ue000-\uf8ff]/g;
+
+function toTime(date) {
+  const time = Date.parse(date);
+  return Number.isNaN(time) ? 0 : time;
+}
+
+function dateUnit(times) {
+  return DATE_UNITS.find(unit => times.every(time => time % unit === 0)) || 1;
+}
+
+function deltas(values) {
+  return values.map((value, i) => (i === 0 ? value : value - values[i - 1]));
+}
+
+function toCents(amount) {
+  return Math.round((Number(amount) || 0) * 100);
+}
+
+// The client keeps discounts in a Uint8Array, so anything outside 0-100 is clamped rather than wrapped
+function toPercent(value) {
+  return Math.min(100, Math.max(0, Math.round(Number(value) || 0)));
+}
+
+function toColor(hex) {
+  return /^#[0-9a-f]{6}$/i.test(hex || '') ? parseInt(hex.slice(1), 16) : -1;
+}
+
+function pathPrefixes(url) {
+  const value = String(url || '');
+  const queryStart = value.indexOf('?');
+  const pathEnd = queryStart === -1 ? value.length : queryStart;
+  const prefixes = [];
+
+  for (let at = value.indexOf('//') + 2; at > 1 && at < pathEnd; at++) {
+    if (value[at] === '/') {
+      prefixes.push(value.slice(0, at + 1));
+    }
+  }
+
+  return prefixes;
+}
+
+// Each URL is split at the longest '/'-ending prefix it shares with another URL,
+// so https://www.amazon.ca/dp/ is stored once instead of once per deal
+function createUrlSplitter(urls) {
+  const counts = new Map();
+  urls.forEach(url => {
+    pathPrefixes(url).forEach(prefix => counts.set(prefix, (counts.get(prefix) || 0) + 1));
+  });
+
+  return url => {
+    const value = String(url || '');
+    const prefixes = pathPrefixes(value);
+    for (let i = prefixes.length - 1; i >= 0; i--) {
+      if (counts.get(prefixes[i]) > 1 || i === 0) {
+        return [prefixes[i], value.slice(prefixes[i].length)];
+      }
+    }
+    return ['', value];
+  };
+}
+
+function splitSegments(rest) {
+  return rest.replace(PRIVATE_USE, encodeURIComponent).split(/(?=[?&])/);
+}
+
+// Segments worth a reference: seen more than once and longer than the 3 UTF-8
+// bytes the reference costs
+function createSegmentCoder(rests) {
+  const counts = new Map();
+  rests.forEach(rest => {
+    splitSegments(rest).forEach(segment => {
+      if (segment.length > 3) {
+        counts.set(segment, (counts.get(segment) || 0) + 1);
+      }
+    });
+  });
+
+  const segments = Array.from(counts.keys())
+    .filter(segment => counts.get(segment) > 1)
+    .sort((a, b) => counts.get(b) * b.length - counts.get(a) * a.length)
+    .slice(0, MAX_SEGMENTS);
+  const lookup = new Map(segments.map((segment, i) => [segment, String.fromCharCode(SEGMENT_BASE + i)]));
+
+  return {
+    segments,
+    encode: rest => splitSegments(rest).map(segment => lookup.get(segment) || segment).join('')
+  };
+}
+
+function createDictionary() {
+  const values = [];
+  const lookup = new Map();
+  return {
+    values,
+    add(value) {
+      if (!lookup.has(value)) {
+        lookup.set(value, values.length);
+        values.push(value);
+      }
+      return lookup.get(value);
+    }
+  };
+}
+
+function buildCompact(sortedDeals, version) {
+  const categories = createDictionary();
+  const urlPrefixes = createDictionary();
+  const columns = {
+    price: [],
+    originalPrice: [],
+    discountPercent: [],
+    dateAdded: [],
+    category: [],
+    imagePrefix: [],
+    affiliatePrefix: [],
+    imageTemplatePrefix: [],
+    imageColor: []
+  };
+  const featured = [];
+  const textParts = [];
+  const textLengths = [];
+  const templates = sortedDeals.map(deal => (deal.images && imageTemplate(deal.imageUrl)) || '');
+  const splitUrl = createUrlSplitter(
+    sortedDeals.flatMap((deal, position) => [deal.imageUrl, deal.affiliateUrl, templates[position]])
+  );
+  const splitDeals = sortedDeals.map((deal, position) => ({
+    image: splitUrl(deal.imageUrl),
+    affiliate: splitUrl(deal.affiliateUrl),
+    template: splitUrl(templates[position])
+  }));
+  const segmentCoder = createSegmentCoder(
+    splitDeals.flatMap(({ image, affiliate, template }) => [image[1], affiliate[1], template[1]])
+  );
+  const times = sortedDeals.map(deal => toTime(deal.dateAdded));
+  const unit = dateUnit(times);
+
+  const pushText = value => {
+    const text = String(value || '');
+    textParts.push(text);
+    textLengths.push(text.length);
+  };
+
+  sortedDeals.forEach((deal, position) => {
+    const [imagePrefix, imageRest] = splitDeals[position].image;
+    const [affiliatePrefix, affiliateRest] = splitDeals[position].affiliate;
+    const [templatePrefix, templateRest] = splitDeals[position].template;
+    const price = toCents(deal.price);
+
+    columns.price.push(price);
+    columns.originalPrice.push(toCents(deal.originalPrice) - price);
+    columns.discountPercent.push(toPercent(deal.discountPercent));
+    columns.category.push(categories.add(deal.category || ''));
+    columns.imagePrefix.push(urlPrefixes.add(imagePrefix));
+    columns.affiliatePrefix.push(urlPrefixes.add(affiliatePrefix));
+    columns.imageTemplatePrefix.push(urlPrefixes.add(templatePrefix));
+    columns.imageColor.push(toColor(deal.imageColor));
+
+    if (deal.featured) {
+      featured.push(position);
+    }
+
+    pushText(deal.id);
+    pushText(deal.title);
+    pushText(deal.description);
+    pushText(segmentCoder.encode(imageRest));
+    pushText(segmentCoder.encode(affiliateRest));
+    pushText(segmentCoder.encode(templateRest));
+    pushText(deal.imageLqip);
+  });
+
+  columns.dateAdded = deltas(times.map(time => time / unit));
+
+  return {
+    format: 'compact-v2',
+    version,
+    total: sortedDeals.length,
+    textFields: TEXT_FIELDS,
+    categories: categories.values,
+    urlPrefixes: urlPrefixes.values,
+    urlSegments: segmentCoder.segments,
+    dateUnit: unit,
+    imageSizes: IMAGE_SIZES,
+    columns,
+    featured,
+    text: textParts.join(''),
+    textLengths
+  };
+}
+
+module.exports = { TEXT_FIELDS, buildCompact };
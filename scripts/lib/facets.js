@@ -0,0 +1,87 @@
+// Publish step - facet index for filtering the listing
+//
+// Every facet value carries the sorted positions of its deals, gap-encoded
+// (each entry is the distance from the previous position) so long lists stay
+// small. The client turns each list into a bitset once and answers filter
+// combinations and counts with word-wise AND/popcount.
+//
+// Numeric filters (price, discount) ship as range indexes instead: positions
+// ordered by value next to the sorted values, so any [min, max] range is two
+// binary searches and one slice. Decoded by src/utils/facets.ts.
+
+// Lower bounds of the histogram buckets shown above each range slider
+const PRICE_BUCKETS = [0, 10, 25, 50, 75, 100, 150, 200, 300, 500].map(dollars => dollars * 100);
+const DISCOUNT_BUCKETS = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90];
+
+function gapEncode(positions) {
+  let previous = -1;
+  return positions.map(position => {
+    const gap = position - previous;
+    previous = position;
+    return gap;
+  });
+}
+
+function facetValue(value, label, positions) {
+  return { value, label, count: positions.length, ids: gapEncode(positions) };
+}
+
+function categoryDimension(sortedDeals) {
+  const byCategory = new Map();
+
+  sortedDeals.forEach((deal, position) => {
+    if (!deal.category) {
+      return;
+    }
+    if (!byCategory.has(deal.category)) {
+      byCategory.set(deal.category, []);
+    }
+    byCategory.get(deal.category).push(position);
+  });
+
+  const values = Array.from(byCategory.entries())
+    .sort((a, b) => b[1].length - a[1].length || (a[0] < b[0] ? -1 : 1))
+    .map(([category, positions]) => facetValue(category, category, positions));
+
+  return { key: 'category', label: 'Category', values };
+}
+
+// Sorted values are stored as differences from the previous value
+function deltaEncode(values) {
+  let previous = 0;
+  return values.map(value => {
+    const delta = value - previous;
+    previous = value;
+    return delta;
+  });
+}
+
+function rangeIndex(key, label, unit, sortedDeals, valueOf, buckets) {
+  const entries = sortedDeals
+    .map((deal, position) => ({ position, value: Math.round(Number(valueOf(deal)) || 0) }))
+    .sort((a, b) => a.value - b.value || a.position - b.position);
+
+  return {
+    key,
+    label,
+    unit,
+    order: entries.map(entry => entry.position),
+    values: deltaEncode(entries.map(entry => entry.value)),
+    buckets
+  };
+}
+
+function buildFacets(sortedDeals, version) {
+  return {
+    format: 'facets-v2',
+    version,
+    total: sortedDeals.length,
+    dimensions: [categoryDimension(sortedDeals)],
+    ranges: [
+      rangeIndex('price', 'Price', 'cents', sortedDeals, deal => Number(deal.price) * 100, PRICE_BUCKETS),
+      rangeIndex('discount', 'Discount', 'percent', sortedDeals, deal => deal.discountPercent, DISCOUNT_BUCKETS)
+    ]
+  };
+}
+
+module.exports = { buildFacets };
@@ -0,0 +1,138 @@
+// Publish step - versioned deals feed with deltas between versions
+//
+// The history keeps the id -> content hash snapshot of the latest version
+// and, for the last few versions, which ids were upserted or removed and the
+// catalog hashes (manifest.version) before and after. From
+// that we can write one delta file per supported starting version, each
+// carrying only the deals a client on that version is missing.
+//
+// The history is not part of the checkout. Every publish deploys the history
+// it used (feed-history.json next to the manifest), and the next build starts
+// from that live copy, so version numbers follow what clients were actually
+// served. A local cache (kept between builds) covers offline runs and a live
+// copy that cannot be fetched.
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+const FETCH_TIMEOUT_MS = 10000;
+
+function hashDeal(deal) {
+  return crypto.createHash('sha1').update(JSON.stringify(deal)).digest('hex').slice(0, 12);
+}
+
+function readHistory(file) {
+  if (!fs.existsSync(file)) {
+    return null;
+  }
+  return JSON.parse(fs.readFileSync(file, 'utf8'));
+}
+
+// null when nothing has been deployed yet; throws when the site cannot be reached
+async function fetchHistory(url) {
+  const response = await fetch(url, { signal: AbortSignal.timeout(FETCH_TIMEOUT_MS) });
+  if (response.status === 404) {
+    return null;
+  }
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}`);
+  }
+  return response.json();
+}
+
+async function loadHistory({ historyUrl, cacheFile }) {
+  if (historyUrl) {
+    try {
+      const live = await fetchHistory(historyUrl);
+      if (live) {
+        return live;
+      }
+      console.warn(`No feed history at ${historyUrl} yet, continuing from the local cache`);
+    } catch (error) {
+      console.warn(`Could not fetch the feed history from ${historyUrl} (${error.message}), continuing from the local cache`);
+    }
+  }
+  return readHistory(cacheFile);
+}
+
+function snapshotOf(deals) {
+  const snapshot = {};
+  deals.forEach(deal => {
+    snapshot[deal.id] = hashDeal(deal);
+  });
+  return snapshot;
+}
+
+// Advances the history by one version when the catalog changed since the last publish
+function advanceHistory(history, sortedDeals, contentHash, maxDeltas) {
+  const snapshot = snapshotOf(sortedDeals);
+
+  if (!history) {
+    return { latest: 1, hash: contentHash, snapshot, versions: [] };
+  }
+
+  if (history.hash === contentHash) {
+    return history;
+  }
+
+  const upserted = Object.keys(snapshot).filter(id => history.snapshot[id] !== snapshot[id]);
+  const removed = Object.keys(history.snapshot).filter(id => !(id in snapshot));
+  const latest = history.latest + 1;
+
+  return {
+    latest,
+    hash: contentHash,
+    snapshot,
+    versions: [
+      ...history.versions,
+      { version: latest, hash: contentHash, previousHash: history.hash, generatedAt: new Date().toISOString(), upserted, removed }
+    ]
+      .slice(-maxDeltas)
+  };
+}
+
+function buildDeltas(history, sortedDeals) {
+  const byId = new Map(sortedDeals.map(deal => [deal.id, deal]));
+  const deltas = [];
+
+  history.versions.forEach(({ version, previousHash }) => {
+    const from = version - 1;
+    const touched = new Set();
+
+    history.versions
+      .filter(entry => entry.version > from)
+      .forEach(entry => {
+        entry.upserted.forEach(id => touched.add(id));
+        entry.removed.forEach(id => touched.add(id));
+      });
+
+    const ids = [...touched];
+    // Clients check both hashes, so a delta only ever applies to the exact catalog it was built from
+    deltas.push({
+      from,
+      to: history.latest,
+      fromHash: previousHash || null,
+      toHash: history.hash,
+      upserted: ids.filter(id => byId.has(id)).map(id => byId.get(id)),
+      removed: ids.filter(id => !byId.has(id))
+    });
+  });
+
+  return deltas;
+}
+
+// history is the advanced history, to be deployed for the next build to continue from
+async function updateFeed(sortedDeals, { historyUrl, cacheFile, contentHash, maxDeltas }) {
+  const history = advanceHistory(await loadHistory({ historyUrl, cacheFile }), sortedDeals, contentHash, maxDeltas);
+  fs.mkdirSync(path.dirname(cacheFile), { recursive: true });
+  fs.writeFileSync(cacheFile, JSON.stringify(history, null, 2) + '\n');
+
+  return {
+    history,
+    version: history.latest,
+    oldest: history.versions.length ? history.versions[0].version - 1 : history.latest,
+    deltas: buildDeltas(history, sortedDeals)
+  };
+}
+
+module.exports = { hashDeal, updateFeed };
@@ -0,0 +1,69 @@
+// Publish step - sized image URLs for the card, sidebar and modal
+//
+// Amazon's image CDN renders any size from a token in the file name
+// (71aCrq4fFkL._AC_SL320_.jpg), so a deal whose image is an Amazon image,
+// or a WordPress mirror of one, can point straight at the size it renders at.
+// Each URL is reduced to a template with a {size} slot; deals whose image is
+// not recognized keep only their original imageUrl.
+
+// Longest-side sizes at 2x the slot: 160px card image, 80px sidebar thumbnail, 256px+ modal
+const IMAGE_SIZES = {
+  card: '_AC_SL320_',
+  sidebar: '_AC_SL160_',
+  modal: '_AC_SL640_'
+};
+
+const AMAZON_HOSTS = ['m.media-amazon.com', 'images-na.ssl-images-amazon.com', 'images-amazon.com'];
+const AMAZON_CDN = 'https://m.media-amazon.com/images/I/';
+
+// <id>.<size tokens>.<ext>, e.g. 81Z06rm5wsL._AC_SX679_.jpg or 71x.__AC_SX300_SY300_QL70_ML2_.jpg
+const AMAZON_FILE = /^([0-9A-Za-z%+-]+?)(?:\.[_A-Z0-9,]*_)?\.(jpe?g|png|gif)$/;
+// WordPress keeps the Amazon name and may append a -<suffix> before the extension
+const MIRRORED_FILE = /^([0-9A-Za-z-]{11})\._{1,2}[A-Z0-9_,]*_(?:-[0-9A-Za-z]+)?\.(jpe?g|png)$/;
+
+function parseUrl(value) {
+  try {
+    return new URL(value);
+  } catch {
+    return null;
+  }
+}
+
+function imageTemplate(imageUrl) {
+  const url = parseUrl(imageUrl);
+  if (!url || url.search) {
+    return null;
+  }
+
+  const file = url.pathname.slice(url.pathname.lastIndexOf('/') + 1);
+
+  if (AMAZON_HOSTS.includes(url.hostname) && url.pathname.startsWith('/images/I/')) {
+    const match = AMAZON_FILE.exec(file);
+    return match ? `${AMAZON_CDN}${match[1]}.{size}.${match[2]}` : null;
+  }
+
+  // Only 11-character ids are complete; WordPress drops the '+' some ids contain
+  if (url.pathname.includes('/wp-content/uploads/')) {
+    const match = MIRRORED_FILE.exec(file);
+    return match ? `${AMAZON_CDN}${match[1]}.{size}.${match[2]}` : null;
+  }
+
+  return null;
+}
+
+function expandTemplate(template) {
+  const images = {};
+  Object.keys(IMAGE_SIZES).forEach(slot => {
+    images[slot] = template.replace('{size}', IMAGE_SIZES[slot]);
+  });
+  return images;
+}
+
+function withImageSizes(deals) {
+  return deals.map(deal => {
+    const template = imageTemplate(deal.imageUrl);
+    return template ? { ...deal, images: expandTemplate(template) } : deal;
+  });
+}
+
+module.exports = { IMAGE_SIZES, imageTemplate, expandTemplate, withImageSizes };
@@ -0,0 +1,117 @@
+// Publish step - inline image placeholders (dominant colour + tiny LQIP)
+//
+// Each deal image is fetched once during the build, reduced with sharp to its
+// dominant colour and a ~10px WebP data URL, and remembered in a cache file
+// keyed by image URL (kept between builds, not committed) so later builds only
+// fetch images they have not seen. sharp is an optional dependency: without
+// it, or with offline set (npm start), only the cached placeholders are used
+// and nothing is fetched.
+const fs = require('fs');
+const path = require('path');
+
+const LQIP_SIZE = 10;
+const FETCH_TIMEOUT_MS = 8000;
+const CONCURRENCY = 6;
+const RETRY_FAILED_AFTER_MS = 7 * 24 * 60 * 60 * 1000;
+
+function loadSharp() {
+  try {
+    return require('sharp');
+  } catch {
+    return null;
+  }
+}
+
+function readCache(file) {
+  if (!fs.existsSync(file)) {
+    return {};
+  }
+  return JSON.parse(fs.readFileSync(file, 'utf8'));
+}
+
+function writeCache(file, cache, deals) {
+  // Only keep entries for images still in the catalog
+  const kept = {};
+  deals.forEach(deal => {
+    if (cache[deal.imageUrl]) {
+      kept[deal.imageUrl] = cache[deal.imageUrl];
+    }
+  });
+
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  fs.writeFileSync(file, JSON.stringify(kept, null, 2) + '\n');
+}
+
+function toHex({ r, g, b }) {
+  return '#' + [r, g, b].map(value => Math.round(value).toString(16).padStart(2, '0')).join('');
+}
+
+async function computePlaceholder(sharp, imageUrl) {
+  const response = await fetch(imageUrl, { signal: AbortSignal.timeout(FETCH_TIMEOUT_MS) });
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}`);
+  }
+
+  const input = Buffer.from(await response.arrayBuffer());
+  const image = sharp(input).flatten({ background: '#ffffff' });
+  const { dominant } = await image.clone().stats();
+  const lqip = await image
+    .resize(LQIP_SIZE, LQIP_SIZE, { fit: 'inside' })
+    .webp({ quality: 40 })
+    .toBuffer();
+
+  return {
+    color: toHex(dominant),
+    lqip: `data:image/webp;base64,${lqip.toString('base64')}`
+  };
+}
+
+function isStale(entry, now) {
+  return !entry || (entry.failedAt && now - Date.parse(entry.failedAt) > RETRY_FAILED_AFTER_MS);
+}
+
+async function fillCache(sharp, cache, urls) {
+  const now = Date.now();
+  const pending = urls.filter(url => isStale(cache[url], now));
+  let next = 0;
+  let computed = 0;
+
+  const worker = async () => {
+    while (next < pending.length) {
+      const url = pending[next++];
+      try {
+        cache[url] = await computePlaceholder(sharp, url);
+        computed++;
+      } catch (error) {
+        console.warn(`No placeholder for ${url}: ${error.message}`);
+        cache[url] = { failedAt: new Date(now).toISOString() };
+      }
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.min(CONCURRENCY, pending.length) }, worker));
+  return computed;
+}
+
+async function withPlaceholders(deals, { cacheFile, offline = false }) {
+  const cache = readCache(cacheFile);
+  const sharp = offline ? null : loadSharp();
+  let computed = 0;
+
+  if (sharp) {
+    const urls = Array.from(new Set(deals.map(deal => deal.imageUrl).filter(Boolean)));
+    computed = await fillCache(sharp, cache, urls);
+    writeCache(cacheFile, cache, deals);
+  } else if (!offline) {
+    console.warn('sharp is not installed, so no new image placeholders were made; install it to build them');
+  }
+
+  const withData = deals.map(deal => {
+    const entry = cache[deal.imageUrl];
+    return entry && entry.color ? { ...deal, imageColor: entry.color, imageLqip: entry.lqip } : deal;
+  });
+
+  return { deals: withData, computed };
+}
+
+module.exports = { withPlaceholders };
@@ -0,0 +1,98 @@
+// Publish step - inverted search index over title, description and category
+//
+// Documents are deal positions in the manifest order, so a hit maps straight to
+// a page shard. Every posting carries a precomputed BM25F impact (field-weighted
+// term frequency, length-normalized per field, times idf), so the client ranks
+// hits by adding integers instead of keeping document statistics. The
+// normalization rules must stay in sync with src/utils/searchIndex.ts, which
+// tokenizes queries the same way.
+
+const INDEXED_FIELDS = ['title', 'description', 'category'];
+
+// A title hit says far more about a deal than a word buried in the description
+const FIELD_WEIGHTS = { title: 3, description: 1, category: 2 };
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+// Impacts are stored as integers at this scale to keep the JSON small
+const SCORE_SCALE = 100;
+
+// Common English and French filler words that would only bloat the postings
+const STOP_WORDS = new Set([
+  'and', 'the', 'for', 'with', 'of', 'to', 'in', 'on', 'or', 'by', 'an', 'at',
+  'et', 'le', 'la', 'les', 'de', 'des', 'du', 'un', 'une', 'pour', 'avec', 'en', 'au', 'aux'
+]);
+
+function normalizeText(text) {
+  return String(text || '')
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/œ/g, 'oe')
+    .replace(/æ/g, 'ae');
+}
+
+function tokenize(text) {
+  return normalizeText(text)
+    .split(/[^a-z0-9]+/)
+    .filter(token => token.length > 1 && !STOP_WORDS.has(token));
+}
+
+function countTokens(text) {
+  const counts = new Map();
+  const tokens = tokenize(text);
+  tokens.forEach(token => counts.set(token, (counts.get(token) || 0) + 1));
+  return { counts, length: tokens.length };
+}
+
+function buildSearchIndex(sortedDeals, version) {
+  const total = sortedDeals.length;
+  const docs = sortedDeals.map(deal => INDEXED_FIELDS.map(field => countTokens(deal[field])));
+  const averageLengths = INDEXED_FIELDS.map((_, f) =>
+    Math.max(1, docs.reduce((sum, fields) => sum + fields[f].length, 0) / Math.max(total, 1))
+  );
+  const postingsByTerm = new Map();
+
+  docs.forEach((fields, position) => {
+    // Field-weighted, length-normalized frequency of each term in this deal
+    const weighted = new Map();
+    fields.forEach(({ counts, length }, f) => {
+      const norm = 1 - BM25_B + BM25_B * (length / averageLengths[f]);
+      const weight = FIELD_WEIGHTS[INDEXED_FIELDS[f]];
+      counts.forEach((count, term) => {
+        weighted.set(term, (weighted.get(term) || 0) + (weight * count) / norm);
+      });
+    });
+
+    weighted.forEach((frequency, term) => {
+      if (!postingsByTerm.has(term)) {
+        postingsByTerm.set(term, { positions: [], frequencies: [] });
+      }
+      // Positions are visited in order, so every posting list stays sorted
+      const entry = postingsByTerm.get(term);
+      entry.positions.push(position);
+      entry.frequencies.push(frequency);
+    });
+  });
+
+  const terms = [...postingsByTerm.keys()].sort();
+
+  const scores = terms.map(term => {
+    const { positions, frequencies } = postingsByTerm.get(term);
+    const idf = Math.log(1 + (total - positions.length + 0.5) / (positions.length + 0.5));
+    return frequencies.map(frequency =>
+      Math.max(1, Math.round(SCORE_SCALE * idf * (frequency * (BM25_K1 + 1)) / (frequency + BM25_K1)))
+    );
+  });
+
+  return {
+    format: 'search-v2',
+    version,
+    fields: INDEXED_FIELDS,
+    total,
+    terms,
+    postings: terms.map(term => postingsByTerm.get(term).positions),
+    scores
+  };
+}
+
+module.exports = { INDEXED_FIELDS, FIELD_WEIGHTS, STOP_WORDS, normalizeText, tokenize, buildSearchIndex };
@@ -0,0 +1,56 @@
+// Publish step - split the deal list into fixed-size page shards plus a manifest
+const crypto = require('crypto');
+
+// Newest first, ties broken by id so every artifact agrees on deal positions
+function compareDeals(a, b) {
+  if (a.dateAdded !== b.dateAdded) {
+    return a.dateAdded < b.dateAdded ? 1 : -1;
+  }
+  return a.id < b.id ? -1 : a.id > b.id ? 1 : 0;
+}
+
+function sortDeals(deals) {
+  return [...deals].sort(compareDeals);
+}
+
+function hashDeals(deals) {
+  return crypto
+    .createHash('sha1')
+    .update(JSON.stringify(deals))
+    .digest('hex')
+    .slice(0, 12);
+}
+
+// Featured positions by discount, so the sidebar never needs the whole catalog
+function topFeatured(sorted, limit) {
+  return sorted
+    .map((deal, position) => ({ deal, position }))
+    .filter(({ deal }) => deal.featured)
+    .sort((a, b) => b.deal.discountPercent - a.deal.discountPercent || a.position - b.position)
+    .slice(0, limit)
+    .map(({ position }) => position);
+}
+
+// Page URLs are left to the caller, which only knows the data directory once every file is built
+function buildShards(deals, { pageSize, featuredLimit }) {
+  const sorted = sortDeals(deals);
+  const pages = [];
+
+  for (let start = 0; start < sorted.length; start += pageSize) {
+    pages.push(sorted.slice(start, start + pageSize));
+  }
+
+  const manifest = {
+    version: hashDeals(sorted),
+    generatedAt: new Date().toISOString(),
+    total: sorted.length,
+    pageSize,
+    pageCount: pages.length,
+    pages: [],
+    featured: topFeatured(sorted, featuredLimit)
+  };
+
+  return { manifest, pages, sorted };
+}
+
+module.exports = { compareDeals, sortDeals, hashDeals, buildShards };
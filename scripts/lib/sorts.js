@@ -0,0 +1,35 @@
+// Publish step - alternative listing orders as position permutations
+//
+// Each order lists every deal position once; ties keep the published
+// newest-first order. Newest itself is the identity and is not written.
+// Decoded by src/utils/sortOrders.ts.
+
+const cents = amount => Math.round((Number(amount) || 0) * 100);
+
+// Deals have no click data yet: an explicit `popularity` from the scraper wins,
+// then featured deals, then the bigger discount
+const SORTS = {
+  discount: (a, b) => (Number(b.discountPercent) || 0) - (Number(a.discountPercent) || 0),
+  price: (a, b) => cents(a.price) - cents(b.price),
+  savings: (a, b) => (cents(b.originalPrice) - cents(b.price)) - (cents(a.originalPrice) - cents(a.price)),
+  popularity: (a, b) =>
+    (Number(b.popularity) || 0) - (Number(a.popularity) || 0) ||
+    (b.featured ? 1 : 0) - (a.featured ? 1 : 0) ||
+    (Number(b.discountPercent) || 0) - (Number(a.discountPercent) || 0)
+};
+
+function buildSorts(sortedDeals, version) {
+  const positions = sortedDeals.map((_, position) => position);
+  const orders = {};
+
+  Object.keys(SORTS).forEach(key => {
+    const compare = SORTS[key];
+    orders[key] = positions
+      .slice()
+      .sort((a, b) => compare(sortedDeals[a], sortedDeals[b]) || a - b);
+  });
+
+  return { format: 'sorts-v1', version, total: sortedDeals.length, orders };
+}
+
+module.exports = { buildSorts };
@@ -0,0 +1,165 @@
+#!/usr/bin/env node
+// Publish step - turns public/deals.json into the static data files the site loads
+//
+// Usage: node scripts/publish-deals.js [--page-size 12] [--offline]
+//
+// --offline publishes with the cached image placeholders only, without fetching
+// new images or the deployed feed history (npm start uses it; builds fetch).
+//
+// FEED_HISTORY_URL is where the deployed feed history lives, by default the
+// production site's /data/feed-history.json on Vercel.
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const { buildShards } = require('./lib/shards');
+const { buildSearchIndex } = require('./lib/searchIndex');
+const { buildCompact } = require('./lib/compact');
+const { buildFacets } = require('./lib/facets');
+const { buildSorts } = require('./lib/sorts');
+const { updateFeed } = require('./lib/feed');
+const { withImageSizes } = require('./lib/imageSizes');
+const { withPlaceholders } = require('./lib/placeholders');
+
+const ROOT = path.resolve(__dirname, '..');
+const SOURCE_FILE = path.join(ROOT, 'public', 'deals.json');
+const CONFIG_FILE = path.join(ROOT, 'public', 'config.json');
+const OUTPUT_DIR = path.join(ROOT, 'public', 'data');
+const FEED_CACHE_FILE = path.join(ROOT, 'node_modules', '.cache', 'deals-feed', 'history.json');
+const FEED_HISTORY_FILE = 'feed-history.json';
+const PLACEHOLDER_FILE = path.join(ROOT, 'node_modules', '.cache', 'deal-placeholders', 'placeholders.json');
+const BASE_URL = '/data';
+const DEFAULT_PAGE_SIZE = 12;
+const MAX_FEED_DELTAS = 30;
+const DEFAULT_FEATURED_COUNT = 5;
+
+function readJson(file, fallback) {
+  if (!fs.existsSync(file)) {
+    return fallback;
+  }
+  return JSON.parse(fs.readFileSync(file, 'utf8'));
+}
+
+function writeJson(file, data) {
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  fs.writeFileSync(file, JSON.stringify(data));
+}
+
+// Covers file names too, so a change in page size or feed range moves the directory as well
+function hashFiles(files) {
+  const hash = crypto.createHash('sha1');
+  Object.keys(files).sort().forEach(name => {
+    hash.update(name).update('\0').update(JSON.stringify(files[name])).update('\0');
+  });
+  return hash.digest('hex').slice(0, 12);
+}
+
+function getArg(name) {
+  const index = process.argv.indexOf(`--${name}`);
+  return index === -1 ? undefined : process.argv[index + 1];
+}
+
+function feedHistoryUrl() {
+  if (process.env.FEED_HISTORY_URL) {
+    return process.env.FEED_HISTORY_URL;
+  }
+  const host = process.env.VERCEL_PROJECT_PRODUCTION_URL;
+  return host ? `https://${host}${BASE_URL}/${FEED_HISTORY_FILE}` : null;
+}
+
+function resolvePageSize(config) {
+  const fromArgs = parseInt(getArg('page-size'), 10);
+  if (fromArgs > 0) {
+    return fromArgs;
+  }
+
+  return config.content?.itemsPerPage || DEFAULT_PAGE_SIZE;
+}
+
+// Deals are keyed by id everywhere downstream, so keep the first copy of each
+function dedupeDeals(deals) {
+  const seen = new Set();
+  return deals.filter(deal => {
+    if (seen.has(deal.id)) {
+      console.warn(`Skipping duplicate deal id: ${deal.id}`);
+      return false;
+    }
+    seen.add(deal.id);
+    return true;
+  });
+}
+
+async function main() {
+  const offline = process.argv.includes('--offline');
+  const placeholders = await withPlaceholders(
+    withImageSizes(dedupeDeals(readJson(SOURCE_FILE, []))),
+    { cacheFile: PLACEHOLDER_FILE, offline }
+  );
+  const deals = placeholders.deals;
+  const config = readJson(CONFIG_FILE, {});
+  const pageSize = resolvePageSize(config);
+  const featuredLimit = config.content?.featuredItemsCount || DEFAULT_FEATURED_COUNT;
+
+  const { manifest, pages, sorted } = buildShards(deals, { pageSize, featuredLimit });
+  const searchIndex = buildSearchIndex(sorted, manifest.version);
+  const compact = buildCompact(sorted, manifest.version);
+  const facets = buildFacets(sorted, manifest.version);
+  const feed = await updateFeed(sorted, {
+    historyUrl: offline ? null : feedHistoryUrl(),
+    cacheFile: FEED_CACHE_FILE,
+    contentHash: manifest.version,
+    maxDeltas: MAX_FEED_DELTAS
+  });
+
+  const files = {
+    'search-index.json': searchIndex,
+    'deals.compact.json': compact,
+    'facets.json': facets,
+    'sorts.json': buildSorts(sorted, manifest.version),
+    'feed/snapshot.json': { version: feed.version, hash: manifest.version, deals: sorted }
+  };
+  pages.forEach((page, index) => {
+    files[`pages/${index + 1}.json`] = page;
+  });
+  feed.deltas.forEach(delta => {
+    files[`feed/delta-${delta.from}.json`] = delta;
+  });
+
+  // Everything but the manifest lives under a directory named after its own
+  // contents, so those URLs never change meaning and can be cached for good
+  const dataVersion = hashFiles(files);
+  const dataUrl = `${BASE_URL}/${dataVersion}`;
+
+  manifest.dataUrl = dataUrl;
+  manifest.pages = pages.map((_, index) => `${dataUrl}/pages/${index + 1}.json`);
+  manifest.searchIndex = `${dataUrl}/search-index.json`;
+  manifest.compact = `${dataUrl}/deals.compact.json`;
+  manifest.facets = `${dataUrl}/facets.json`;
+  manifest.sorts = `${dataUrl}/sorts.json`;
+  manifest.feed = {
+    version: feed.version,
+    oldest: feed.oldest,
+    snapshot: `${dataUrl}/feed/snapshot.json`,
+    deltas: `${dataUrl}/feed/delta-{from}.json`
+  };
+
+  fs.rmSync(OUTPUT_DIR, { recursive: true, force: true });
+  Object.entries(files).forEach(([name, data]) => {
+    writeJson(path.join(OUTPUT_DIR, dataVersion, name), data);
+  });
+  writeJson(path.join(OUTPUT_DIR, 'manifest.json'), manifest);
+  // Deployed with the site so the next build continues this history
+  writeJson(path.join(OUTPUT_DIR, FEED_HISTORY_FILE), feed.history);
+
+  console.log(`Published ${manifest.total} deals in ${manifest.pageCount} pages of ${pageSize} (version ${manifest.version}, files in ${dataUrl})`);
+  console.log(`Search index: ${searchIndex.terms.length} terms`);
+  console.log(`Placeholders: ${deals.filter(deal => deal.imageColor).length} of ${deals.length} deals (${placeholders.computed} new)`);
+  console.log(`Sized images: ${deals.filter(deal => deal.images).length} of ${deals.length} deals`);
+  console.log(`Compact data: ${compact.urlPrefixes.length} URL prefixes, ${compact.categories.length} categories`);
+  console.log(`Facets: ${facets.dimensions.map(dimension => `${dimension.values.length} ${dimension.key}`).join(', ')}; ranges: ${facets.ranges.map(range => range.key).join(', ')}`);
+  console.log(`Feed version ${feed.version} with ${feed.deltas.length} deltas`);
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
@@ -1,12 +1,15 @@
-import React, { useState } from 'react';
+import React, { Suspense } from 'react';
 import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
 import { ConfigProvider } from './components/ConfigProvider';
 import { useConfig } from './hooks/useConfig';
 import Header from './components/Header';
 import HomePage from './components/HomePage';
-import AboutPage from './components/AboutPage';
-import CouponsPage from './components/CouponsPage';
-import AdminDashboard from './components/AdminDashboard';
+import { lazyWithPreload } from './utils/lazyWithPreload';
+
+// Everything but the deal listing is its own chunk, so shoppers never download the admin UI
+const AboutPage = lazyWithPreload(() => import('./components/AboutPage'));
+const CouponsPage = lazyWithPreload(() => import('./components/CouponsPage'));
+const AdminDashboard = lazyWithPreload(() => import('./components/AdminDashboard'));
 
 function App() {
   return (
@@ -17,38 +20,30 @@ function App() {
 }
 
 function AppContent() {
-  const [searchQuery, setSearchQuery] = useState('');
-
-  const handleSearch = (query: string) => {
-    setSearchQuery(query);
-  };
-
   return (
     <Router>
-      <AppRoutes searchQuery={searchQuery} onSearch={handleSearch} />
+      <AppRoutes />
     </Router>
   );
 }
 
-interface AppRoutesProps {
-  searchQuery: string;
-  onSearch: (query: string) => void;
-}
-
-function AppRoutes({ searchQuery, onSearch }: AppRoutesProps) {
+// The search query lives in the URL (?q=), read by Header and HomePage directly
+function AppRoutes() {
   return (
     <div className="min-h-screen bg-gray-50">
-      <Header onSearch={onSearch} />
+      <Header />
       
-      <Routes>
-        <Route path="/" element={<HomePage searchQuery={searchQuery} />} />
-        <Route path="/deals" element={<HomePage searchQuery={searchQuery} />} />
-        <Route path="/about" element={<AboutPage />} />
-        <Route path="/coupons" element={<CouponsPage />} />
-        <Route path="/amazon" element={<HomePage searchQuery={searchQuery} />} />
-        <Route path="/categories" element={<HomePage searchQuery={searchQuery} />} />
-        <Route path="/admin" element={<AdminDashboard />} />
-      </Routes>
+      <Suspense fallback={<div className="min-h-[50vh]" />}>
+        <Routes>
+          <Route path="/" element={<HomePage />} />
+          <Route path="/deals" element={<HomePage />} />
+          <Route path="/about" element={<AboutPage />} />
+          <Route path="/coupons" element={<CouponsPage />} />
+          <Route path="/amazon" element={<HomePage />} />
+          <Route path="/categories" element={<HomePage />} />
+          <Route path="/admin" element={<AdminDashboard />} />
+        </Routes>
+      </Suspense>
       
       <AppFooter />
     </div>
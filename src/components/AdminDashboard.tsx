@@ -1,10 +1,20 @@
 import React, { useState, useEffect } from 'react';
 import AdminLogin from './AdminLogin';
+import { CacheStats, getCacheStats } from '../utils/serviceWorker';
+
+const CACHE_BUCKETS: { key: keyof CacheStats; label: string }[] = [
+  { key: 'data', label: 'Pages & data' },
+  { key: 'static', label: 'App bundles' },
+  { key: 'images', label: 'Images' }
+];
+
+const formatRatio = (ratio: number | null) => (ratio === null ? '—' : `${Math.round(ratio * 100)}%`);
 
 const AdminDashboard: React.FC = () => {
   const [isAuthenticated, setIsAuthenticated] = useState(false);
   const [loading, setLoading] = useState(true);
   const [token, setToken] = useState<string | null>(null);
+  const [cacheStats, setCacheStats] = useState<CacheStats | null>(null);
 
   useEffect(() => {
     const savedToken = localStorage.getItem('admin_token');
@@ -15,6 +25,12 @@ const AdminDashboard: React.FC = () => {
     }
   }, []);
 
+  useEffect(() => {
+    if (isAuthenticated) {
+      getCacheStats().then(setCacheStats);
+    }
+  }, [isAuthenticated]);
+
   const verifyToken = async (tokenToVerify: string) => {
     try {
       const response = await fetch('/api/admin/auth', {
@@ -46,6 +62,17 @@ const AdminDashboard: React.FC = () => {
   };
 
   const handleLogout = () => {
+    // Revoke the session server-side too; the local logout doesn't wait for it
+    if (token) {
+      fetch('/api/admin/auth', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify({ action: 'logout' })
+      }).catch(() => undefined);
+    }
     setToken(null);
     setIsAuthenticated(false);
     localStorage.removeItem('admin_token');
@@ -113,6 +140,23 @@ const AdminDashboard: React.FC = () => {
               <div>Total Sources: <span className="text-neon-orange">2</span></div>
             </div>
           </div>
+
+          <div className="bg-cyber-gray rounded-lg border border-gray-700 p-6">
+            <h2 className="text-xl font-bold text-neon-pink mb-4">📦 Offline Cache</h2>
+            <p className="text-gray-400 mb-4">Service worker hit ratios in this browser</p>
+            {cacheStats ? (
+              <div className="space-y-2 text-sm text-gray-300">
+                {CACHE_BUCKETS.map(({ key, label }) => (
+                  <div key={key}>
+                    {label}: <span className="text-neon-green">{formatRatio(cacheStats[key].hitRatio)}</span>
+                    <span className="text-gray-500"> ({cacheStats[key].hits} of {cacheStats[key].hits + cacheStats[key].misses})</span>
+                  </div>
+                ))}
+              </div>
+            ) : (
+              <div className="text-sm text-gray-500">No service worker active (advanced.enablePWA is off, or this is a dev build)</div>
+            )}
+          </div>
         </div>
 
         <div className="mt-8 bg-cyber-gray rounded-lg border border-gray-700 p-6">
@@ -3,6 +3,7 @@ import { motion, PanInfo, useMotionValue, useTransform } from 'framer-motion';
 import { Deal } from '../types/Deal';
 import { getPriceDisplay } from '../utils/dealUtils';
 import { getPriceVisibility } from '../utils/priceVisibility';
+import DealImage from './DealImage';
 
 interface BottomSheetProps {
   deal: Deal | null;
@@ -15,15 +16,25 @@ const BottomSheet: React.FC<BottomSheetProps> = ({ deal, isOpen, onClose }) => {
   const opacity = useTransform(y, [0, 300], [1, 0]);
 
   useEffect(() => {
-    if (isOpen) {
-      // Prevent body scroll when bottom sheet is open
-      document.body.style.overflow = 'hidden';
-    } else {
-      document.body.style.overflow = 'unset';
+    if (!isOpen) {
+      return;
     }
 
+    // Pin the body in place instead of only hiding overflow: iOS ignores
+    // overflow on body, and the virtual grid needs the page to stay where it was
+    const scrollY = window.scrollY;
+    const { style } = document.body;
+    style.position = 'fixed';
+    style.top = `-${scrollY}px`;
+    style.width = '100%';
+    style.overflow = 'hidden';
+
     return () => {
-      document.body.style.overflow = 'unset';
+      style.position = '';
+      style.top = '';
+      style.width = '';
+      style.overflow = '';
+      window.scrollTo(0, scrollY);
     };
   }, [isOpen]);
 
@@ -85,13 +96,10 @@ const BottomSheet: React.FC<BottomSheetProps> = ({ deal, isOpen, onClose }) => {
           {/* Product Image */}
           <div className="flex justify-center mb-6">
             <div className="relative w-48 h-48 bg-gray-100 rounded-2xl overflow-hidden">
-              <img
-                src={deal.imageUrl}
-                alt={deal.title}
+              <DealImage
+                deal={deal}
+                slot="sheet"
                 className="w-full h-full object-contain p-4"
-                onError={(e) => {
-                  e.currentTarget.src = '/placeholder-deal.svg';
-                }}
               />
               
               {/* Discount Badge */}
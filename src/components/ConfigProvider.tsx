@@ -1,5 +1,6 @@
-import React, { ReactNode } from 'react';
+import React, { ReactNode, useEffect } from 'react';
 import { ConfigContext, useConfigLoader } from '../hooks/useConfig';
+import { registerServiceWorker, unregisterServiceWorker } from '../utils/serviceWorker';
 
 interface ConfigProviderProps {
   children: ReactNode;
@@ -11,6 +12,19 @@ interface ConfigProviderProps {
  */
 export const ConfigProvider: React.FC<ConfigProviderProps> = ({ children }) => {
   const { config, loading, error } = useConfigLoader();
+  const enablePWA = config.advanced?.enablePWA;
+
+  useEffect(() => {
+    if (loading) {
+      return;
+    }
+
+    if (enablePWA) {
+      registerServiceWorker();
+    } else {
+      unregisterServiceWorker();
+    }
+  }, [loading, enablePWA]);
   
   // Show loading state while configuration is being loaded
   if (loading) {
@@ -2,15 +2,19 @@ import React from 'react';
 import { Deal } from '../types/Deal';
 import { getPriceDisplay } from '../utils/dealUtils';
 import { getPriceVisibility } from '../utils/priceVisibility';
+import DealImage from './DealImage';
+import HighlightedText from './HighlightedText';
 
 interface DealCardProps {
   deal: Deal;
-  onClick: () => void;
+  onClick: (deal: Deal) => void;
   variant?: 'default' | 'featured';
   colorIndex?: number;
+  // Matched search terms to highlight in the title and description
+  highlight?: string[];
 }
 
-const DealCard: React.FC<DealCardProps> = ({ deal, onClick, variant = 'default', colorIndex = 0 }) => {
+const DealCard: React.FC<DealCardProps> = ({ deal, onClick, variant = 'default', colorIndex = 0, highlight }) => {
   const bgColors = ['bg-card-pink', 'bg-card-blue', 'bg-card-yellow'];
   const bgColor = bgColors[colorIndex % bgColors.length];
   
@@ -18,19 +22,13 @@ const DealCard: React.FC<DealCardProps> = ({ deal, onClick, variant = 'default',
   const priceDisplay = getPriceDisplay(deal.originalPrice, deal.price, deal.discountPercent);
   const priceVisibility = getPriceVisibility(deal.id);
   
-  const handleImageError = (e: React.SyntheticEvent<HTMLImageElement>) => {
-    if (process.env.NODE_ENV === 'development') {
-      console.warn('Image failed to load:', deal.imageUrl);
-    }
-    e.currentTarget.src = '/placeholder-deal.svg';
-  };
-  
   return (
     <div 
+      data-deal-card
       className={`${bgColor} rounded-lg overflow-hidden cursor-pointer transform transition-transform hover:scale-105 ${
         isLarge ? 'h-96' : 'h-80'
       }`}
-      onClick={onClick}
+      onClick={() => onClick(deal)}
     >
       <div className="relative h-full flex flex-col">
         {priceDisplay.badge && priceDisplay.badge.primary && (
@@ -41,19 +39,17 @@ const DealCard: React.FC<DealCardProps> = ({ deal, onClick, variant = 'default',
         
         
         <div className={`relative ${isLarge ? 'h-64' : 'h-48'} overflow-hidden`}>
-          <img 
-            src={deal.imageUrl} 
-            alt={deal.title}
+          <DealImage
+            deal={deal}
+            slot={isLarge ? 'featured' : 'card'}
             className="w-full h-full object-contain p-4"
-            onError={handleImageError}
             loading="lazy"
-            referrerPolicy="no-referrer"
           />
         </div>
         
         <div className="flex-1 p-4 bg-white/90 flex flex-col justify-between">
           <h3 className={`font-semibold text-text-dark ${isLarge ? 'text-lg' : 'text-base'} line-clamp-2 mb-2`}>
-            {deal.title}
+            <HighlightedText text={deal.title} terms={highlight} />
           </h3>
           
           <div className="flex items-end justify-between">
@@ -82,7 +78,9 @@ const DealCard: React.FC<DealCardProps> = ({ deal, onClick, variant = 'default',
               // Show "Check Price" button for ~80% of deals (badge already shown at top)
               <div className="w-full">
                 <div className="text-center mb-3">
-                  <p className="text-sm text-text-dark leading-tight">{deal.description}</p>
+                  <p className="text-sm text-text-dark leading-tight">
+                    <HighlightedText text={deal.description} terms={highlight} />
+                  </p>
                 </div>
                 <a
                   href={deal.affiliateUrl}
@@ -102,4 +100,5 @@ const DealCard: React.FC<DealCardProps> = ({ deal, onClick, variant = 'default',
   );
 };
 
-export default DealCard;
\ No newline at end of file
+// Memoized so scrolling the virtual grid only renders the rows that come into view
+export default React.memo(DealCard);
\ No newline at end of file
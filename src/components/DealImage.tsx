@@ -0,0 +1,116 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { Deal, DealImageSizes } from '../types/Deal';
+import { useConfig } from '../hooks/useConfig';
+import { getImageSources, ImageSlot } from '../utils/imageUrls';
+
+interface DealImageProps {
+  deal: Deal;
+  slot: ImageSlot;
+  className?: string;
+  loading?: 'lazy' | 'eager';
+}
+
+const PLACEHOLDER = '/placeholder-deal.svg';
+
+// The proxy only exists on the deployed functions, not under `npm start`
+const proxyEnabled = process.env.NODE_ENV === 'production';
+
+// Which publish-step size each slot uses when the image host serves sized URLs
+const SIZED_SLOTS: Record<ImageSlot, keyof DealImageSizes> = {
+  card: 'card',
+  featured: 'modal',
+  sidebar: 'sidebar',
+  modal: 'modal',
+  sheet: 'card'
+};
+
+type Stage = 'resized' | 'original' | 'placeholder';
+
+// Paints the publish-step colour and LQIP where the contained image will land
+const placeholderStyle = ({ imageColor, imageLqip }: Deal): React.CSSProperties | undefined => {
+  if (!imageColor) {
+    return undefined;
+  }
+
+  return {
+    backgroundColor: imageColor,
+    backgroundImage: imageLqip ? `url("${imageLqip}")` : undefined,
+    backgroundSize: 'contain',
+    backgroundPosition: 'center',
+    backgroundRepeat: 'no-repeat',
+    backgroundOrigin: 'content-box',
+    backgroundClip: 'content-box'
+  };
+};
+
+const DealImage: React.FC<DealImageProps> = ({ deal, slot, className, loading }) => {
+  const { config } = useConfig();
+  const [stage, setStage] = useState<Stage>('resized');
+  const [loaded, setLoaded] = useState(false);
+  const imageRef = useRef<HTMLImageElement>(null);
+  const { imageUrl, images } = deal;
+
+  useEffect(() => {
+    setStage('resized');
+    // Prerendered images can finish before hydration attaches onLoad
+    setLoaded(Boolean(imageRef.current?.complete && imageRef.current.naturalWidth));
+  }, [imageUrl]);
+
+  // Sized CDN URLs need no proxy hop; otherwise resize through the image endpoint
+  const sizedUrl = stage === 'resized' && images ? images[SIZED_SLOTS[slot]] : undefined;
+  const proxy = proxyEnabled ? config?.advanced?.imageProxy : undefined;
+  const sources = stage === 'resized' && !sizedUrl ? getImageSources(imageUrl, slot, proxy) : null;
+
+  // Fall back from the resized variant to the original, then to the placeholder
+  const handleError = () => {
+    if (process.env.NODE_ENV === 'development') {
+      console.warn('Image failed to load:', sizedUrl || imageUrl);
+    }
+    setStage(sizedUrl || sources ? 'original' : 'placeholder');
+  };
+
+  const handleLoad = () => setLoaded(true);
+  const style = loaded ? undefined : placeholderStyle(deal);
+
+  // Keep the inline placeholder rather than fetching the fallback SVG
+  if (stage === 'placeholder' && style) {
+    return <div role="img" aria-label={deal.title} className={className} style={style} />;
+  }
+
+  if (!sources) {
+    return (
+      <img
+        ref={imageRef}
+        src={stage === 'placeholder' ? PLACEHOLDER : sizedUrl || imageUrl}
+        alt={deal.title}
+        className={className}
+        style={style}
+        onLoad={handleLoad}
+        onError={stage === 'placeholder' ? undefined : handleError}
+        loading={loading}
+        referrerPolicy="no-referrer"
+      />
+    );
+  }
+
+  return (
+    <picture>
+      <source type="image/avif" srcSet={sources.avif} sizes={sources.sizes} />
+      <source type="image/webp" srcSet={sources.webp} sizes={sources.sizes} />
+      <img
+        src={sources.src}
+        srcSet={sources.jpeg}
+        sizes={sources.sizes}
+        alt={deal.title}
+        ref={imageRef}
+        className={className}
+        style={style}
+        onLoad={handleLoad}
+        onError={handleError}
+        loading={loading}
+      />
+    </picture>
+  );
+};
+
+export default DealImage;
@@ -2,6 +2,7 @@ import React from 'react';
 import { Deal } from '../types/Deal';
 import { getPriceDisplay } from '../utils/dealUtils';
 import { getPriceVisibility } from '../utils/priceVisibility';
+import DealImage from './DealImage';
 
 interface DealModalProps {
   deal: Deal | null;
@@ -39,18 +40,11 @@ const DealModal: React.FC<DealModalProps> = ({ deal, isOpen, onClose }) => {
             <div className="flex flex-col md:flex-row gap-6">
               <div className="md:w-1/2">
                 <div className="bg-gray-100 rounded-lg p-4">
-                  <img 
-                    src={deal.imageUrl} 
-                    alt={deal.title}
+                  <DealImage
+                    deal={deal}
+                    slot="modal"
                     className="w-full h-64 object-contain"
-                    onError={(e) => {
-                      if (process.env.NODE_ENV === 'development') {
-                        console.warn('Modal image failed to load:', deal.imageUrl);
-                      }
-                      e.currentTarget.src = '/placeholder-deal.svg';
-                    }}
                     loading="lazy"
-                    referrerPolicy="no-referrer"
                   />
                 </div>
                 {priceDisplay.badge && priceDisplay.badge.primary && (
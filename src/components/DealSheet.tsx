@@ -0,0 +1,26 @@
+import React from 'react';
+import { AnimatePresence } from 'framer-motion';
+import BottomSheet from './BottomSheet';
+import { Deal } from '../types/Deal';
+
+interface DealSheetProps {
+  deal: Deal | null;
+  isOpen: boolean;
+  onClose: () => void;
+}
+
+// Mobile detail view; its own chunk so framer-motion only loads on phones
+const DealSheet: React.FC<DealSheetProps> = ({ deal, isOpen, onClose }) => (
+  <AnimatePresence>
+    {isOpen && (
+      <BottomSheet
+        key="bottom-sheet"
+        deal={deal}
+        isOpen={isOpen}
+        onClose={onClose}
+      />
+    )}
+  </AnimatePresence>
+);
+
+export default DealSheet;
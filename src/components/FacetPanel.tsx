@@ -0,0 +1,85 @@
+import React from 'react';
+import { FacetFilters, FacetGroup, RangeFilter as RangeValue, RangeFilters, RangeGroup } from '../utils/facets';
+import RangeFilter from './RangeFilter';
+
+interface FacetPanelProps {
+  groups: FacetGroup[];
+  ranges: RangeGroup[];
+  filters: FacetFilters;
+  rangeFilters: RangeFilters;
+  onToggle: (key: string, value: string) => void;
+  onRangeChange: (key: string, value: RangeValue | null) => void;
+  onClear: () => void;
+}
+
+const FacetPanel: React.FC<FacetPanelProps> = ({
+  groups,
+  ranges,
+  filters,
+  rangeFilters,
+  onToggle,
+  onRangeChange,
+  onClear
+}) => {
+  const hasFilters = Object.keys(filters).length > 0 || Object.keys(rangeFilters).length > 0;
+
+  if (groups.length === 0 && ranges.length === 0) {
+    return null;
+  }
+
+  return (
+    <div className="bg-white rounded-lg shadow-sm p-4 mb-6">
+      <div className="flex items-center justify-between mb-3">
+        <span className="font-bold text-text-dark">Filter deals</span>
+        {hasFilters && (
+          <button onClick={onClear} className="text-sm text-primary-green hover:underline">
+            Clear filters
+          </button>
+        )}
+      </div>
+
+      <div className="space-y-3">
+        {groups.map(group => (
+          <div key={group.key}>
+            <div className="text-xs font-semibold uppercase text-gray-500 mb-2">{group.label}</div>
+            <div className="flex flex-wrap gap-2">
+              {group.options.map(option => {
+                const selected = Boolean(filters[group.key]?.includes(option.value));
+                return (
+                  <button
+                    key={option.value}
+                    onClick={() => onToggle(group.key, option.value)}
+                    disabled={!selected && option.count === 0}
+                    aria-pressed={selected}
+                    className={`px-3 py-1 rounded-full text-sm border transition-colors disabled:opacity-40 ${
+                      selected
+                        ? 'bg-primary-green text-white border-primary-green'
+                        : 'bg-white text-text-dark border-gray-200 hover:border-primary-green'
+                    }`}
+                  >
+                    {option.label} <span className={selected ? 'text-white/80' : 'text-gray-500'}>({option.count})</span>
+                  </button>
+                );
+              })}
+            </div>
+          </div>
+        ))}
+
+        {ranges.length > 0 && (
+          <div className="grid grid-cols-1 md:grid-cols-2 gap-6 pt-2">
+            {ranges.map(range => (
+              <RangeFilter
+                key={range.key}
+                group={range}
+                value={rangeFilters[range.key]}
+                onChange={onRangeChange}
+              />
+            ))}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default FacetPanel;
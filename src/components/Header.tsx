@@ -1,27 +1,40 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
+import { useLocation, useNavigate } from 'react-router-dom';
 import { useConfig } from '../hooks/useConfig';
+import { useSearchQuery } from '../hooks/useSearchQuery';
 
-interface HeaderProps {
-  onSearch?: (query: string) => void;
-}
+// Routes that render the deal listing and can show search results in place
+const LISTING_PATHS = ['/', '/deals', '/amazon', '/categories'];
 
-const Header: React.FC<HeaderProps> = ({ onSearch }) => {
+const Header: React.FC = () => {
   const { config } = useConfig();
   const [mobileMenuOpen, setMobileMenuOpen] = useState(false);
-  const [searchQuery, setSearchQuery] = useState('');
+  const [urlQuery, setUrlQuery] = useSearchQuery();
+  const [searchQuery, setSearchQuery] = useState(urlQuery);
+  const lastSentRef = useRef(urlQuery);
+  const location = useLocation();
+  const navigate = useNavigate();
+
+  // Follow URL changes we didn't cause (back/forward, links), but never let a
+  // lagging transition overwrite what is being typed
+  useEffect(() => {
+    if (urlQuery !== lastSentRef.current) {
+      lastSentRef.current = urlQuery;
+      setSearchQuery(urlQuery);
+    }
+  }, [urlQuery]);
 
   const handleSearchChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const query = e.target.value;
     setSearchQuery(query);
-    if (onSearch) {
-      onSearch(query);
-    }
+    lastSentRef.current = query;
+    setUrlQuery(query);
   };
 
   const handleSearchSubmit = (e: React.FormEvent) => {
     e.preventDefault();
-    if (onSearch) {
-      onSearch(searchQuery);
+    if (!LISTING_PATHS.includes(location.pathname)) {
+      navigate(`/deals?q=${encodeURIComponent(searchQuery)}`);
     }
   };
 
@@ -0,0 +1,43 @@
+import React, { useMemo } from 'react';
+import { findMatches } from '../utils/searchIndex';
+
+interface HighlightedTextProps {
+  text: string;
+  terms?: string[];
+}
+
+// Wraps the words of text that matched the search (typo and prefix matches included) in <mark>
+const HighlightedText: React.FC<HighlightedTextProps> = ({ text, terms }) => {
+  const parts = useMemo(() => {
+    const ranges = terms && terms.length > 0 ? findMatches(text, terms) : [];
+    const split: Array<{ text: string; match: boolean }> = [];
+    let at = 0;
+
+    ranges.forEach(([start, end]) => {
+      if (start > at) {
+        split.push({ text: text.slice(at, start), match: false });
+      }
+      split.push({ text: text.slice(start, end), match: true });
+      at = end;
+    });
+    if (at < text.length) {
+      split.push({ text: text.slice(at), match: false });
+    }
+
+    return split;
+  }, [text, terms]);
+
+  return (
+    <>
+      {parts.map((part, i) =>
+        part.match ? (
+          <mark key={i} className="bg-accent-yellow/60 text-current rounded-sm">{part.text}</mark>
+        ) : (
+          <React.Fragment key={i}>{part.text}</React.Fragment>
+        )
+      )}
+    </>
+  );
+};
+
+export default HighlightedText;
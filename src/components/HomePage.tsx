@@ -1,88 +1,163 @@
-import React, { useState, useEffect } from 'react';
-import { AnimatePresence } from 'framer-motion';
-import DealCard from './DealCard';
-import DealModal from './DealModal';
-import BottomSheet from './BottomSheet';
+import React, { useState, useCallback, useDeferredValue, useEffect, Suspense } from 'react';
+import { useLocation } from 'react-router-dom';
+import VirtualDealGrid from './VirtualDealGrid';
 import Sidebar from './Sidebar';
+import FacetPanel from './FacetPanel';
 import { Deal } from '../types/Deal';
 import { useIsMobile } from '../utils/useIsMobile';
 import { useConfig } from '../hooks/useConfig';
+import { useDealPages } from '../hooks/useDealPages';
+import { useDealSearch } from '../hooks/useDealSearch';
+import { useFeaturedDeals } from '../hooks/useFeaturedDeals';
+import { useSearchQuery } from '../hooks/useSearchQuery';
+import { useFacetFilters } from '../hooks/useFacetFilters';
+import { useFacetedDeals } from '../hooks/useFacetedDeals';
+import { useSortOrder } from '../hooks/useSortOrder';
+import { useSortedDeals } from '../hooks/useSortedDeals';
+import { SORT_OPTIONS, SortKey } from '../utils/sortOrders';
+import { useInfiniteScroll } from '../utils/useInfiniteScroll';
+import { lazyWithPreload } from '../utils/lazyWithPreload';
 
-interface HomePageProps {
-  onSearch?: (query: string) => void;
-  searchQuery?: string;
-}
+// Detail views load on demand: the plain modal on desktop, the animated sheet on mobile
+const DealModal = lazyWithPreload(() => import('./DealModal'));
+const DealSheet = lazyWithPreload(() => import('./DealSheet'));
 
-const HomePage: React.FC<HomePageProps> = ({ searchQuery: propSearchQuery = '' }) => {
+// Stands in for search hits that haven't arrived yet, so filters never show the whole catalog
+const NO_POSITIONS: number[] = [];
+
+const HomePage: React.FC = () => {
   const { config } = useConfig();
-  const [deals, setDeals] = useState<Deal[]>([]);
+  const pages = useDealPages();
   const [selectedDeal, setSelectedDeal] = useState<Deal | null>(null);
   const [modalOpen, setModalOpen] = useState(false);
-  const [loading, setLoading] = useState(true);
-  const [searchQuery, setSearchQuery] = useState(propSearchQuery);
+  // The sheet stays mounted after the first open so its exit animation can run
+  const [sheetMounted, setSheetMounted] = useState(false);
   const isMobile = useIsMobile();
+  const [query] = useSearchQuery();
+  // Results render at low priority; keystrokes interrupt them
+  const searchQuery = useDeferredValue(query);
+  const isStale = query !== searchQuery;
 
-  useEffect(() => {
-    setSearchQuery(propSearchQuery);
-  }, [propSearchQuery]);
+  const search = useDealSearch(pages.manifest, searchQuery, config.content.featuredItemsCount);
 
-  useEffect(() => {
-    fetch(config.content.dataFile)
-      .then(res => res.json())
-      .then(data => {
-        setDeals(data);
-        setLoading(false);
-      })
-      .catch(err => {
-        console.error('Error loading content:', err);
-        setLoading(false);
-      });
-  }, [config.content.dataFile]);
-
-  const handleDealClick = (deal: Deal) => {
+  // /categories shows the facet panel; filters in the URL apply on any listing route
+  const showFacets = useLocation().pathname === '/categories';
+  const facetFilters = useFacetFilters();
+  const faceted = useFacetedDeals(
+    pages.manifest,
+    facetFilters.filters,
+    facetFilters.ranges,
+    showFacets || facetFilters.active,
+    search.active ? search.positions || NO_POSITIONS : null
+  );
+
+  // Any other order than newest re-arranges whichever set is showing
+  const [sort, setSort] = useSortOrder();
+  const sorted = useSortedDeals(
+    pages.manifest,
+    sort,
+    faceted.active ? faceted.ids || NO_POSITIONS : search.active ? search.positions || NO_POSITIONS : null
+  );
+
+  const results = sorted.active ? sorted : faceted.active ? faceted : search.active ? search : pages;
+  const loading = pages.loading
+    || (sorted.active && sorted.loading)
+    || (faceted.active && faceted.loading)
+    || (search.active && search.loading && search.deals.length === 0);
+
+  const sentinelRef = useInfiniteScroll(results.loadMore, results.hasMore && !results.loadingMore);
+
+  const handleDealClick = useCallback((deal: Deal) => {
     setSelectedDeal(deal);
     setModalOpen(true);
-  };
+    setSheetMounted(true);
+  }, []);
 
-  const handleCloseModal = () => {
+  // Fetch the detail chunk as soon as a card is hovered or touched
+  const handleDealIntent = useCallback((e: React.SyntheticEvent) => {
+    if ((e.target as Element).closest?.('[data-deal-card]')) {
+      (isMobile ? DealSheet : DealModal).preload();
+    }
+  }, [isMobile]);
+
+  const handleCloseModal = useCallback(() => {
     setModalOpen(false);
     setTimeout(() => setSelectedDeal(null), 300);
-  };
-
-  // Note: handleSearch is used for potential future functionality
-  // const handleSearch = (query: string) => {
-  //   setSearchQuery(query);
-  // };
+  }, []);
 
-  const filteredDeals = deals.filter(deal => 
-    deal.title.toLowerCase().includes(searchQuery.toLowerCase())
-  );
+  // Phones open the sheet on the next tap, so fetch it once the page has settled
+  useEffect(() => {
+    if (!isMobile) {
+      return;
+    }
+    const timer = window.setTimeout(() => DealSheet.preload(), 2000);
+    return () => window.clearTimeout(timer);
+  }, [isMobile]);
 
-  const topDeals = filteredDeals
-    .filter(deal => deal.featured)
-    .sort((a, b) => b.discountPercent - a.discountPercent)
-    .slice(0, config.content.featuredItemsCount);
+  // Both lists arrive ranked: from the manifest while browsing, from the engine while searching
+  // or browsing a single category
+  const categories = facetFilters.filters.category;
+  const browseCategory = !search.active && categories?.length === 1 ? categories[0] : undefined;
+  const browseTopDeals = useFeaturedDeals(pages.manifest, config.content.featuredItemsCount, browseCategory);
+  const topDeals = search.active ? search.featured : browseTopDeals;
 
-  const mainDeals = filteredDeals.sort((a, b) => 
-    new Date(b.dateAdded).getTime() - new Date(a.dateAdded).getTime()
-  );
+  // Pages, search hits and filtered results arrive newest first; sorted results in the chosen order
+  const mainDeals = results.deals;
 
   return (
     <>
-      <main className="max-w-container mx-auto px-4 py-6">
+      <main
+        className="max-w-container mx-auto px-4 py-6"
+        onMouseOver={handleDealIntent}
+        onTouchStart={handleDealIntent}
+      >
         <div className="flex flex-col lg:flex-row gap-6">
           <div className="flex-1">
-            <div className="mb-6">
-              <h2 className="text-2xl font-bold text-text-dark mb-1">
-                {searchQuery ? `Search Results for "${searchQuery}"` : 'Latest Content'}
-              </h2>
-              <p className="text-gray-600">
-                {searchQuery 
-                  ? `Found ${mainDeals.length} items matching your search`
-                  : 'Discover curated content powered by AI enhancement'
-                }
-              </p>
+            <div className="mb-6 flex flex-wrap items-end justify-between gap-4">
+              <div>
+                <h2 className="text-2xl font-bold text-text-dark mb-1">
+                  {searchQuery ? `Search Results for "${searchQuery}"` : showFacets ? 'Browse by Category' : 'Latest Content'}
+                </h2>
+                <p className="text-gray-600">
+                  {searchQuery || faceted.active
+                    ? `Found ${faceted.active ? faceted.total : search.total} items matching your ${searchQuery ? 'search' : 'filters'}`
+                    : 'Discover curated content powered by AI enhancement'
+                  }
+                </p>
+                {faceted.unavailable && facetFilters.active && (
+                  <p className="text-sm text-amber-600 mt-1">
+                    Category, price and discount filters are unavailable right now, so every deal is shown.
+                  </p>
+                )}
+              </div>
+
+              {pages.manifest?.sorts && (
+                <label className="flex items-center gap-2 text-sm text-gray-600">
+                  Sort by
+                  <select
+                    value={sort}
+                    onChange={e => setSort(e.target.value as SortKey)}
+                    className="border border-gray-200 rounded-lg px-2 py-1 text-text-dark bg-white"
+                  >
+                    {SORT_OPTIONS.map(option => (
+                      <option key={option.key} value={option.key}>{option.label}</option>
+                    ))}
+                  </select>
+                </label>
+              )}
             </div>
+
+            {(showFacets || facetFilters.active) && (
+              <FacetPanel
+                groups={faceted.groups}
+                ranges={faceted.ranges}
+                filters={facetFilters.filters}
+                rangeFilters={facetFilters.ranges}
+                onToggle={facetFilters.toggle}
+                onRangeChange={facetFilters.setRange}
+                onClear={facetFilters.clear}
+              />
+            )}
             
             {loading ? (
               <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6">
@@ -91,15 +166,19 @@ const HomePage: React.FC<HomePageProps> = ({ searchQuery: propSearchQuery = '' }
                 ))}
               </div>
             ) : (
-              <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6">
-                {mainDeals.map((deal, index) => (
-                  <DealCard
-                    key={deal.id}
-                    deal={deal}
-                    onClick={() => handleDealClick(deal)}
-                    colorIndex={index}
-                  />
-                ))}
+              <div className={`transition-opacity ${isStale ? 'opacity-70' : ''}`}>
+                <VirtualDealGrid
+                  deals={mainDeals}
+                  onDealClick={handleDealClick}
+                  initialCount={pages.manifest?.pageSize}
+                  highlight={search.active ? search.terms : undefined}
+                />
+              </div>
+            )}
+
+            {!loading && results.hasMore && (
+              <div ref={sentinelRef} className="py-8 text-center text-gray-500">
+                {results.loadingMore ? 'Loading more...' : ''}
               </div>
             )}
           </div>
@@ -114,25 +193,25 @@ const HomePage: React.FC<HomePageProps> = ({ searchQuery: propSearchQuery = '' }
       </main>
       
       {/* Desktop: Modal, Mobile: Bottom Sheet */}
-      <AnimatePresence exitBeforeEnter>
-        {modalOpen && (
-          isMobile ? (
-            <BottomSheet
-              key="bottom-sheet"
+      <Suspense fallback={null}>
+        {isMobile ? (
+          sheetMounted && (
+            <DealSheet
               deal={selectedDeal}
               isOpen={modalOpen}
               onClose={handleCloseModal}
             />
-          ) : (
+          )
+        ) : (
+          modalOpen && (
             <DealModal
-              key="desktop-modal"
               deal={selectedDeal}
               isOpen={modalOpen}
               onClose={handleCloseModal}
             />
           )
         )}
-      </AnimatePresence>
+      </Suspense>
     </>
   );
 };
@@ -0,0 +1,94 @@
+import React, { useEffect, useState } from 'react';
+import { RangeFilter as RangeValue, RangeGroup } from '../utils/facets';
+
+interface RangeFilterProps {
+  group: RangeGroup;
+  value: RangeValue | undefined;
+  onChange: (key: string, value: RangeValue | null) => void;
+}
+
+const formatValue = (unit: RangeGroup['unit'], amount: number) =>
+  unit === 'dollars' ? `$${amount}` : `${amount}%`;
+
+/**
+ * Min/max sliders over a histogram of the deals each bucket would add. Every
+ * move is a range query on the sorted index, so the grid follows the thumbs.
+ */
+const RangeFilter: React.FC<RangeFilterProps> = ({ group, value, onChange }) => {
+  const lowest = Math.floor(Math.min(0, group.min));
+  const highest = Math.ceil(group.unit === 'percent' ? Math.max(100, group.max) : group.max);
+  const [low, setLow] = useState(value?.min ?? lowest);
+  const [high, setHigh] = useState(value?.max ?? highest);
+
+  // Follow URL changes we didn't cause (clear filters, back/forward)
+  useEffect(() => {
+    setLow(value?.min ?? lowest);
+    setHigh(value?.max ?? highest);
+  }, [value?.min, value?.max, lowest, highest]);
+
+  const commit = (nextLow: number, nextHigh: number) => {
+    setLow(nextLow);
+    setHigh(nextHigh);
+    onChange(group.key, {
+      min: nextLow > lowest ? nextLow : undefined,
+      max: nextHigh < highest ? nextHigh : undefined
+    });
+  };
+
+  const maxCount = Math.max(1, ...group.buckets.map(bucket => bucket.count));
+  // Bucket bounds are exclusive at the top, slider bounds inclusive
+  const bucketEdge = group.unit === 'dollars' ? 0.01 : 1;
+
+  return (
+    <div>
+      <div className="flex items-center justify-between mb-2">
+        <span className="text-xs font-semibold uppercase text-gray-500">{group.label}</span>
+        <span className="text-sm text-text-dark">
+          {formatValue(group.unit, low)} – {formatValue(group.unit, high)}
+        </span>
+      </div>
+
+      <div className="flex items-end gap-1 h-12" aria-hidden="true">
+        {group.buckets.map(bucket => {
+          const inRange = (bucket.to === null || bucket.to > low) && bucket.from <= high;
+          return (
+            <button
+              key={bucket.from}
+              type="button"
+              tabIndex={-1}
+              title={`${formatValue(group.unit, bucket.from)}${bucket.to === null ? '+' : ` – ${formatValue(group.unit, bucket.to)}`}: ${bucket.count}`}
+              onClick={() => commit(bucket.from, bucket.to === null ? highest : Math.max(bucket.from, bucket.to - bucketEdge))}
+              className={`flex-1 rounded-t ${inRange ? 'bg-primary-green' : 'bg-gray-200'}`}
+              style={{ height: `${Math.max(4, (bucket.count / maxCount) * 100)}%` }}
+            />
+          );
+        })}
+      </div>
+
+      <div className="flex gap-2 mt-2">
+        <input
+          type="range"
+          aria-label={`Minimum ${group.label.toLowerCase()}`}
+          min={lowest}
+          max={highest}
+          step={group.unit === 'dollars' ? 1 : 5}
+          value={low}
+          onChange={e => commit(Math.min(Number(e.target.value), high), high)}
+          className="flex-1 accent-primary-green"
+        />
+        <input
+          type="range"
+          aria-label={`Maximum ${group.label.toLowerCase()}`}
+          min={lowest}
+          max={highest}
+          step={group.unit === 'dollars' ? 1 : 5}
+          value={high}
+          onChange={e => commit(low, Math.max(Number(e.target.value), low))}
+          className="flex-1 accent-primary-green"
+        />
+      </div>
+    </div>
+  );
+};
+
+export default RangeFilter;
@@ -2,6 +2,7 @@ import React from 'react';
 import { Deal } from '../types/Deal';
 import { getPriceDisplay } from '../utils/dealUtils';
 import { getPriceVisibility } from '../utils/priceVisibility';
+import DealImage from './DealImage';
 
 interface SidebarProps {
   topDeals: Deal[];
@@ -28,18 +29,16 @@ const Sidebar: React.FC<SidebarProps> = ({ topDeals, onDealClick }) => {
             return (
               <div
                 key={deal.id}
+                data-deal-card
                 onClick={() => onDealClick(deal)}
                 className="cursor-pointer group"
               >
                 <div className="flex gap-3 p-3 rounded-lg hover:bg-gray-50 transition-colors">
                   <div className="w-20 h-20 flex-shrink-0 bg-gray-100 rounded overflow-hidden">
-                    <img 
-                      src={deal.imageUrl} 
-                      alt={deal.title}
+                    <DealImage
+                      deal={deal}
+                      slot="sidebar"
                       className="w-full h-full object-contain p-1"
-                      onError={(e) => {
-                        e.currentTarget.src = '/placeholder-deal.svg';
-                      }}
                     />
                   </div>
                   <div className="flex-1 min-w-0">
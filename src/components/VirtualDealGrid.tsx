@@ -0,0 +1,116 @@
+import React, { useState, useEffect, useLayoutEffect, useRef } from 'react';
+import DealCard from './DealCard';
+import { Deal } from '../types/Deal';
+import { isPrerendering } from '../utils/bootData';
+
+interface VirtualDealGridProps {
+  deals: Deal[];
+  onDealClick: (deal: Deal) => void;
+  overscanRows?: number;
+  initialCount?: number;
+  highlight?: string[];
+}
+
+// Must match the card height (h-80) and grid gap (gap-6) used below
+const CARD_HEIGHT = 320;
+const ROW_GAP = 24;
+const ROW_STRIDE = CARD_HEIGHT + ROW_GAP;
+
+// Tailwind md / xl breakpoints for the 1/2/3 column layout
+function getColumnCount(width: number): number {
+  if (width >= 1280) return 3;
+  if (width >= 768) return 2;
+  return 1;
+}
+
+interface RowWindow {
+  columns: number;
+  startRow: number;
+  endRow: number;
+}
+
+/**
+ * Window-scrolled grid that only mounts the rows in view plus a few rows of
+ * overscan. The container keeps the full height of every row, so the page
+ * scrollbar and the infinite-scroll sentinel below it behave as before.
+ */
+const VirtualDealGrid: React.FC<VirtualDealGridProps> = ({ deals, onDealClick, overscanRows = 3, initialCount = 12, highlight }) => {
+  const containerRef = useRef<HTMLDivElement>(null);
+  // Before the first measurement, render the first cards as a single column so
+  // prerendered HTML and the hydrating client produce the same markup
+  const [range, setRange] = useState<RowWindow>({ columns: 1, startRow: 0, endRow: initialCount });
+  const rowCount = Math.ceil(deals.length / range.columns);
+
+  const measure = useRef(() => {});
+  measure.current = () => {
+    const container = containerRef.current;
+    if (!container || isPrerendering()) {
+      return;
+    }
+
+    const columns = getColumnCount(window.innerWidth);
+    const top = container.getBoundingClientRect().top;
+    const totalRows = Math.ceil(deals.length / columns);
+    const startRow = Math.max(0, Math.floor(-top / ROW_STRIDE) - overscanRows);
+    const endRow = Math.min(totalRows, Math.ceil((window.innerHeight - top) / ROW_STRIDE) + overscanRows);
+
+    setRange(prev =>
+      prev.columns === columns && prev.startRow === startRow && prev.endRow === endRow
+        ? prev
+        : { columns, startRow, endRow }
+    );
+  };
+
+  useLayoutEffect(() => {
+    measure.current();
+  }, [deals.length, overscanRows]);
+
+  useEffect(() => {
+    let frame = 0;
+    const onScroll = () => {
+      if (!frame) {
+        frame = requestAnimationFrame(() => {
+          frame = 0;
+          measure.current();
+        });
+      }
+    };
+
+    window.addEventListener('scroll', onScroll, { passive: true });
+    window.addEventListener('resize', onScroll);
+
+    return () => {
+      cancelAnimationFrame(frame);
+      window.removeEventListener('scroll', onScroll);
+      window.removeEventListener('resize', onScroll);
+    };
+  }, []);
+
+  const firstIndex = range.startRow * range.columns;
+  const visibleDeals = deals.slice(firstIndex, range.endRow * range.columns);
+
+  return (
+    <div
+      ref={containerRef}
+      className="relative"
+      style={{ height: rowCount > 0 ? rowCount * ROW_STRIDE - ROW_GAP : 0 }}
+    >
+      <div
+        className="absolute inset-x-0 top-0 grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6"
+        style={{ transform: `translateY(${range.startRow * ROW_STRIDE}px)` }}
+      >
+        {visibleDeals.map((deal, i) => (
+          <DealCard
+            key={deal.id}
+            deal={deal}
+            onClick={onDealClick}
+            colorIndex={firstIndex + i}
+            highlight={highlight}
+          />
+        ))}
+      </div>
+    </div>
+  );
+};
+
+export default VirtualDealGrid;
@@ -1,5 +1,6 @@
 import { useState, useEffect, createContext, useContext } from 'react';
 import { SiteConfig } from '../types/Config';
+import { readBootData, takeBootRequest } from '../utils/bootData';
 
 // Default configuration fallback
 const defaultConfig: SiteConfig = {
@@ -63,52 +64,124 @@ export const ConfigContext = createContext<{
   error: null
 });
 
+const CONFIG_URL = '/config.json';
+
+// Merge with default config to ensure all required fields are present
+const mergeConfig = (configData: Partial<SiteConfig>): SiteConfig => ({
+  ...defaultConfig,
+  ...configData,
+  logo: { ...defaultConfig.logo, ...configData.logo },
+  colors: { ...defaultConfig.colors, ...configData.colors },
+  navigation: { ...defaultConfig.navigation, ...configData.navigation },
+  content: { ...defaultConfig.content, ...configData.content },
+  meta: { ...defaultConfig.meta, ...configData.meta },
+  footer: { ...defaultConfig.footer, ...configData.footer },
+  advanced: { ...defaultConfig.advanced, ...configData.advanced }
+});
+
+const fetchConfig = async (response: Promise<Response>): Promise<SiteConfig> => {
+  const result = await response;
+
+  if (!result.ok) {
+    throw new Error(`Failed to load config: ${result.status}`);
+  }
+
+  return mergeConfig(await result.json());
+};
+
+// Last successfully loaded configuration, captured into prerendered pages
+let loadedConfig: SiteConfig | null = null;
+
+export const getLoadedConfig = () => loadedConfig;
+
+// Prerendered pages ship the config inline, ahead of the bundle
+const bootConfig = readBootData().config;
+
+let configRequest: Promise<SiteConfig> | null = null;
+
+/**
+ * Loads public/config.json once, reusing the request index.html started before
+ * the bundle arrived. index.tsx waits briefly on it so the first render already
+ * has the real config instead of a loading screen.
+ */
+export const preloadConfig = (): Promise<SiteConfig> => {
+  if (bootConfig) {
+    loadedConfig = bootConfig;
+    return Promise.resolve(bootConfig);
+  }
+
+  if (!configRequest) {
+    const early = takeBootRequest(CONFIG_URL);
+    configRequest = fetchConfig(early ? early.catch(() => fetch(CONFIG_URL)) : fetch(CONFIG_URL))
+      .then(config => {
+        loadedConfig = config;
+        console.info('Configuration loaded successfully:', config.siteName);
+        return config;
+      });
+    configRequest.catch(() => {
+      configRequest = null;
+    });
+  }
+
+  return configRequest;
+};
+
 // Hook to load configuration from public/config.json
 export const useConfigLoader = () => {
-  const [config, setConfig] = useState<SiteConfig>(defaultConfig);
-  const [loading, setLoading] = useState(true);
+  const [config, setConfig] = useState<SiteConfig>(() => bootConfig || loadedConfig || defaultConfig);
+  const [loading, setLoading] = useState(!bootConfig && !loadedConfig);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    const loadConfig = async () => {
-      try {
-        setLoading(true);
-        const response = await fetch('/config.json');
-        
-        if (!response.ok) {
-          throw new Error(`Failed to load config: ${response.status}`);
+    let cancelled = false;
+
+    if (bootConfig) {
+      loadedConfig = bootConfig;
+
+      // The inlined config is from build time; pick up runtime edits to config.json in the background
+      fetchConfig(fetch(CONFIG_URL, { cache: 'no-cache' }))
+        .then(latest => {
+          if (!cancelled && JSON.stringify(latest) !== JSON.stringify(bootConfig)) {
+            loadedConfig = latest;
+            setConfig(latest);
+          }
+        })
+        .catch(err => {
+          console.warn('Could not refresh configuration, keeping the prerendered one:', err);
+        });
+
+      return () => {
+        cancelled = true;
+      };
+    }
+
+    if (loadedConfig) {
+      return;
+    }
+
+    preloadConfig()
+      .then(loaded => {
+        if (!cancelled) {
+          setConfig(loaded);
+          setError(null);
         }
-        
-        const configData = await response.json();
-        
-        // Merge with default config to ensure all required fields are present
-        const mergedConfig: SiteConfig = {
-          ...defaultConfig,
-          ...configData,
-          logo: { ...defaultConfig.logo, ...configData.logo },
-          colors: { ...defaultConfig.colors, ...configData.colors },
-          navigation: { ...defaultConfig.navigation, ...configData.navigation },
-          content: { ...defaultConfig.content, ...configData.content },
-          meta: { ...defaultConfig.meta, ...configData.meta },
-          footer: { ...defaultConfig.footer, ...configData.footer },
-          advanced: { ...defaultConfig.advanced, ...configData.advanced }
-        };
-        
-        setConfig(mergedConfig);
-        setError(null);
-        
-        console.info('Configuration loaded successfully:', mergedConfig.siteName);
-        
-      } catch (err) {
+      })
+      .catch(err => {
         console.error('Failed to load configuration, using defaults:', err);
-        setError(err instanceof Error ? err.message : 'Unknown error');
-        setConfig(defaultConfig);
-      } finally {
-        setLoading(false);
-      }
-    };
+        if (!cancelled) {
+          setError(err instanceof Error ? err.message : 'Unknown error');
+          setConfig(defaultConfig);
+        }
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      });
 
-    loadConfig();
+    return () => {
+      cancelled = true;
+    };
   }, []);
 
   return { config, loading, error };
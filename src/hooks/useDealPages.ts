@@ -0,0 +1,105 @@
+import { useState, useEffect, useCallback, useMemo, useRef } from 'react';
+import { Deal, DealManifest } from '../types/Deal';
+import { loadManifest, loadPage, peekManifest, peekPage } from '../utils/dealPages';
+import { loadCompactDeals } from '../utils/compactDeals';
+import { useConfig } from './useConfig';
+
+// Manifest and first page when they are already in memory (prerendered boot data)
+function peekFirstPage(manifestFile: string | undefined, dataFile: string) {
+  const manifest = peekManifest(manifestFile, dataFile);
+  const firstPage = manifest && peekPage(manifest, 0);
+  return manifest && firstPage ? { manifest, firstPage } : null;
+}
+
+// Fetched behind the first page so it never delays first paint; later pages
+// are sliced from it once it has arrived and come from page files until then
+function prefetchCompact(manifest: DealManifest) {
+  if (manifest.compact) {
+    loadCompactDeals(manifest.compact).catch(err => {
+      console.warn('Compact deals unavailable, loading page files:', err);
+    });
+  }
+}
+
+/**
+ * Loads deals one page shard at a time. The first page is fetched as soon as the
+ * manifest arrives; later pages are requested through loadMore().
+ */
+export const useDealPages = () => {
+  const { config } = useConfig();
+  const { manifestFile, dataFile, compactData } = config.content;
+  const [initial] = useState(() => peekFirstPage(manifestFile, dataFile));
+  const [manifest, setManifest] = useState<DealManifest | null>(initial ? initial.manifest : null);
+  const [pages, setPages] = useState<Deal[][]>(initial ? [initial.firstPage] : []);
+  const [loading, setLoading] = useState(!initial);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const pendingRef = useRef(false);
+  const loadedKeyRef = useRef(initial ? `${manifestFile}|${dataFile}` : '');
+
+  useEffect(() => {
+    const key = `${manifestFile}|${dataFile}`;
+    let cancelled = false;
+
+    if (loadedKeyRef.current === key) {
+      if (compactData && initial) {
+        prefetchCompact(initial.manifest);
+      }
+      return;
+    }
+
+    setLoading(true);
+    setPages([]);
+
+    loadManifest(manifestFile, dataFile)
+      .then(async loadedManifest => {
+        const firstPage = await loadPage(loadedManifest, 0);
+        if (!cancelled) {
+          loadedKeyRef.current = key;
+          setManifest(loadedManifest);
+          setPages([firstPage]);
+          if (compactData) {
+            prefetchCompact(loadedManifest);
+          }
+        }
+      })
+      .catch(err => {
+        console.error('Error loading content:', err);
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifestFile, dataFile, compactData, initial]);
+
+  const hasMore = manifest !== null && pages.length < manifest.pageCount;
+
+  const loadMore = useCallback(() => {
+    if (!manifest || !hasMore || pendingRef.current) {
+      return;
+    }
+
+    pendingRef.current = true;
+    setLoadingMore(true);
+
+    loadPage(manifest, pages.length)
+      .then(page => {
+        setPages(prev => [...prev, page]);
+      })
+      .catch(err => {
+        console.error('Error loading more content:', err);
+      })
+      .finally(() => {
+        pendingRef.current = false;
+        setLoadingMore(false);
+      });
+  }, [manifest, hasMore, pages.length]);
+
+  const deals = useMemo(() => ([] as Deal[]).concat(...pages), [pages]);
+
+  return { deals, manifest, loading, loadingMore, hasMore, loadMore };
+};
@@ -0,0 +1,104 @@
+import { useState, useEffect, useCallback } from 'react';
+import { Deal, DealManifest } from '../types/Deal';
+import { loadDealsAt } from '../utils/dealPages';
+import { getDealsEngine } from '../utils/dealsEngine';
+
+/**
+ * Runs catalog searches through the deals engine worker, which only sends back
+ * matching positions. Matching deals are then loaded a page at a time.
+ * Returns active: false while the query is empty. The matching positions are
+ * exposed too, best match first, so facet filters can narrow the hits without
+ * another query, along with the matched terms for highlighting.
+ */
+export const useDealSearch = (manifest: DealManifest | null, query: string, featuredLimit: number = 0) => {
+  const [positions, setPositions] = useState<number[] | null>(null);
+  const [terms, setTerms] = useState<string[]>([]);
+  const [featured, setFeatured] = useState<Deal[]>([]);
+  const [limit, setLimit] = useState(0);
+  const [deals, setDeals] = useState<Deal[]>([]);
+  const [loadedLimit, setLoadedLimit] = useState(0);
+  const [loading, setLoading] = useState(false);
+  const active = query.trim().length > 0;
+  const pageSize = manifest?.pageSize || 0;
+
+  useEffect(() => {
+    if (!manifest || !active) {
+      setPositions(null);
+      setTerms([]);
+      setFeatured([]);
+      setDeals([]);
+      setLoadedLimit(0);
+      return;
+    }
+
+    let cancelled = false;
+    setLoading(true);
+
+    getDealsEngine(manifest)
+      .query({ text: query, featuredLimit })
+      .then(async result => {
+        // null means a newer keystroke superseded this query, which also cancelled this effect;
+        // failures reject and clear loading below
+        if (cancelled || !result) {
+          return;
+        }
+
+        const featuredDeals = await loadDealsAt(manifest, Array.from(result.featuredIds));
+        if (!cancelled) {
+          setPositions(Array.from(result.ids));
+          setTerms(result.terms);
+          setFeatured(featuredDeals);
+          setLimit(pageSize);
+          setLoading(false);
+        }
+      })
+      .catch(err => {
+        console.error('Search failed:', err);
+        if (!cancelled) {
+          setPositions([]);
+          setLoading(false);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, active, query, pageSize, featuredLimit]);
+
+  useEffect(() => {
+    if (!manifest || !positions) {
+      return;
+    }
+
+    let cancelled = false;
+
+    loadDealsAt(manifest, positions.slice(0, limit))
+      .then(found => {
+        if (!cancelled) {
+          setDeals(found);
+        }
+      })
+      .catch(err => {
+        console.error('Error loading search results:', err);
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoadedLimit(limit);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, positions, limit]);
+
+  const total = positions ? positions.length : 0;
+  const hasMore = limit < total;
+  const loadingMore = loadedLimit < limit;
+
+  const loadMore = useCallback(() => {
+    setLimit(prev => prev + pageSize);
+  }, [pageSize]);
+
+  return { active, positions, terms, deals, featured, total, loading, loadingMore, hasMore, loadMore };
+};
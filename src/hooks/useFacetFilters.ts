@@ -0,0 +1,96 @@
+import { useCallback, useMemo, startTransition } from 'react';
+import { useSearchParams } from 'react-router-dom';
+import { FacetFilters, RangeFilter, RangeFilters } from '../utils/facets';
+
+// Dimension keys written by scripts/lib/facets.js, each a repeatable URL parameter
+export const FACET_KEYS = ['category'];
+// Range keys, each one "min-max" parameter; either side may be left open ("-25", "100+")
+export const RANGE_KEYS = ['price', 'discount'];
+
+function parseRange(value: string): RangeFilter | null {
+  const match = /^(\d+(?:\.\d+)?)?(?:-|\+$)(\d+(?:\.\d+)?)?$/.exec(value);
+  if (!match || (match[1] === undefined && match[2] === undefined)) {
+    return null;
+  }
+  return {
+    min: match[1] === undefined ? undefined : Number(match[1]),
+    max: match[2] === undefined ? undefined : Number(match[2])
+  };
+}
+
+function formatRange({ min, max }: RangeFilter): string {
+  return max === undefined ? `${min}+` : `${min ?? ''}-${max}`;
+}
+
+/**
+ * Facet selections live in the URL next to ?q= (?category=Home&price=0-25),
+ * so filtered listings can be linked and survive a reload. Updates replace the
+ * history entry and run as a transition, like search.
+ */
+export const useFacetFilters = () => {
+  const [searchParams, setSearchParams] = useSearchParams();
+
+  const filters = useMemo(() => {
+    const selected: FacetFilters = {};
+    FACET_KEYS.forEach(key => {
+      const values = searchParams.getAll(key);
+      if (values.length > 0) {
+        selected[key] = values;
+      }
+    });
+    return selected;
+  }, [searchParams]);
+
+  const ranges = useMemo(() => {
+    const selected: RangeFilters = {};
+    RANGE_KEYS.forEach(key => {
+      const range = parseRange(searchParams.get(key) || '');
+      if (range) {
+        selected[key] = range;
+      }
+    });
+    return selected;
+  }, [searchParams]);
+
+  const active = Object.keys(filters).length > 0 || Object.keys(ranges).length > 0;
+
+  const toggle = useCallback((key: string, value: string) => {
+    startTransition(() => {
+      setSearchParams(prev => {
+        const params = new URLSearchParams(prev);
+        const values = params.getAll(key);
+        params.delete(key);
+        (values.includes(value) ? values.filter(v => v !== value) : values.concat(value))
+          .forEach(v => params.append(key, v));
+        return params;
+      }, { replace: true });
+    });
+  }, [setSearchParams]);
+
+  // null (or a range with both sides open) removes the filter
+  const setRange = useCallback((key: string, range: RangeFilter | null) => {
+    startTransition(() => {
+      setSearchParams(prev => {
+        const params = new URLSearchParams(prev);
+        if (range && (range.min !== undefined || range.max !== undefined)) {
+          params.set(key, formatRange(range));
+        } else {
+          params.delete(key);
+        }
+        return params;
+      }, { replace: true });
+    });
+  }, [setSearchParams]);
+
+  const clear = useCallback(() => {
+    startTransition(() => {
+      setSearchParams(prev => {
+        const params = new URLSearchParams(prev);
+        FACET_KEYS.concat(RANGE_KEYS).forEach(key => params.delete(key));
+        return params;
+      }, { replace: true });
+    });
+  }, [setSearchParams]);
+
+  return { filters, ranges, active, toggle, setRange, clear };
+};
@@ -0,0 +1,133 @@
+import { useState, useEffect, useMemo, useCallback } from 'react';
+import { Deal, DealManifest } from '../types/Deal';
+import { loadDealsAt } from '../utils/dealPages';
+import { hasBit } from '../utils/bitset';
+import { FacetFilters, FacetIndex, FacetResult, RangeFilters, loadFacets } from '../utils/facets';
+
+/**
+ * Filters the listing with the published facet index (categories plus price
+ * and discount ranges). Only the small index is downloaded; matching deals are
+ * then loaded a page at a time, like search results. `within` narrows
+ * everything to a set of positions (search hits), null meaning the whole
+ * catalog. Returns active: false with no filter selected, while still providing
+ * the option counts and histograms for the facet panel.
+ */
+export const useFacetedDeals = (
+  manifest: DealManifest | null,
+  filters: FacetFilters,
+  ranges: RangeFilters,
+  enabled: boolean,
+  within: number[] | null = null
+) => {
+  const [index, setIndex] = useState<FacetIndex | null>(null);
+  const [failed, setFailed] = useState(false);
+  const [shown, setShown] = useState<{ result: FacetResult | null; limit: number }>({ result: null, limit: 0 });
+  const [deals, setDeals] = useState<Deal[]>([]);
+  const [loadedLimit, setLoadedLimit] = useState(0);
+  const pageSize = manifest?.pageSize || 0;
+  // Without a facet index the filters are ignored and the plain listing shows
+  const available = Boolean(manifest?.facets) && !failed;
+  const active = enabled && available && (Object.keys(filters).length > 0 || Object.keys(ranges).length > 0);
+
+  useEffect(() => {
+    if (!enabled || !manifest?.facets) {
+      return;
+    }
+
+    let cancelled = false;
+
+    loadFacets(manifest.facets)
+      .then(loaded => {
+        if (cancelled) {
+          return;
+        }
+        // A stale index would point at the wrong positions; show the plain listing instead
+        if (loaded.version === manifest.version) {
+          setIndex(loaded);
+        } else {
+          console.warn(`Facet index is for version ${loaded.version}, not ${manifest.version}; ignoring filters`);
+          setFailed(true);
+        }
+      })
+      .catch(err => {
+        console.warn('Facet index unavailable:', err);
+        if (!cancelled) {
+          setFailed(true);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, enabled]);
+
+  const result: FacetResult | null = useMemo(() => {
+    if (!enabled || !index) {
+      return null;
+    }
+    if (!within) {
+      return index.select(filters, ranges);
+    }
+
+    // Filtered search hits keep their ranking instead of falling back to newest first
+    const selected = index.select(filters, ranges, index.bitsFor(within));
+    const kept = index.bitsFor(selected.ids);
+    return { ...selected, ids: Int32Array.from(within.filter(position => hasBit(kept, position))) };
+  }, [enabled, index, filters, ranges, within]);
+
+  // Every new result starts again from its first page
+  const limit = shown.result === result ? shown.limit : pageSize;
+
+  useEffect(() => {
+    if (!manifest || !result || !active) {
+      setDeals([]);
+      setLoadedLimit(0);
+      return;
+    }
+
+    let cancelled = false;
+
+    loadDealsAt(manifest, Array.from(result.ids.subarray(0, limit)))
+      .then(found => {
+        if (!cancelled) {
+          setDeals(found);
+        }
+      })
+      .catch(err => {
+        console.error('Error loading filtered deals:', err);
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoadedLimit(limit);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, result, active, limit]);
+
+  const total = result ? result.ids.length : 0;
+  const hasMore = limit < total;
+  const loadingMore = loadedLimit < limit;
+  const loading = active && (!result || (loadingMore && deals.length === 0));
+
+  const loadMore = useCallback(() => {
+    setShown({ result, limit: limit + pageSize });
+  }, [result, limit, pageSize]);
+
+  return {
+    active,
+    // Filters were asked for (in the URL or on /categories) but the index could not be used
+    unavailable: enabled && Boolean(manifest?.facets) && failed,
+    ids: result ? result.ids : null,
+    groups: result ? result.groups : [],
+    ranges: result ? result.ranges : [],
+    deals,
+    total,
+    loading,
+    loadingMore,
+    hasMore,
+    loadMore
+  };
+};
@@ -0,0 +1,48 @@
+import { useState, useEffect } from 'react';
+import { Deal, DealManifest } from '../types/Deal';
+import { loadDealsAt, peekDealsAt } from '../utils/dealPages';
+import { getDealsEngine } from '../utils/dealsEngine';
+
+/**
+ * Top deals come precomputed in the manifest; only their page shards are loaded.
+ * Within a category they come from the deals engine, whose store memoizes
+ * them per category. Pass no category while a search is running, since the
+ * engine only answers its newest query.
+ */
+export const useFeaturedDeals = (manifest: DealManifest | null, limit: number, category?: string) => {
+  const [featured, setFeatured] = useState<Deal[]>(() =>
+    (!category && manifest?.featured && peekDealsAt(manifest, manifest.featured.slice(0, limit))) || []
+  );
+
+  useEffect(() => {
+    if (!manifest || limit <= 0 || (!category && !manifest.featured?.length)) {
+      setFeatured([]);
+      return;
+    }
+
+    let cancelled = false;
+    const positions: Promise<number[] | null> = category
+      ? getDealsEngine(manifest)
+          .query({ text: '', category, featuredLimit: limit })
+          .then(result => result && Array.from(result.featuredIds))
+      : Promise.resolve((manifest.featured || []).slice(0, limit));
+
+    positions
+      .then(found => (found ? loadDealsAt(manifest, found) : null))
+      .then(deals => {
+        // null: a search started and superseded the category query
+        if (!cancelled && deals) {
+          setFeatured(deals);
+        }
+      })
+      .catch(err => {
+        console.error('Error loading top deals:', err);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, limit, category]);
+
+  return featured;
+};
@@ -0,0 +1,31 @@
+import { useCallback, startTransition } from 'react';
+import { useSearchParams } from 'react-router-dom';
+
+const QUERY_PARAM = 'q';
+
+/**
+ * The search query's single source of truth is the ?q= URL parameter.
+ * Updates are replaced rather than pushed (one history entry per search, not
+ * per keystroke) and run as a transition, so re-rendering the results never
+ * blocks the input that triggered it.
+ */
+export const useSearchQuery = () => {
+  const [searchParams, setSearchParams] = useSearchParams();
+  const query = searchParams.get(QUERY_PARAM) || '';
+
+  const setQuery = useCallback((next: string) => {
+    startTransition(() => {
+      setSearchParams(prev => {
+        const params = new URLSearchParams(prev);
+        if (next) {
+          params.set(QUERY_PARAM, next);
+        } else {
+          params.delete(QUERY_PARAM);
+        }
+        return params;
+      }, { replace: true });
+    });
+  }, [setSearchParams]);
+
+  return [query, setQuery] as const;
+};
@@ -0,0 +1,28 @@
+import { useCallback, startTransition } from 'react';
+import { useSearchParams } from 'react-router-dom';
+import { SORT_OPTIONS, SortKey } from '../utils/sortOrders';
+
+const SORT_PARAM = 'sort';
+
+// The listing order lives in ?sort=, next to the search and filter parameters
+export const useSortOrder = () => {
+  const [searchParams, setSearchParams] = useSearchParams();
+  const param = searchParams.get(SORT_PARAM);
+  const sort: SortKey = SORT_OPTIONS.some(option => option.key === param) ? (param as SortKey) : 'newest';
+
+  const setSort = useCallback((next: SortKey) => {
+    startTransition(() => {
+      setSearchParams(prev => {
+        const params = new URLSearchParams(prev);
+        if (next === 'newest') {
+          params.delete(SORT_PARAM);
+        } else {
+          params.set(SORT_PARAM, next);
+        }
+        return params;
+      }, { replace: true });
+    });
+  }, [setSearchParams]);
+
+  return [sort, setSort] as const;
+};
@@ -0,0 +1,104 @@
+import { useState, useEffect, useMemo, useCallback } from 'react';
+import { Deal, DealManifest } from '../types/Deal';
+import { loadDealsAt } from '../utils/dealPages';
+import { SortKey, SortOrders, SortedView, loadSortOrders } from '../utils/sortOrders';
+
+/**
+ * Shows a result set (search hits or filtered ids; null for the whole catalog)
+ * in one of the precomputed orders. The orders are only downloaded once a
+ * non-default sort is chosen, and each page of results costs the rows on it.
+ * Returns active: false for newest first, which every other source already is.
+ */
+export const useSortedDeals = (
+  manifest: DealManifest | null,
+  sort: SortKey,
+  members: ArrayLike<number> | null
+) => {
+  const [orders, setOrders] = useState<SortOrders | null>(null);
+  const [failed, setFailed] = useState(false);
+  const [shown, setShown] = useState<{ view: SortedView | null; limit: number }>({ view: null, limit: 0 });
+  const [deals, setDeals] = useState<Deal[]>([]);
+  const [loadedLimit, setLoadedLimit] = useState(0);
+  const pageSize = manifest?.pageSize || 0;
+  const wanted = sort !== 'newest' && Boolean(manifest?.sorts) && !failed;
+
+  useEffect(() => {
+    if (!wanted || !manifest?.sorts) {
+      return;
+    }
+
+    let cancelled = false;
+
+    loadSortOrders(manifest.sorts)
+      .then(loaded => {
+        if (cancelled) {
+          return;
+        }
+        // A stale file would order the wrong positions; keep newest first instead
+        if (loaded.version === manifest.version) {
+          setOrders(loaded);
+        } else {
+          console.warn(`Sort orders are for version ${loaded.version}, not ${manifest.version}; keeping newest first`);
+          setFailed(true);
+        }
+      })
+      .catch(err => {
+        console.warn('Sort orders unavailable, keeping newest first:', err);
+        if (!cancelled) {
+          setFailed(true);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, wanted]);
+
+  const view = useMemo(
+    () => (wanted && orders ? orders.view(sort, members) : null),
+    [wanted, orders, sort, members]
+  );
+
+  const active = wanted;
+  const limit = shown.view === view ? shown.limit : pageSize;
+
+  useEffect(() => {
+    if (!manifest || !view) {
+      setDeals([]);
+      setLoadedLimit(0);
+      return;
+    }
+
+    let cancelled = false;
+
+    loadDealsAt(manifest, view.take(limit))
+      .then(found => {
+        if (!cancelled) {
+          setDeals(found);
+        }
+      })
+      .catch(err => {
+        console.error('Error loading sorted deals:', err);
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoadedLimit(limit);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [manifest, view, limit]);
+
+  const total = view ? view.total : 0;
+  const hasMore = limit < total;
+  const loadingMore = loadedLimit < limit;
+  const loading = active && (!view || (loadingMore && deals.length === 0));
+
+  const loadMore = useCallback(() => {
+    setShown({ view, limit: limit + pageSize });
+  }, [view, limit, pageSize]);
+
+  return { active, deals, total, loading, loadingMore, hasMore, loadMore };
+};
@@ -2,12 +2,40 @@ import React from 'react';
 import ReactDOM from 'react-dom/client';
 import './index.css';
 import App from './App';
+import { getLoadedConfig, preloadConfig } from './hooks/useConfig';
+import { collectDealBootData } from './utils/dealPages';
+import { installBootDataCapture, isPrerenderedFor } from './utils/bootData';
 
-const root = ReactDOM.createRoot(
-  document.getElementById('root') as HTMLElement
-);
-root.render(
+// While react-snap prerenders a route, inline what it loaded into the HTML
+installBootDataCapture(() => ({
+  path: window.location.pathname,
+  config: getLoadedConfig() || undefined,
+  ...collectDealBootData()
+}));
+
+// Longest the first render waits for config.json before showing the loading screen
+const CONFIG_WAIT_MS = 1000;
+
+const rootElement = document.getElementById('root') as HTMLElement;
+const app = (
   <React.StrictMode>
     <App />
   </React.StrictMode>
-);
\ No newline at end of file
+);
+
+// Prerendered routes already contain markup to hydrate. Other routes may have
+// been served another route's HTML as the fallback, which is replaced instead
+const render = () => {
+  if (rootElement.hasChildNodes() && isPrerenderedFor(window.location.pathname)) {
+    ReactDOM.hydrateRoot(rootElement, app);
+  } else {
+    rootElement.innerHTML = '';
+    ReactDOM.createRoot(rootElement).render(app);
+  }
+};
+
+// The config request started in index.html, so it is usually done by the time the bundle runs
+Promise.race([
+  preloadConfig().catch(() => undefined),
+  new Promise(resolve => setTimeout(resolve, CONFIG_WAIT_MS))
+]).then(render);
@@ -46,6 +46,8 @@ export interface SiteConfig {
   // Content Settings
   content: {
     dataFile: string; // path to JSON data file
+    manifestFile?: string; // path to the paged data manifest written by scripts/publish-deals.js
+    compactData?: boolean; // load the columnar deals file once instead of per-page JSON
     itemsPerPage?: number;
     showFeaturedSidebar: boolean;
     featuredItemsCount: number;
@@ -79,6 +81,7 @@ export interface SiteConfig {
     enableAnalytics?: boolean;
     analyticsId?: string;
     enablePWA?: boolean;
+    imageProxy?: string;
     customCSS?: string;
     customScripts?: string[];
   };
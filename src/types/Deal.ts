@@ -10,4 +10,48 @@ export interface Deal {
   affiliateUrl: string;
   featured?: boolean;
   dateAdded: string;
-}
\ No newline at end of file
+  images?: DealImageSizes; // sized CDN URLs when the publish step recognized the image host
+  imageColor?: string; // dominant colour, painted before the image loads
+  imageLqip?: string; // ~10px WebP data URL of the image
+  popularity?: number; // optional engagement score from the scraper, used by the popularity sort
+}
+
+export interface DealImageSizes {
+  card: string;
+  sidebar: string;
+  modal: string;
+}
+
+export interface DealManifest {
+  version: string;
+  generatedAt: string;
+  total: number;
+  pageSize: number;
+  pageCount: number;
+  pages: string[];
+  dataUrl?: string; // content-hashed directory holding every file below; never changes meaning
+  featured?: number[]; // top featured positions by discount
+  searchIndex?: string;
+  compact?: string;
+  facets?: string;
+  sorts?: string;
+  feed?: DealFeedInfo;
+  unsorted?: boolean; // raw data file that still needs the publish-step ordering
+}
+
+
+export interface DealFeedInfo {
+  version: number;
+  oldest: number; // oldest version a delta is published from
+  snapshot: string;
+  deltas: string; // URL template, {from} is the client's version
+}
+
+export interface DealFeedDelta {
+  from: number;
+  to: number;
+  fromHash: string | null; // manifest.version the delta applies to (null in deltas from older publishes)
+  toHash: string;
+  upserted: Deal[];
+  removed: string[];
+}
@@ -0,0 +1,89 @@
+/**
+ * Fixed-size sets of deal positions packed 32 per word. Filters combine with
+ * word-wise AND/OR and counts come from popcounts, so a filter change costs
+ * total / 32 word operations instead of a pass over every deal.
+ */
+
+export type Bitset = Uint32Array;
+
+export function createBitset(total: number): Bitset {
+  return new Uint32Array((total + 31) >>> 5);
+}
+
+export function fullBitset(total: number): Bitset {
+  const bits = createBitset(total);
+  bits.fill(0xffffffff);
+  const tail = total & 31;
+  if (tail && bits.length) {
+    bits[bits.length - 1] = (1 << tail) - 1;
+  }
+  return bits;
+}
+
+export function bitsetFrom(total: number, positions: ArrayLike<number>): Bitset {
+  const bits = createBitset(total);
+  for (let i = 0; i < positions.length; i++) {
+    const position = positions[i];
+    bits[position >>> 5] |= 1 << (position & 31);
+  }
+  return bits;
+}
+
+export function hasBit(bits: Bitset, position: number): boolean {
+  return (bits[position >>> 5] & (1 << (position & 31))) !== 0;
+}
+
+// Writes a & b into target (which may be a or b)
+export function andInto(target: Bitset, a: Bitset, b: Bitset): Bitset {
+  for (let i = 0; i < target.length; i++) {
+    target[i] = a[i] & b[i];
+  }
+  return target;
+}
+
+export function orInto(target: Bitset, a: Bitset, b: Bitset): Bitset {
+  for (let i = 0; i < target.length; i++) {
+    target[i] = a[i] | b[i];
+  }
+  return target;
+}
+
+function popcount32(word: number): number {
+  word -= (word >>> 1) & 0x55555555;
+  word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+  return (((word + (word >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+}
+
+export function countBits(bits: Bitset): number {
+  let count = 0;
+  for (let i = 0; i < bits.length; i++) {
+    count += popcount32(bits[i]);
+  }
+  return count;
+}
+
+// |a & b| without allocating the intersection
+export function countAnd(a: Bitset, b: Bitset): number {
+  let count = 0;
+  for (let i = 0; i < a.length; i++) {
+    count += popcount32(a[i] & b[i]);
+  }
+  return count;
+}
+
+// Set positions in ascending order, i.e. the published newest-first order
+export function bitsetPositions(bits: Bitset): Int32Array {
+  const positions = new Int32Array(countBits(bits));
+  let next = 0;
+
+  for (let i = 0; i < bits.length; i++) {
+    let word = bits[i];
+    while (word !== 0) {
+      const low = word & -word;
+      positions[next++] = (i << 5) + (31 - Math.clz32(low));
+      word ^= low;
+    }
+  }
+
+  return positions;
+}
@@ -0,0 +1,61 @@
+import { Deal, DealManifest } from '../types/Deal';
+import { SiteConfig } from '../types/Config';
+
+/**
+ * Critical data inlined into prerendered HTML (see "reactSnap" in package.json).
+ * While react-snap renders a route, whatever config and deal pages were loaded
+ * are captured through window.snapSaveState; in the browser the same values are
+ * read back synchronously so hydration starts with the data already in place.
+ */
+
+export interface BootData {
+  path?: string; // route the markup was prerendered for
+  config?: SiteConfig;
+  manifests?: Record<string, DealManifest>;
+  pages?: Record<string, Deal[]>;
+}
+
+declare global {
+  interface Window {
+    __BOOT_DATA__?: BootData;
+    __BOOT_REQUESTS__?: Record<string, Promise<Response>>;
+    snapSaveState?: () => Record<string, unknown>;
+  }
+}
+
+export function isPrerendering(): boolean {
+  return typeof navigator !== 'undefined' && navigator.userAgent === 'ReactSnap';
+}
+
+export function readBootData(): BootData {
+  return (typeof window !== 'undefined' && window.__BOOT_DATA__) || {};
+}
+
+export function installBootDataCapture(collect: () => BootData) {
+  if (isPrerendering()) {
+    window.snapSaveState = () => ({ __BOOT_DATA__: collect() });
+  }
+}
+
+function normalizePath(path: string): string {
+  return path.length > 1 ? path.replace(/\/+$/, '') : path;
+}
+
+// SPA fallbacks serve the prerendered home page for routes that were never
+// prerendered; only markup rendered for the current path can be hydrated
+export function isPrerenderedFor(path: string): boolean {
+  const rendered = readBootData().path;
+  return rendered !== undefined && normalizePath(rendered) === normalizePath(path);
+}
+
+// Requests public/index.html starts before the bundle arrives; each response can only be read once
+export function takeBootRequest(url: string): Promise<Response> | undefined {
+  const requests = typeof window !== 'undefined' ? window.__BOOT_REQUESTS__ : undefined;
+  const request = requests && requests[url];
+
+  if (requests && request) {
+    delete requests[url];
+  }
+
+  return request;
+}
@@ -0,0 +1,289 @@
+import { Deal, DealImageSizes } from '../types/Deal';
+
+/**
+ * Columnar deal storage. Numeric fields live in typed arrays and strings are
+ * sliced out of a single text blob on demand, so a full catalog costs a few
+ * arrays instead of one object per deal. Deal objects are only materialized
+ * for the rows that actually render.
+ */
+
+export interface CompactDealsPayload {
+  format: 'compact-v2';
+  version: string;
+  total: number;
+  textFields: string[];
+  categories: string[];
+  urlPrefixes: string[];
+  urlSegments: string[]; // URL segments referenced from the text as U+E000 + index
+  dateUnit: number; // milliseconds per dateAdded step
+  imageSizes?: DealImageSizes; // size token per slot, substituted into each image template
+  columns: {
+    price: number[];
+    originalPrice: number[]; // cents above price
+    discountPercent: number[];
+    dateAdded: number[]; // difference from the previous deal, in dateUnit steps
+    category: number[];
+    imagePrefix: number[];
+    affiliatePrefix: number[];
+    imageTemplatePrefix?: number[];
+    imageColor?: number[]; // 0xrrggbb, -1 when missing
+  };
+  featured: number[];
+  text: string;
+  textLengths: number[];
+}
+
+// Read-only view over a sorted deal list, shared by the engine and the pages loader
+export interface DealTable {
+  readonly total: number;
+  get(position: number): Deal;
+  category(position: number): string;
+  isFeatured(position: number): boolean;
+  discountPercent(position: number): number;
+  timestamp(position: number): number;
+  searchText(position: number): string;
+}
+
+export class ArrayDealTable implements DealTable {
+  constructor(private readonly deals: Deal[]) {}
+
+  get total() {
+    return this.deals.length;
+  }
+
+  get(position: number) {
+    return this.deals[position];
+  }
+
+  category(position: number) {
+    return this.deals[position].category;
+  }
+
+  isFeatured(position: number) {
+    return Boolean(this.deals[position].featured);
+  }
+
+  discountPercent(position: number) {
+    return this.deals[position].discountPercent;
+  }
+
+  timestamp(position: number) {
+    return Date.parse(this.deals[position].dateAdded) || 0;
+  }
+
+  searchText(position: number) {
+    const deal = this.deals[position];
+    return `${deal.title} ${deal.description} ${deal.category}`;
+  }
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const SEGMENT_BASE = 0xe000;
+const SEGMENT_REFERENCE = /[\ue000-\uf8ff]/g;
+const MATERIALIZED_CACHE_SIZE = 512;
+const TEXT_ID = 0;
+const TEXT_TITLE = 1;
+const TEXT_DESCRIPTION = 2;
+const TEXT_IMAGE = 3;
+const TEXT_AFFILIATE = 4;
+
+// Publish writes dates without a time of day; keep those as plain dates
+function formatDate(time: number) {
+  const iso = new Date(time).toISOString();
+  return time % DAY_MS === 0 ? iso.slice(0, 10) : iso;
+}
+
+export class CompactDeals implements DealTable {
+  readonly total: number;
+  readonly version: string;
+  readonly price: Int32Array; // cents
+  readonly originalPrice: Int32Array; // cents
+  readonly discount: Uint8Array; // percent, clamped to 0-100 at publish
+  readonly dateAdded: Float64Array; // milliseconds since the epoch
+  readonly categoryIndex: Uint16Array;
+  readonly featured: Uint8Array;
+  private readonly imagePrefix: Uint16Array;
+  private readonly affiliatePrefix: Uint16Array;
+  private readonly imageTemplatePrefix: Uint16Array;
+  private readonly imageTemplateField: number;
+  private readonly imageSizes?: DealImageSizes;
+  private readonly imageColor: Int32Array;
+  private readonly imageLqipField: number;
+  private readonly textOffsets: Uint32Array;
+  private readonly fieldCount: number;
+  private readonly categories: string[];
+  private readonly urlPrefixes: string[];
+  private readonly urlSegments: string[];
+  private readonly text: string;
+  private readonly materialized = new Map<number, Deal>();
+
+  constructor(payload: CompactDealsPayload) {
+    const { columns } = payload;
+
+    this.total = payload.total;
+    this.version = payload.version;
+    this.price = Int32Array.from(columns.price);
+    this.originalPrice = Int32Array.from(columns.originalPrice, (markup, position) => columns.price[position] + markup);
+    this.discount = Uint8Array.from(columns.discountPercent);
+    this.dateAdded = new Float64Array(payload.total);
+    let steps = 0;
+    columns.dateAdded.forEach((delta, position) => {
+      steps += delta;
+      this.dateAdded[position] = steps * payload.dateUnit;
+    });
+    this.categoryIndex = Uint16Array.from(columns.category);
+    this.imagePrefix = Uint16Array.from(columns.imagePrefix);
+    this.affiliatePrefix = Uint16Array.from(columns.affiliatePrefix);
+    this.imageTemplatePrefix = Uint16Array.from(columns.imageTemplatePrefix || []);
+    this.imageTemplateField = payload.textFields.indexOf('imageTemplate');
+    this.imageSizes = payload.imageSizes;
+    this.imageColor = Int32Array.from(columns.imageColor || []);
+    this.imageLqipField = payload.textFields.indexOf('imageLqip');
+    this.textOffsets = new Uint32Array(payload.textLengths.length + 1);
+    payload.textLengths.forEach((length, slot) => {
+      this.textOffsets[slot + 1] = this.textOffsets[slot] + length;
+    });
+    this.fieldCount = payload.textFields.length;
+    this.categories = payload.categories;
+    this.urlPrefixes = payload.urlPrefixes;
+    this.urlSegments = payload.urlSegments;
+    this.text = payload.text;
+
+    this.featured = new Uint8Array(payload.total);
+    payload.featured.forEach(position => {
+      this.featured[position] = 1;
+    });
+  }
+
+  private textAt(position: number, field: number): string {
+    const slot = position * this.fieldCount + field;
+    return this.text.slice(this.textOffsets[slot], this.textOffsets[slot + 1]);
+  }
+
+  private urlAt(prefix: number, position: number, field: number): string {
+    const rest = this.textAt(position, field).replace(
+      SEGMENT_REFERENCE,
+      reference => this.urlSegments[reference.charCodeAt(0) - SEGMENT_BASE]
+    );
+    return this.urlPrefixes[prefix] + rest;
+  }
+
+  private imagesAt(position: number): DealImageSizes | undefined {
+    const sizes = this.imageSizes;
+    if (!sizes || this.imageTemplateField === -1 || !this.textAt(position, this.imageTemplateField)) {
+      return undefined;
+    }
+
+    const template = this.urlAt(this.imageTemplatePrefix[position], position, this.imageTemplateField);
+    return {
+      card: template.replace('{size}', sizes.card),
+      sidebar: template.replace('{size}', sizes.sidebar),
+      modal: template.replace('{size}', sizes.modal)
+    };
+  }
+
+  get(position: number): Deal {
+    const cached = this.materialized.get(position);
+    if (cached) {
+      return cached;
+    }
+
+    const deal: Deal = {
+      id: this.textAt(position, TEXT_ID),
+      title: this.textAt(position, TEXT_TITLE),
+      imageUrl: this.urlAt(this.imagePrefix[position], position, TEXT_IMAGE),
+      price: this.price[position] / 100,
+      originalPrice: this.originalPrice[position] / 100,
+      discountPercent: this.discount[position],
+      category: this.categories[this.categoryIndex[position]],
+      description: this.textAt(position, TEXT_DESCRIPTION),
+      affiliateUrl: this.urlAt(this.affiliatePrefix[position], position, TEXT_AFFILIATE),
+      featured: this.featured[position] === 1,
+      dateAdded: formatDate(this.dateAdded[position])
+    };
+
+    const images = this.imagesAt(position);
+    if (images) {
+      deal.images = images;
+    }
+
+    const color = position < this.imageColor.length ? this.imageColor[position] : -1;
+    if (color >= 0) {
+      deal.imageColor = '#' + color.toString(16).padStart(6, '0');
+      const lqip = this.imageLqipField === -1 ? '' : this.textAt(position, this.imageLqipField);
+      if (lqip) {
+        deal.imageLqip = lqip;
+      }
+    }
+
+    // Bounded so scrolling through the whole catalog doesn't rebuild the full object graph
+    if (this.materialized.size >= MATERIALIZED_CACHE_SIZE) {
+      const oldest = this.materialized.keys().next().value;
+      if (oldest !== undefined) {
+        this.materialized.delete(oldest);
+      }
+    }
+    this.materialized.set(position, deal);
+
+    return deal;
+  }
+
+  slice(start: number, end: number): Deal[] {
+    const deals: Deal[] = [];
+    for (let position = start; position < Math.min(end, this.total); position++) {
+      deals.push(this.get(position));
+    }
+    return deals;
+  }
+
+  category(position: number) {
+    return this.categories[this.categoryIndex[position]];
+  }
+
+  isFeatured(position: number) {
+    return this.featured[position] === 1;
+  }
+
+  discountPercent(position: number) {
+    return this.discount[position];
+  }
+
+  timestamp(position: number) {
+    return this.dateAdded[position];
+  }
+
+  searchText(position: number) {
+    return `${this.textAt(position, TEXT_TITLE)} ${this.textAt(position, TEXT_DESCRIPTION)} ${this.category(position)}`;
+  }
+}
+
+const compactCache = new Map<string, Promise<CompactDeals>>();
+const loadedTables = new Map<string, CompactDeals>();
+
+export function loadCompactDeals(url: string): Promise<CompactDeals> {
+  let pending = compactCache.get(url);
+
+  if (!pending) {
+    pending = fetch(url)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Failed to load compact deals: ${response.status}`);
+        }
+        return response.json() as Promise<CompactDealsPayload>;
+      })
+      .then(payload => {
+        const table = new CompactDeals(payload);
+        loadedTables.set(url, table);
+        return table;
+      });
+    pending.catch(() => compactCache.delete(url));
+    compactCache.set(url, pending);
+  }
+
+  return pending;
+}
+
+// Synchronous lookup used to serve pages from an already decoded table
+export function getLoadedCompactDeals(url: string): CompactDeals | undefined {
+  return loadedTables.get(url);
+}
@@ -0,0 +1,173 @@
+import { Deal, DealManifest } from '../types/Deal';
+import { getLoadedCompactDeals } from './compactDeals';
+import { readBootData, takeBootRequest } from './bootData';
+
+/**
+ * Loads the paged deal data written by scripts/publish-deals.js.
+ * Requests are cached by URL so every component shares one download per page.
+ * Settled values are also kept synchronously so prerendered pages can hydrate
+ * with their data already present.
+ */
+
+const manifestCache = new Map<string, Promise<DealManifest>>();
+const pageCache = new Map<string, Promise<Deal[]>>();
+const resolvedManifests = new Map<string, DealManifest>();
+const resolvedPages = new Map<string, Deal[]>();
+
+const boot = readBootData();
+Object.entries(boot.manifests || {}).forEach(([key, manifest]) => {
+  resolvedManifests.set(key, manifest);
+  manifestCache.set(key, Promise.resolve(manifest));
+});
+Object.entries(boot.pages || {}).forEach(([url, deals]) => {
+  resolvedPages.set(url, deals);
+  pageCache.set(url, Promise.resolve(deals));
+});
+
+function manifestKey(manifestFile: string | undefined, dataFile: string): string {
+  return `${manifestFile || ''}|${dataFile}`;
+}
+
+async function fetchJson<T>(url: string): Promise<T> {
+  const early = takeBootRequest(url);
+  const response = await (early ? early.catch(() => fetch(url)) : fetch(url));
+
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+
+  return response.json();
+}
+
+// Same ordering as the publish step: newest first, ties broken by id
+export function compareDeals(a: Deal, b: Deal): number {
+  if (a.dateAdded !== b.dateAdded) {
+    return a.dateAdded < b.dateAdded ? 1 : -1;
+  }
+  return a.id < b.id ? -1 : a.id > b.id ? 1 : 0;
+}
+
+// Without a manifest the whole data file is treated as a single page
+async function loadSinglePageManifest(dataFile: string): Promise<DealManifest> {
+  const deals = await fetchJson<Deal[]>(dataFile);
+  const sorted = [...deals].sort(compareDeals);
+
+  const featured = sorted
+    .map((deal, position) => ({ deal, position }))
+    .filter(({ deal }) => deal.featured)
+    .sort((a, b) => b.deal.discountPercent - a.deal.discountPercent || a.position - b.position)
+    .map(({ position }) => position);
+
+  pageCache.set(dataFile, Promise.resolve(sorted));
+  resolvedPages.set(dataFile, sorted);
+
+  return {
+    version: 'unversioned',
+    generatedAt: '',
+    total: sorted.length,
+    pageSize: Math.max(sorted.length, 1),
+    pageCount: 1,
+    pages: [dataFile],
+    featured,
+    unsorted: true
+  };
+}
+
+export function loadManifest(manifestFile: string | undefined, dataFile: string): Promise<DealManifest> {
+  const key = manifestKey(manifestFile, dataFile);
+  let pending = manifestCache.get(key);
+
+  if (!pending) {
+    pending = (manifestFile
+      ? fetchJson<DealManifest>(manifestFile).catch(err => {
+          console.warn('Deal manifest unavailable, loading full data file:', err);
+          return loadSinglePageManifest(dataFile);
+        })
+      : loadSinglePageManifest(dataFile)
+    ).then(manifest => {
+      resolvedManifests.set(key, manifest);
+      return manifest;
+    });
+
+    pending.catch(() => manifestCache.delete(key));
+    manifestCache.set(key, pending);
+  }
+
+  return pending;
+}
+
+export function loadPage(manifest: DealManifest, pageIndex: number): Promise<Deal[]> {
+  const url = manifest.pages[pageIndex];
+
+  if (!url) {
+    return Promise.resolve([]);
+  }
+
+  // Once the columnar file is decoded, pages are materialized from it instead of fetched
+  const compact = manifest.compact ? getLoadedCompactDeals(manifest.compact) : undefined;
+  if (compact && compact.version === manifest.version) {
+    const start = pageIndex * manifest.pageSize;
+    return Promise.resolve(compact.slice(start, start + manifest.pageSize));
+  }
+
+  let pending = pageCache.get(url);
+
+  if (!pending) {
+    pending = fetchJson<Deal[]>(url).then(deals => {
+      const page = manifest.unsorted ? [...deals].sort(compareDeals) : deals;
+      resolvedPages.set(url, page);
+      return page;
+    });
+    pending.catch(() => pageCache.delete(url));
+    pageCache.set(url, pending);
+  }
+
+  return pending;
+}
+
+// Resolves manifest positions to deals, fetching only the page shards they live in
+export async function loadDealsAt(manifest: DealManifest, positions: number[]): Promise<Deal[]> {
+  const pageIndexes = Array.from(new Set(positions.map(position => Math.floor(position / manifest.pageSize))));
+  const loaded = await Promise.all(pageIndexes.map(pageIndex => loadPage(manifest, pageIndex)));
+  const pagesByIndex = new Map(pageIndexes.map((pageIndex, i) => [pageIndex, loaded[i]]));
+
+  return positions
+    .map(position => pagesByIndex.get(Math.floor(position / manifest.pageSize))?.[position % manifest.pageSize])
+    .filter((deal): deal is Deal => deal !== undefined);
+}
+
+export function loadAllDeals(manifest: DealManifest): Promise<Deal[]> {
+  return Promise.all(manifest.pages.map((_, pageIndex) => loadPage(manifest, pageIndex)))
+    .then(pages => ([] as Deal[]).concat(...pages));
+}
+
+export function peekManifest(manifestFile: string | undefined, dataFile: string): DealManifest | undefined {
+  return resolvedManifests.get(manifestKey(manifestFile, dataFile));
+}
+
+export function peekPage(manifest: DealManifest, pageIndex: number): Deal[] | undefined {
+  return resolvedPages.get(manifest.pages[pageIndex]);
+}
+
+// Synchronous counterpart of loadDealsAt; undefined unless every page is already loaded
+export function peekDealsAt(manifest: DealManifest, positions: number[]): Deal[] | undefined {
+  const deals: Deal[] = [];
+
+  for (const position of positions) {
+    const page = resolvedPages.get(manifest.pages[Math.floor(position / manifest.pageSize)]);
+    const deal = page?.[position % manifest.pageSize];
+    if (!deal) {
+      return undefined;
+    }
+    deals.push(deal);
+  }
+
+  return deals;
+}
+
+export function collectDealBootData() {
+  return {
+    manifests: Object.fromEntries(resolvedManifests),
+    pages: Object.fromEntries(resolvedPages)
+  };
+}
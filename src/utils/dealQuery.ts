@@ -0,0 +1,153 @@
+import { DealManifest } from '../types/Deal';
+import { ArrayDealTable, DealTable, loadCompactDeals } from './compactDeals';
+import { loadAllDeals } from './dealPages';
+import { syncDeals } from './dealSync';
+import { DealStore } from './dealStore';
+import { SearchCache } from './searchCache';
+import { CachedSearch, SearchHits, SearchIndex, loadSearchIndex, normalizeText, searchIndex, tokenize } from './searchIndex';
+
+/**
+ * Query logic shared by the deals engine worker and its in-thread fallback.
+ * Results are deal positions in manifest order, never Deal objects, so only
+ * small id lists have to cross the worker boundary.
+ */
+
+export interface DealQuery {
+  text: string;
+  category?: string;
+  featuredLimit?: number;
+}
+
+export interface DealQueryResult {
+  ids: Int32Array;
+  featuredIds: Int32Array;
+  // Indexed terms the text matched, typo and prefix variants included
+  terms: string[];
+}
+
+export interface DealDataset {
+  manifest: DealManifest;
+  table: DealTable;
+  store: DealStore;
+  index: SearchIndex | null;
+  // Recent text queries, so each keystroke narrows the previous hits
+  searchCache: SearchCache<CachedSearch>;
+}
+
+export type EngineRequest =
+  | { type: 'load'; manifest: DealManifest }
+  | { type: 'query'; requestId: number; query: DealQuery };
+
+export type EngineResponse =
+  | { type: 'ready'; version: string; total: number }
+  | { type: 'result'; requestId: number; ids: Int32Array; featuredIds: Int32Array; terms: string[] }
+  | { type: 'error'; requestId?: number; message: string };
+
+// Prefers the locally synced catalog (only a delta to download), then the
+// columnar file, then every page file
+async function loadDealTable(manifest: DealManifest): Promise<DealTable> {
+  if (manifest.feed) {
+    try {
+      return new ArrayDealTable(await syncDeals(manifest));
+    } catch (err) {
+      console.warn('Deals feed sync failed:', err);
+    }
+  }
+
+  if (manifest.compact) {
+    try {
+      const compact = await loadCompactDeals(manifest.compact);
+      if (compact.version === manifest.version) {
+        return compact;
+      }
+    } catch (err) {
+      console.warn('Compact deals unavailable, loading page files:', err);
+    }
+  }
+
+  return new ArrayDealTable(await loadAllDeals(manifest));
+}
+
+export async function loadDealDataset(manifest: DealManifest): Promise<DealDataset> {
+  const [table, index] = await Promise.all([
+    loadDealTable(manifest),
+    manifest.searchIndex
+      ? loadSearchIndex(manifest.searchIndex).catch(err => {
+          console.warn('Search index unavailable, falling back to scanning:', err);
+          return null;
+        })
+      : Promise.resolve(null)
+  ]);
+
+  // A stale index would point at the wrong positions
+  const usableIndex = index && index.version === manifest.version ? index : null;
+
+  return { manifest, table, store: new DealStore(table), index: usableIndex, searchCache: new SearchCache() };
+}
+
+// Without an index: plain substring matching, newest first. A deal containing
+// every word of a longer query contains every word of any query it extends,
+// so refined queries only rescan the earlier hits.
+function scanPositions(table: DealTable, text: string, cache: SearchCache<CachedSearch>): SearchHits {
+  const tokens = tokenize(text);
+  const typing = !/\s$/.test(text);
+
+  if (tokens.length === 0) {
+    return { positions: [], terms: [] };
+  }
+
+  const cached = cache.get(tokens, typing);
+  if (cached) {
+    return cached.hits;
+  }
+
+  const base = cache.refinements(tokens)[0];
+  const candidates = base ? base.hits.positions : null;
+  const count = candidates ? candidates.length : table.total;
+  const positions: number[] = [];
+
+  for (let i = 0; i < count; i++) {
+    const position = candidates ? candidates[i] : i;
+    const haystack = normalizeText(table.searchText(position));
+    if (tokens.every(token => haystack.includes(token))) {
+      positions.push(position);
+    }
+  }
+
+  const hits = { positions, terms: tokens };
+  cache.set(tokens, typing, { hits }, positions.length);
+  return hits;
+}
+
+export function runDealQuery(dataset: DealDataset, query: DealQuery): DealQueryResult {
+  const { table, store, index, searchCache } = dataset;
+  const hasText = tokenize(query.text).length > 0;
+  let positions: ArrayLike<number>;
+  let terms: string[] = [];
+
+  if (hasText) {
+    // Text hits come back ranked, best match first
+    const hits = index ? searchIndex(index, query.text, searchCache) : scanPositions(table, query.text, searchCache);
+    terms = hits.terms;
+    positions = query.category
+      ? hits.positions.filter(position => table.category(position) === query.category)
+      : hits.positions;
+  } else {
+    positions = query.category ? store.inCategory(query.category) : store.dateOrder;
+  }
+
+  // Browsing reads the memoized top deals; text hits differ on every keystroke
+  const limit = query.featuredLimit ?? 0;
+  let featured: ArrayLike<number> = [];
+
+  if (limit > 0) {
+    featured = hasText ? store.featuredAmong(positions, limit) : store.topFeatured(limit, query.category);
+  }
+
+  // Copies, since the worker transfers their buffers and the store's arrays must stay intact
+  return {
+    ids: Int32Array.from(positions),
+    featuredIds: Int32Array.from(featured),
+    terms
+  };
+}
@@ -0,0 +1,104 @@
+import { DealTable } from './compactDeals';
+
+/**
+ * Normalized indexes over one dataset version, built once when the dataset
+ * loads. Dates are parsed a single time, and the orders that used to be
+ * re-sorted on every render (newest first, featured by discount, per
+ * category) become ready-made position arrays that runDealQuery reads.
+ * Values derived from them are memoized for the lifetime of the version.
+ */
+export class DealStore {
+  readonly total: number;
+  readonly timestamps: Float64Array;
+  readonly dateOrder: Int32Array;
+  readonly featuredByDiscount: Int32Array;
+  private readonly categoryPositions = new Map<string, Int32Array>();
+  private readonly selectorCache = new Map<string, unknown>();
+  // One mark per position, all zero between calls to featuredAmong
+  private readonly scratch: Uint8Array;
+
+  constructor(readonly table: DealTable) {
+    const total = table.total;
+    const featured: number[] = [];
+    const byCategory = new Map<string, number[]>();
+
+    this.total = total;
+    this.timestamps = new Float64Array(total);
+    this.scratch = new Uint8Array(total);
+
+    for (let position = 0; position < total; position++) {
+      this.timestamps[position] = table.timestamp(position);
+
+      if (table.isFeatured(position)) {
+        featured.push(position);
+      }
+
+      const category = table.category(position);
+      const list = byCategory.get(category);
+      if (list) {
+        list.push(position);
+      } else {
+        byCategory.set(category, [position]);
+      }
+    }
+
+    const timestamps = this.timestamps;
+    this.dateOrder = Int32Array.from(Array.from({ length: total }, (_, i) => i))
+      .sort((a, b) => timestamps[b] - timestamps[a] || a - b);
+
+    this.featuredByDiscount = Int32Array.from(
+      featured.sort((a, b) => table.discountPercent(b) - table.discountPercent(a) || a - b)
+    );
+
+    byCategory.forEach((positions, category) => {
+      this.categoryPositions.set(category, Int32Array.from(positions));
+    });
+  }
+
+  // Memoizes a derived value for the lifetime of this dataset version
+  select<T>(key: string, compute: () => T): T {
+    if (!this.selectorCache.has(key)) {
+      this.selectorCache.set(key, compute());
+    }
+    return this.selectorCache.get(key) as T;
+  }
+
+  categories(): string[] {
+    return this.select('categories', () => Array.from(this.categoryPositions.keys()).sort());
+  }
+
+  inCategory(category: string): Int32Array {
+    return this.categoryPositions.get(category) || new Int32Array(0);
+  }
+
+  // Best discounts first, across the catalog or within one category
+  topFeatured(limit: number, category?: string): Int32Array {
+    return this.select(`topFeatured:${category ?? ''}:${limit}`, () =>
+      category === undefined
+        ? this.featuredByDiscount.slice(0, limit)
+        : Int32Array.from(this.featuredAmong(this.inCategory(category), limit))
+    );
+  }
+
+  // Walks the precomputed featured order instead of sorting the matches. The
+  // matches are marked in the shared scratch buffer and unmarked before
+  // returning, so a query allocates nothing the size of the catalog
+  featuredAmong(positions: ArrayLike<number>, limit: number): number[] {
+    const marks = this.scratch;
+    const featured: number[] = [];
+
+    for (let i = 0; i < positions.length; i++) {
+      marks[positions[i]] = 1;
+    }
+    for (let i = 0; i < this.featuredByDiscount.length && featured.length < limit; i++) {
+      if (marks[this.featuredByDiscount[i]]) {
+        featured.push(this.featuredByDiscount[i]);
+      }
+    }
+    for (let i = 0; i < positions.length; i++) {
+      marks[positions[i]] = 0;
+    }
+
+    return featured;
+  }
+}
@@ -0,0 +1,84 @@
+import { Deal, DealFeedDelta, DealManifest } from '../types/Deal';
+import { compareDeals } from './dealPages';
+import { idbGet, idbSet } from './idbStore';
+
+/**
+ * Keeps a local copy of the full catalog in IndexedDB and brings it up to date
+ * with the published feed. A client on version N downloads only the delta from
+ * N; a client that is too far behind (or has nothing yet) gets the snapshot.
+ * The feed counter can restart if its history is regenerated, so the catalog
+ * is only reused, or patched, when its content hash is the one expected.
+ */
+
+const STORAGE_KEY = 'deals-feed';
+
+interface StoredCatalog {
+  version: number;
+  hash?: string; // manifest.version of the catalog, missing in copies stored before it was recorded
+  deals: Deal[];
+}
+
+async function fetchJson<T>(url: string): Promise<T> {
+  const response = await fetch(url);
+
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+
+  return response.json();
+}
+
+function applyDelta(deals: Deal[], delta: DealFeedDelta): Deal[] {
+  const changed = new Set(delta.removed);
+  delta.upserted.forEach(deal => changed.add(deal.id));
+
+  return deals
+    .filter(deal => !changed.has(deal.id))
+    .concat(delta.upserted)
+    .sort(compareDeals);
+}
+
+export async function syncDeals(manifest: DealManifest): Promise<Deal[]> {
+  const feed = manifest.feed;
+  if (!feed) {
+    throw new Error('Manifest has no deals feed');
+  }
+
+  const stored = await idbGet<StoredCatalog>(STORAGE_KEY);
+
+  if (stored && stored.hash === manifest.version && stored.deals.length === manifest.total) {
+    return stored.deals;
+  }
+
+  let next: StoredCatalog | null = null;
+
+  if (stored && stored.hash && stored.version >= feed.oldest && stored.version < feed.version) {
+    try {
+      const delta = await fetchJson<DealFeedDelta>(feed.deltas.replace('{from}', String(stored.version)));
+      const deals = applyDelta(stored.deals, delta);
+
+      // A hash or count mismatch means the local copy drifted; start over from the snapshot
+      if (
+        delta.fromHash === stored.hash &&
+        delta.toHash === manifest.version &&
+        delta.to === feed.version &&
+        deals.length === manifest.total
+      ) {
+        next = { version: delta.to, hash: delta.toHash, deals };
+      }
+    } catch (err) {
+      console.warn('Deals delta unavailable, loading snapshot:', err);
+    }
+  }
+
+  if (!next) {
+    next = await fetchJson<StoredCatalog>(feed.snapshot);
+    if (next.hash !== manifest.version) {
+      throw new Error(`Deals snapshot ${next.hash} does not match manifest ${manifest.version}`);
+    }
+  }
+
+  await idbSet(STORAGE_KEY, next);
+
+  return next.deals;
+}
@@ -0,0 +1,132 @@
+import { DealManifest } from '../types/Deal';
+import { DealDataset, DealQuery, DealQueryResult, EngineRequest, EngineResponse, loadDealDataset, runDealQuery } from './dealQuery';
+
+/**
+ * Main-thread handle to the deals engine worker. Only the newest query is ever
+ * answered: starting a query resolves every older one with null, and late
+ * replies from the worker are dropped by request id. A query that fails
+ * rejects; if the worker itself dies, the queries it still owed are run again
+ * in-thread.
+ */
+
+interface PendingQuery {
+  query: DealQuery;
+  resolve: (result: DealQueryResult | null) => void;
+  reject: (error: Error) => void;
+}
+
+export class DealsEngine {
+  private worker: Worker | null = null;
+  private fallback: Promise<DealDataset> | null = null;
+  private latestRequestId = 0;
+  private pending = new Map<number, PendingQuery>();
+
+  constructor(manifest: DealManifest) {
+    if (typeof Worker !== 'undefined') {
+      try {
+        this.worker = new Worker(new URL('../workers/dealsEngine.worker.ts', import.meta.url));
+        this.worker.onmessage = (event: MessageEvent<EngineResponse>) => this.handleMessage(event.data);
+        this.worker.onerror = event => {
+          console.error('Deals engine worker failed, running queries in-thread:', event.message);
+          this.worker?.terminate();
+          this.worker = null;
+          this.fallback = loadDealDataset(manifest);
+          this.pending.forEach(({ query }, requestId) => this.runInThread(requestId, query));
+        };
+        this.send({ type: 'load', manifest });
+        return;
+      } catch (error) {
+        console.warn('Deals engine worker unavailable, running queries in-thread:', error);
+        this.worker = null;
+      }
+    }
+
+    this.fallback = loadDealDataset(manifest);
+  }
+
+  // Resolves null only when a newer query (or a newer dataset) superseded this one
+  query(query: DealQuery): Promise<DealQueryResult | null> {
+    const requestId = ++this.latestRequestId;
+    this.supersede();
+
+    return new Promise((resolve, reject) => {
+      this.pending.set(requestId, { query, resolve, reject });
+
+      if (this.worker) {
+        this.send({ type: 'query', requestId, query });
+      } else {
+        this.runInThread(requestId, query);
+      }
+    });
+  }
+
+  terminate() {
+    this.supersede();
+    this.worker?.terminate();
+    this.worker = null;
+  }
+
+  private supersede() {
+    this.pending.forEach(({ resolve }) => resolve(null));
+    this.pending.clear();
+  }
+
+  private runInThread(requestId: number, query: DealQuery) {
+    this.fallback!
+      .then(dataset => {
+        if (this.pending.has(requestId)) {
+          this.settle(requestId, runDealQuery(dataset, query));
+        }
+      })
+      .catch(error => this.fail(requestId, error instanceof Error ? error : new Error(String(error))));
+  }
+
+  private send(message: EngineRequest) {
+    this.worker?.postMessage(message);
+  }
+
+  private settle(requestId: number, result: DealQueryResult) {
+    const entry = this.pending.get(requestId);
+    if (entry) {
+      this.pending.delete(requestId);
+      entry.resolve(result);
+    }
+  }
+
+  private fail(requestId: number, error: Error) {
+    const entry = this.pending.get(requestId);
+    if (entry) {
+      this.pending.delete(requestId);
+      entry.reject(error);
+    }
+  }
+
+  private handleMessage(message: EngineResponse) {
+    if (message.type === 'result') {
+      this.settle(message.requestId, { ids: message.ids, featuredIds: message.featuredIds, terms: message.terms });
+    } else if (message.type === 'error') {
+      console.error('Deals engine error:', message.message);
+      // A failed dataset load also fails every query after it, each with its own id
+      if (message.requestId !== undefined) {
+        this.fail(message.requestId, new Error(message.message));
+      }
+    }
+  }
+}
+
+const engines = new Map<string, DealsEngine>();
+
+// One engine per dataset version, shared by every component that searches
+export function getDealsEngine(manifest: DealManifest): DealsEngine {
+  const key = `${manifest.version}|${manifest.pages[0] || ''}`;
+  let engine = engines.get(key);
+
+  if (!engine) {
+    engines.forEach(existing => existing.terminate());
+    engines.clear();
+    engine = new DealsEngine(manifest);
+    engines.set(key, engine);
+  }
+
+  return engine;
+}
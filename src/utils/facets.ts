@@ -0,0 +1,343 @@
+import { Bitset, andInto, bitsetFrom, bitsetPositions, countAnd, fullBitset, orInto } from './bitset';
+
+/**
+ * Client side of the facet index written by scripts/lib/facets.js. Each facet
+ * value becomes a bitset of deal positions when the index loads. Values of one
+ * dimension are OR-ed, dimensions are AND-ed, and every value's count is taken
+ * against the filters of the other dimensions, so counts always say how many
+ * deals a click would show.
+ *
+ * Price and discount are range indexes: positions sorted by value, so a range
+ * is two binary searches plus the k matching positions (O(log n + k)), and the
+ * slider histograms are popcounts of one bitset per bucket.
+ */
+
+export interface FacetValuePayload {
+  value: string;
+  label: string;
+  count: number;
+  ids: number[]; // gap-encoded positions
+}
+
+export interface FacetDimensionPayload {
+  key: string;
+  label: string;
+  values: FacetValuePayload[];
+}
+
+export interface RangePayload {
+  key: string;
+  label: string;
+  unit: 'cents' | 'percent';
+  order: number[]; // positions by ascending value
+  values: number[]; // the sorted values, delta-encoded
+  buckets: number[]; // histogram bucket lower bounds
+}
+
+export interface FacetsPayload {
+  format: 'facets-v1' | 'facets-v2';
+  version: string;
+  total: number;
+  dimensions: FacetDimensionPayload[];
+  ranges?: RangePayload[];
+}
+
+// Selected values per dimension key; a missing or empty list means no filter
+export type FacetFilters = Record<string, string[]>;
+
+// Inclusive bounds in display units (dollars, percent); a missing bound is open
+export interface RangeFilter {
+  min?: number;
+  max?: number;
+}
+
+export type RangeFilters = Record<string, RangeFilter>;
+
+export interface HistogramBucket {
+  from: number;
+  to: number | null; // null for the open-ended last bucket
+  count: number;
+}
+
+export interface RangeGroup {
+  key: string;
+  label: string;
+  unit: 'dollars' | 'percent';
+  min: number;
+  max: number;
+  buckets: HistogramBucket[];
+}
+
+export interface FacetOption {
+  value: string;
+  label: string;
+  count: number;
+}
+
+export interface FacetGroup {
+  key: string;
+  label: string;
+  options: FacetOption[];
+}
+
+export interface FacetResult {
+  ids: Int32Array;
+  groups: FacetGroup[];
+  ranges: RangeGroup[];
+}
+
+interface FacetDimension {
+  key: string;
+  label: string;
+  values: { value: string; label: string; bits: Bitset }[];
+}
+
+const MASK_CACHE_SIZE = 64;
+
+function deltaDecode(deltas: number[]): Int32Array {
+  const values = new Int32Array(deltas.length);
+  let value = 0;
+  for (let i = 0; i < deltas.length; i++) {
+    value += deltas[i];
+    values[i] = value;
+  }
+  return values;
+}
+
+export class RangeIndex {
+  readonly key: string;
+  readonly label: string;
+  readonly unit: 'dollars' | 'percent';
+  private readonly scale: number;
+  private readonly total: number;
+  private readonly order: Int32Array;
+  private readonly values: Int32Array;
+  private readonly bucketBounds: number[];
+  private readonly bucketBits: Bitset[];
+
+  constructor(payload: RangePayload, total: number) {
+    this.key = payload.key;
+    this.label = payload.label;
+    this.unit = payload.unit === 'cents' ? 'dollars' : 'percent';
+    this.scale = payload.unit === 'cents' ? 100 : 1;
+    this.total = total;
+    this.order = Int32Array.from(payload.order);
+    this.values = deltaDecode(payload.values);
+    this.bucketBounds = payload.buckets;
+    this.bucketBits = payload.buckets.map((bound, i) => {
+      const start = this.lowerBound(bound);
+      const end = i + 1 < payload.buckets.length ? this.lowerBound(payload.buckets[i + 1]) : this.values.length;
+      return bitsetFrom(total, this.order.subarray(start, end));
+    });
+  }
+
+  // First index whose value is >= value
+  private lowerBound(value: number): number {
+    let low = 0;
+    let high = this.values.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (this.values[mid] < value) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  // First index whose value is > value
+  private upperBound(value: number): number {
+    let low = 0;
+    let high = this.values.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (this.values[mid] <= value) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  get min(): number {
+    return this.values.length ? this.values[0] / this.scale : 0;
+  }
+
+  get max(): number {
+    return this.values.length ? this.values[this.values.length - 1] / this.scale : 0;
+  }
+
+  // Positions with min <= value <= max, as a view into the sorted order
+  positionsIn({ min, max }: RangeFilter): Int32Array {
+    const start = min === undefined ? 0 : this.lowerBound(Math.round(min * this.scale));
+    const end = max === undefined ? this.values.length : this.upperBound(Math.round(max * this.scale));
+    return this.order.subarray(start, Math.max(start, end));
+  }
+
+  bitsIn(range: RangeFilter): Bitset {
+    return bitsetFrom(this.total, this.positionsIn(range));
+  }
+
+  histogram(within: Bitset): HistogramBucket[] {
+    return this.bucketBounds.map((bound, i) => ({
+      from: bound / this.scale,
+      to: i + 1 < this.bucketBounds.length ? this.bucketBounds[i + 1] / this.scale : null,
+      count: countAnd(this.bucketBits[i], within)
+    }));
+  }
+}
+
+function gapDecode(gaps: number[]): Int32Array {
+  const positions = new Int32Array(gaps.length);
+  let position = -1;
+  for (let i = 0; i < gaps.length; i++) {
+    position += gaps[i];
+    positions[i] = position;
+  }
+  return positions;
+}
+
+export class FacetIndex {
+  readonly version: string;
+  readonly total: number;
+  private readonly dimensions: FacetDimension[];
+  private readonly ranges: RangeIndex[];
+  private readonly all: Bitset;
+  // Union masks per dimension selection; toggling one filter only rebuilds that dimension's mask
+  private readonly maskCache = new Map<string, Bitset>();
+
+  constructor(payload: FacetsPayload) {
+    this.version = payload.version;
+    this.total = payload.total;
+    this.all = fullBitset(payload.total);
+    this.dimensions = payload.dimensions.map(dimension => ({
+      key: dimension.key,
+      label: dimension.label,
+      values: dimension.values.map(value => ({
+        value: value.value,
+        label: value.label,
+        bits: bitsetFrom(payload.total, gapDecode(value.ids))
+      }))
+    }));
+    this.ranges = (payload.ranges || []).map(range => new RangeIndex(range, payload.total));
+  }
+
+  bitsFor(positions: ArrayLike<number>): Bitset {
+    return bitsetFrom(this.total, positions);
+  }
+
+  private dimensionMask(dimension: FacetDimension, selected: string[] | undefined): Bitset | null {
+    const chosen = dimension.values.filter(value => selected && selected.includes(value.value));
+    if (chosen.length === 0) {
+      return null;
+    }
+
+    const key = `${dimension.key}:${chosen.map(value => value.value).join('\u0000')}`;
+    let mask = this.maskCache.get(key);
+
+    if (!mask) {
+      mask = chosen.slice(1).reduce((union, value) => orInto(union, union, value.bits), chosen[0].bits.slice());
+      if (this.maskCache.size >= MASK_CACHE_SIZE) {
+        this.maskCache.clear();
+      }
+      this.maskCache.set(key, mask);
+    }
+
+    return mask;
+  }
+
+  private rangeMask(range: RangeIndex, filter: RangeFilter | undefined): Bitset | null {
+    if (!filter || (filter.min === undefined && filter.max === undefined)) {
+      return null;
+    }
+
+    const key = `range:${range.key}:${filter.min ?? ''}-${filter.max ?? ''}`;
+    let mask = this.maskCache.get(key);
+
+    if (!mask) {
+      mask = range.bitsIn(filter);
+      if (this.maskCache.size >= MASK_CACHE_SIZE) {
+        this.maskCache.clear();
+      }
+      this.maskCache.set(key, mask);
+    }
+
+    return mask;
+  }
+
+  /**
+   * Applies the filters, optionally within another set (search hits), and
+   * returns the matching positions plus per-value counts and histograms.
+   */
+  select(filters: FacetFilters, ranges: RangeFilters = {}, within: Bitset | null = null): FacetResult {
+    const masks = this.dimensions
+      .map(dimension => this.dimensionMask(dimension, filters[dimension.key]))
+      .concat(this.ranges.map(range => this.rangeMask(range, ranges[range.key])));
+    const base = within ? andInto(this.all.slice(), this.all, within) : this.all.slice();
+    const others = new Uint32Array(base.length);
+
+    // Everything but the filter at `skip`, which is what that filter's options are counted against
+    const othersExcept = (skip: number) => {
+      others.set(base);
+      masks.forEach((mask, m) => {
+        if (mask && m !== skip) {
+          andInto(others, others, mask);
+        }
+      });
+      return others;
+    };
+
+    const groups = this.dimensions.map((dimension, d) => {
+      const against = othersExcept(d);
+      return {
+        key: dimension.key,
+        label: dimension.label,
+        options: dimension.values.map(value => ({
+          value: value.value,
+          label: value.label,
+          count: countAnd(value.bits, against)
+        }))
+      };
+    });
+
+    const rangeGroups = this.ranges.map((range, r) => ({
+      key: range.key,
+      label: range.label,
+      unit: range.unit,
+      min: range.min,
+      max: range.max,
+      buckets: range.histogram(othersExcept(this.dimensions.length + r))
+    }));
+
+    masks.forEach(mask => {
+      if (mask) {
+        andInto(base, base, mask);
+      }
+    });
+
+    return { ids: bitsetPositions(base), groups, ranges: rangeGroups };
+  }
+}
+
+const facetCache = new Map<string, Promise<FacetIndex>>();
+
+export function loadFacets(url: string): Promise<FacetIndex> {
+  let pending = facetCache.get(url);
+
+  if (!pending) {
+    pending = fetch(url)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Failed to load facets: ${response.status}`);
+        }
+        return response.json() as Promise<FacetsPayload>;
+      })
+      .then(payload => new FacetIndex(payload));
+    pending.catch(() => facetCache.delete(url));
+    facetCache.set(url, pending);
+  }
+
+  return pending;
+}
@@ -0,0 +1,63 @@
+/**
+ * Tiny promise wrapper around a single IndexedDB object store. Works in the
+ * page and in workers; every call resolves to undefined when IndexedDB is
+ * unavailable (private browsing, old browsers) so callers can treat it as a cache miss.
+ */
+
+const DB_NAME = 'savingsguru';
+const STORE_NAME = 'cache';
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+function openDb(): Promise<IDBDatabase | null> {
+  if (!dbPromise) {
+    dbPromise = new Promise(resolve => {
+      if (typeof indexedDB === 'undefined') {
+        resolve(null);
+        return;
+      }
+
+      const request = indexedDB.open(DB_NAME, 1);
+      request.onupgradeneeded = () => {
+        request.result.createObjectStore(STORE_NAME);
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        console.warn('IndexedDB unavailable:', request.error);
+        resolve(null);
+      };
+    });
+  }
+
+  return dbPromise;
+}
+
+export async function idbGet<T>(key: string): Promise<T | undefined> {
+  const db = await openDb();
+  if (!db) {
+    return undefined;
+  }
+
+  return new Promise(resolve => {
+    const request = db.transaction(STORE_NAME, 'readonly').objectStore(STORE_NAME).get(key);
+    request.onsuccess = () => resolve(request.result as T | undefined);
+    request.onerror = () => resolve(undefined);
+  });
+}
+
+export async function idbSet<T>(key: string, value: T): Promise<void> {
+  const db = await openDb();
+  if (!db) {
+    return;
+  }
+
+  return new Promise(resolve => {
+    const transaction = db.transaction(STORE_NAME, 'readwrite');
+    transaction.objectStore(STORE_NAME).put(value, key);
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = () => {
+      console.warn('Failed to write to IndexedDB:', transaction.error);
+      resolve();
+    };
+  });
+}
@@ -0,0 +1,51 @@
+// Widths the image endpoint will render; keep in sync with ALLOWED_WIDTHS in api/images.js
+export const IMAGE_WIDTHS = [80, 160, 320, 480, 640];
+
+export type ImageSlot = 'card' | 'featured' | 'sidebar' | 'modal' | 'sheet';
+
+export interface ImageSources {
+  src: string;
+  sizes: string;
+  avif: string;
+  webp: string;
+  jpeg: string;
+}
+
+// Every slot renders with object-contain inside a fixed-height box, so the
+// display width is bounded by the box rather than the viewport.
+const SLOTS: Record<ImageSlot, { sizes: string; widths: number[] }> = {
+  card: { sizes: '240px', widths: [160, 320, 480] },
+  featured: { sizes: '320px', widths: [320, 480, 640] },
+  sidebar: { sizes: '80px', widths: [80, 160] },
+  modal: { sizes: '320px', widths: [320, 480, 640] },
+  sheet: { sizes: '160px', widths: [160, 320, 480] }
+};
+
+const variantUrl = (proxy: string, imageUrl: string, width: number, format: string) =>
+  `${proxy}?url=${encodeURIComponent(imageUrl)}&w=${width}&f=${format}`;
+
+const srcSet = (proxy: string, imageUrl: string, widths: number[], format: string) =>
+  widths.map(width => `${variantUrl(proxy, imageUrl, width, format)} ${width}w`).join(', ');
+
+/**
+ * Build resized AVIF/WebP/JPEG srcsets for a deal image, or null when the
+ * image cannot go through the proxy (no proxy configured, local files, data URLs).
+ */
+export const getImageSources = (
+  imageUrl: string,
+  slot: ImageSlot,
+  proxy?: string
+): ImageSources | null => {
+  if (!proxy || !/^https:\/\//.test(imageUrl)) {
+    return null;
+  }
+
+  const { sizes, widths } = SLOTS[slot];
+  return {
+    src: variantUrl(proxy, imageUrl, widths[widths.length - 1], 'jpeg'),
+    sizes,
+    avif: srcSet(proxy, imageUrl, widths, 'avif'),
+    webp: srcSet(proxy, imageUrl, widths, 'webp'),
+    jpeg: srcSet(proxy, imageUrl, widths, 'jpeg')
+  };
+};
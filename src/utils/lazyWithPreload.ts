@@ -0,0 +1,29 @@
+import React from 'react';
+
+export type PreloadableComponent<T extends React.ComponentType<any>> = React.LazyExoticComponent<T> & {
+  preload: () => Promise<{ default: T }>;
+};
+
+/**
+ * React.lazy with a preload() that starts fetching the chunk early, e.g. on
+ * hover, so the component renders without a fallback when it is needed.
+ */
+export function lazyWithPreload<T extends React.ComponentType<any>>(
+  factory: () => Promise<{ default: T }>
+): PreloadableComponent<T> {
+  let pending: Promise<{ default: T }> | null = null;
+
+  const load = () => {
+    if (!pending) {
+      pending = factory();
+      pending.catch(() => {
+        pending = null;
+      });
+    }
+    return pending;
+  };
+
+  const Component = React.lazy(load) as PreloadableComponent<T>;
+  Component.preload = load;
+  return Component;
+}
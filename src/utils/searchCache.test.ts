@@ -0,0 +1,70 @@
+import { SearchCache } from './searchCache';
+
+describe('SearchCache', () => {
+  it('keeps typed and finished words apart', () => {
+    const cache = new SearchCache<string>();
+    cache.set(['air'], true, 'typing', 1);
+    cache.set(['air'], false, 'finished', 1);
+
+    expect(cache.get(['air'], true)).toBe('typing');
+    expect(cache.get(['air'], false)).toBe('finished');
+  });
+
+  it('evicts the least recently used query past 64 entries', () => {
+    const cache = new SearchCache<number>();
+    for (let i = 0; i < 64; i++) {
+      cache.set([`q${i}`], false, i, 1);
+    }
+
+    // Reading q0 makes q1 the oldest
+    expect(cache.get(['q0'], false)).toBe(0);
+    cache.set(['q64'], false, 64, 1);
+
+    expect(cache.get(['q1'], false)).toBeUndefined();
+    expect(cache.get(['q0'], false)).toBe(0);
+    expect(cache.get(['q64'], false)).toBe(64);
+  });
+
+  it('evicts by cached positions as well as by count', () => {
+    const cache = new SearchCache<string>();
+    cache.set(['a'], false, 'a', 150000);
+    cache.set(['b'], false, 'b', 90000);
+    cache.set(['c'], false, 'c', 20000);
+
+    expect(cache.get(['a'], false)).toBeUndefined();
+    expect(cache.get(['b'], false)).toBe('b');
+    expect(cache.get(['c'], false)).toBe('c');
+  });
+
+  it('counts a replaced entry once', () => {
+    const cache = new SearchCache<string>();
+    cache.set(['a'], false, 'first', 200000);
+    cache.set(['a'], false, 'second', 200000);
+    cache.set(['b'], false, 'b', 40000);
+
+    expect(cache.get(['a'], false)).toBe('second');
+    expect(cache.get(['b'], false)).toBe('b');
+  });
+
+  it('finds the earlier queries a new one refines, smallest first', () => {
+    const cache = new SearchCache<string>();
+    cache.set(['ai'], true, 'ai', 30);
+    cache.set(['air'], true, 'air', 10);
+    cache.set(['ninja'], false, 'ninja', 5);
+    cache.set(['air', 'fr'], true, 'air fr', 3);
+
+    expect(cache.refinements(['airf'])).toEqual(['air', 'ai']);
+    expect(cache.refinements(['air', 'fryer'])).toEqual(['air fr', 'air', 'ai']);
+    expect(cache.refinements(['ninja', 'air'])).toEqual(['ninja']);
+    expect(cache.refinements(['fryer'])).toEqual([]);
+  });
+
+  it('forgets everything on clear', () => {
+    const cache = new SearchCache<string>();
+    cache.set(['air'], true, 'air', 1);
+    cache.clear();
+
+    expect(cache.get(['air'], true)).toBeUndefined();
+    expect(cache.refinements(['airf'])).toEqual([]);
+  });
+});
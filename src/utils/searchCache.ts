@@ -0,0 +1,95 @@
+/**
+ * Bounded LRU of recent search results, keyed by the normalized query words.
+ * Besides answering repeats outright (backspacing back to an earlier query),
+ * it finds the earlier results a new query refines: the same words with the
+ * last one possibly extended, and maybe more words after it. Typing "air",
+ * "airf", "airfr" then only ever searches within the previous hits.
+ */
+
+const MAX_ENTRIES = 64;
+// Short queries can match most of the catalog, so the budget counts positions too
+const MAX_POSITIONS = 250000;
+
+interface CacheEntry<T> {
+  words: string[];
+  value: T;
+  size: number;
+}
+
+export class SearchCache<T> {
+  private readonly entries = new Map<string, CacheEntry<T>>();
+  private cachedPositions = 0;
+
+  get(words: string[], typing: boolean): T | undefined {
+    const key = cacheKey(words, typing);
+    const entry = this.entries.get(key);
+
+    if (entry) {
+      // Map iteration order is least recently used first
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+    }
+
+    return entry?.value;
+  }
+
+  set(words: string[], typing: boolean, value: T, size: number) {
+    const key = cacheKey(words, typing);
+    const previous = this.entries.get(key);
+
+    if (previous) {
+      this.entries.delete(key);
+      this.cachedPositions -= previous.size;
+    }
+
+    this.entries.set(key, { words, value, size });
+    this.cachedPositions += size;
+
+    for (const [oldest, entry] of this.entries) {
+      if (this.entries.size <= MAX_ENTRIES && this.cachedPositions <= MAX_POSITIONS) {
+        break;
+      }
+      this.entries.delete(oldest);
+      this.cachedPositions -= entry.size;
+    }
+  }
+
+  // Cached results that words narrows down, smallest first
+  refinements(words: string[]): T[] {
+    const found: Array<CacheEntry<T>> = [];
+
+    this.entries.forEach(entry => {
+      if (refines(words, entry.words)) {
+        found.push(entry);
+      }
+    });
+
+    return found.sort((a, b) => a.size - b.size).map(entry => entry.value);
+  }
+
+  clear() {
+    this.entries.clear();
+    this.cachedPositions = 0;
+  }
+}
+
+function cacheKey(words: string[], typing: boolean): string {
+  return `${typing ? '~' : '='}${words.join(' ')}`;
+}
+
+// True when words repeats earlier, except that its last shared word may be longer
+function refines(words: string[], earlier: string[]): boolean {
+  const last = earlier.length - 1;
+
+  if (last < 0 || earlier.length > words.length) {
+    return false;
+  }
+
+  for (let i = 0; i < last; i++) {
+    if (words[i] !== earlier[i]) {
+      return false;
+    }
+  }
+
+  return words[last].startsWith(earlier[last]);
+}
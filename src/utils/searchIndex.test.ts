@@ -0,0 +1,114 @@
+import { SearchCache } from './searchCache';
+import { CachedSearch, SearchIndex, editDistance, findMatches, searchIndex } from './searchIndex';
+
+// Positions run well past the ones used, so earlier hits stay under the share
+// of the catalog below which refined queries are ranked within them
+const index: SearchIndex = {
+  version: 'test',
+  fields: ['title'],
+  total: 100,
+  terms: ['air', 'airfryer', 'airpods', 'apple', 'chair', 'fryer', 'hair', 'ninja', 'phone'],
+  postings: [
+    [7],
+    [1, 2, 7, 9],
+    [3],
+    [3, 4],
+    [5],
+    [2, 6],
+    [8],
+    [1, 2, 6, 7, 9],
+    [4]
+  ],
+  scores: [
+    [2],
+    [1.5, 0.5, 1, 2.5],
+    [1],
+    [1, 2],
+    [1],
+    [1, 1],
+    [1],
+    [0.5, 2, 1, 1.5, 0.25],
+    [1]
+  ]
+};
+
+const search = (query: string, cache?: SearchCache<CachedSearch>) => searchIndex(index, query, cache);
+
+describe('searchIndex', () => {
+  it('matches the word being typed as a prefix', () => {
+    const hits = search('airfr');
+    expect(hits.positions.sort()).toEqual([1, 2, 7, 9]);
+    expect(hits.terms).toEqual(['airfryer']);
+  });
+
+  it('ranks an exact match above prefix matches of equal impact', () => {
+    const hits = search('air');
+    expect(hits.terms.sort()).toEqual(['air', 'airfryer', 'airpods']);
+    expect(hits.positions[0]).toBe(7);
+  });
+
+  it('only takes finished words as typed', () => {
+    expect(search('airfr ').positions).toEqual([]);
+  });
+
+  it('forgives a typo or a swapped pair in longer words', () => {
+    expect(search('airf ').terms).toEqual(['air']);
+    expect(search('ninjq ').positions.sort()).toEqual([1, 2, 6, 7, 9]);
+    expect(search('fryre ').terms).toEqual(['fryer']);
+  });
+
+  it('needs short words spelled right', () => {
+    expect(search('aor ').positions).toEqual([]);
+  });
+
+  it('requires every word to match, best score first and ties newest first', () => {
+    expect(search('ninja airfryer ').positions).toEqual([9, 2, 7, 1]);
+    expect(search('ninja fryer').positions).toEqual([2, 6]);
+  });
+
+  it('ranks refined queries within earlier hits exactly as from scratch', () => {
+    const cache = new SearchCache<CachedSearch>();
+    ['ni', 'nin', 'ninja', 'ninja ', 'ninja ai', 'ninja air', 'ninja airf', 'ninja airfryer '].forEach(query => {
+      expect(search(query, cache)).toEqual(search(query));
+    });
+  });
+
+  it('does not seed a refined query from hits that missed its new typo matches', () => {
+    const cache = new SearchCache<CachedSearch>();
+    // "chai" is too short for a fuzzy prefix; "chair" also reaches "hair"
+    expect(search('chai', cache).positions).toEqual([5]);
+    const refined = search('chair', cache);
+    expect(refined.terms.sort()).toEqual(['chair', 'hair']);
+    expect(refined).toEqual(search('chair'));
+  });
+
+  it('answers repeats from the cache', () => {
+    const cache = new SearchCache<CachedSearch>();
+    expect(search('apple', cache)).toBe(search('apple', cache));
+  });
+});
+
+describe('editDistance', () => {
+  it('counts an adjacent swap as one edit and stops past the limit', () => {
+    expect(editDistance('fryer', 'fryre', 2)).toBe(1);
+    expect(editDistance('ninja', 'ninja', 2)).toBe(0);
+    expect(editDistance('apple', 'phone', 1)).toBe(2);
+  });
+});
+
+describe('findMatches', () => {
+  it('returns offsets into the original accented text', () => {
+    const text = 'Crème brûlée à la française';
+    expect(findMatches(text, ['creme', 'brulee', 'francaise']).map(([start, end]) => text.slice(start, end)))
+      .toEqual(['Crème', 'brûlée', 'française']);
+  });
+
+  it('keeps combining accents and ligatures inside the word', () => {
+    expect(findMatches('Créme', ['creme'])).toEqual([[0, 6]]);
+    expect(findMatches('Cœur de bœuf', ['coeur', 'boeuf'])).toEqual([[0, 4], [8, 12]]);
+  });
+
+  it('skips words that are not among the terms', () => {
+    expect(findMatches('Ninja air fryer', ['fryer'])).toEqual([[10, 15]]);
+  });
+});
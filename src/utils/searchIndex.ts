@@ -0,0 +1,516 @@
+import { SearchCache } from './searchCache';
+
+/**
+ * Client side of the prebuilt search index (see scripts/lib/searchIndex.js).
+ * Queries are normalized with the same rules used at publish time, so accented
+ * French titles match whether or not the shopper types the accents.
+ *
+ * Each query word expands to the indexed terms it could mean: itself, the
+ * terms it is a prefix of while it is being typed, and terms within one or two
+ * typos, found through an n-gram index over the term list and confirmed by
+ * edit distance. Hits are ranked by the BM25F impacts stored with the postings,
+ * scaled down for prefix and typo matches.
+ */
+
+export interface SearchIndex {
+  format?: string;
+  version: string;
+  fields: string[];
+  total: number;
+  terms: string[];
+  postings: number[][];
+  // BM25F impact of each posting; absent in indexes published before ranking
+  scores?: number[][];
+}
+
+export interface SearchHits {
+  // Matching positions, best match first
+  positions: number[];
+  // Indexed terms the query matched, for highlighting
+  terms: string[];
+}
+
+export interface Expansion {
+  term: number;
+  weight: number;
+}
+
+// Keep in sync with STOP_WORDS in scripts/lib/searchIndex.js
+const STOP_WORDS = new Set([
+  'and', 'the', 'for', 'with', 'of', 'to', 'in', 'on', 'or', 'by', 'an', 'at',
+  'et', 'le', 'la', 'les', 'de', 'des', 'du', 'un', 'une', 'pour', 'avec', 'en', 'au', 'aux'
+]);
+
+const indexCache = new Map<string, Promise<SearchIndex>>();
+
+export function normalizeText(text: string): string {
+  return (text || '')
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/œ/g, 'oe')
+    .replace(/æ/g, 'ae');
+}
+
+export function tokenize(text: string): string[] {
+  return normalizeText(text)
+    .split(/[^a-z0-9]+/)
+    .filter(token => token.length > 1 && !STOP_WORDS.has(token));
+}
+
+export function loadSearchIndex(url: string): Promise<SearchIndex> {
+  let pending = indexCache.get(url);
+
+  if (!pending) {
+    pending = fetch(url).then(response => {
+      if (!response.ok) {
+        throw new Error(`Failed to load search index: ${response.status}`);
+      }
+      return response.json() as Promise<SearchIndex>;
+    });
+    pending.catch(() => indexCache.delete(url));
+    indexCache.set(url, pending);
+  }
+
+  return pending;
+}
+
+// Relative weight of a hit by how the query word matched the indexed term
+const PREFIX_WEIGHT = 0.8;
+const TYPO_WEIGHTS = [1, 0.6, 0.4];
+
+// Earlier hits covering more of the catalog than this are cheaper to rank from scratch
+const NARROW_RATIO = 1 / 4;
+
+// Words shorter than this must be spelled right; longer ones allow a second typo
+const MIN_TYPO_LENGTH = 4;
+const TWO_TYPO_LENGTH = 8;
+
+// First index in the sorted term list that is >= term
+function lowerBound(terms: string[], term: string): number {
+  let low = 0;
+  let high = terms.length;
+
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (terms[mid] < term) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+
+  return low;
+}
+
+function allowedTypos(word: string): number {
+  return word.length >= TWO_TYPO_LENGTH ? 2 : word.length >= MIN_TYPO_LENGTH ? 1 : 0;
+}
+
+// Padded with ^ and $ so the first and last letters count as much as the middle
+function ngrams(word: string, size: number, open = false): string[] {
+  const padded = `^${word}${open ? '' : '$'}`;
+  const grams: string[] = [];
+  for (let i = 0; i + size <= padded.length; i++) {
+    grams.push(padded.slice(i, i + size));
+  }
+  return grams;
+}
+
+/**
+ * Last row of the optimal string alignment table (Levenshtein plus adjacent
+ * transpositions) between a and b: entry j is the distance from a to the first
+ * j letters of b. Returns null as soon as every entry must exceed max.
+ */
+function distanceRow(a: string, b: string, max: number): number[] | null {
+  let previous2: number[] = [];
+  let previous: number[] = [];
+  for (let j = 0; j <= b.length; j++) {
+    previous.push(j);
+  }
+
+  for (let i = 1; i <= a.length; i++) {
+    const current = [i];
+    let rowMin = i;
+
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+      let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+      if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+        value = Math.min(value, previous2[j - 2] + 1);
+      }
+      current.push(value);
+      rowMin = Math.min(rowMin, value);
+    }
+
+    if (rowMin > max) {
+      return null;
+    }
+    previous2 = previous;
+    previous = current;
+  }
+
+  return previous;
+}
+
+// Edit distance between a and b, or max + 1 once it is known to be larger
+export function editDistance(a: string, b: string, max: number): number {
+  if (Math.abs(a.length - b.length) > max) {
+    return max + 1;
+  }
+  const row = distanceRow(a, b, max);
+  return row ? Math.min(row[b.length], max + 1) : max + 1;
+}
+
+// n-gram -> indexes of the terms containing it, built once per index and size on the first typo
+const gramIndexes = new WeakMap<SearchIndex, Map<string, number[]>[]>();
+
+function gramIndexFor(index: SearchIndex, size: number): Map<string, number[]> {
+  let bySize = gramIndexes.get(index);
+  if (!bySize) {
+    bySize = [];
+    gramIndexes.set(index, bySize);
+  }
+
+  let grams = bySize[size];
+  if (!grams) {
+    const built = new Map<string, number[]>();
+    for (let term = 0; term < index.terms.length; term++) {
+      new Set(ngrams(index.terms[term], size)).forEach(gram => {
+        const list = built.get(gram);
+        if (list) {
+          list.push(term);
+        } else {
+          built.set(gram, [term]);
+        }
+      });
+    }
+    bySize[size] = built;
+    grams = built;
+  }
+
+  return grams;
+}
+
+/**
+ * Terms sharing enough n-grams with word to be within maxTypos of it (or of
+ * one of its prefixes when open). One edit breaks at most four trigrams or
+ * three bigrams, counting swapped letters, so trigrams are used when that
+ * bound still rules terms out and bigrams for shorter words.
+ */
+function typoCandidates(index: SearchIndex, word: string, maxTypos: number, open: boolean): number[] {
+  let size = 3;
+  let grams = ngrams(word, 3, open);
+  let needed = grams.length - 4 * maxTypos;
+
+  if (needed < 1) {
+    size = 2;
+    grams = ngrams(word, 2, open);
+    needed = grams.length - 3 * maxTypos;
+  }
+
+  const gramIndex = gramIndexFor(index, size);
+  const counts = new Uint8Array(index.terms.length);
+  const candidates: number[] = [];
+
+  new Set(grams).forEach(gram => {
+    (gramIndex.get(gram) || []).forEach(term => {
+      counts[term] += 1;
+      if (counts[term] === needed) {
+        candidates.push(term);
+      }
+    });
+  });
+
+  return candidates;
+}
+
+// Indexed terms within the allowed typos of word, or of its start while it is being typed
+function typoMatches(index: SearchIndex, word: string, typing: boolean, found: Map<number, number>) {
+  const maxTypos = allowedTypos(word);
+
+  if (maxTypos === 0) {
+    return;
+  }
+
+  // Short words being typed match too much as fuzzy prefixes
+  const open = typing && word.length > MIN_TYPO_LENGTH;
+
+  typoCandidates(index, word, maxTypos, open).forEach(term => {
+    const candidate = index.terms[term];
+    if (found.has(term) || candidate.length < word.length - maxTypos) {
+      return;
+    }
+    if (!open && candidate.length > word.length + maxTypos) {
+      return;
+    }
+
+    // One table gives both the distance to the whole term and to its best prefix
+    const compared = open ? candidate.slice(0, word.length + maxTypos) : candidate;
+    const row = distanceRow(word, compared, maxTypos);
+    if (!row) {
+      return;
+    }
+
+    const whole = compared.length === candidate.length ? row[candidate.length] : maxTypos + 1;
+    let prefix = maxTypos + 1;
+    if (open) {
+      for (let j = Math.max(1, word.length - maxTypos); j <= compared.length; j++) {
+        prefix = Math.min(prefix, row[j]);
+      }
+    }
+
+    const weight = Math.max(
+      whole <= maxTypos ? TYPO_WEIGHTS[whole] : 0,
+      prefix <= maxTypos ? TYPO_WEIGHTS[prefix] * PREFIX_WEIGHT : 0
+    );
+    if (weight > 0) {
+      found.set(term, weight);
+    }
+  });
+}
+
+// Every indexed term a query word may stand for, with how much a hit on it counts
+function expandWord(index: SearchIndex, word: string, typing: boolean): Expansion[] {
+  const found = new Map<number, number>();
+  const start = lowerBound(index.terms, word);
+
+  if (index.terms[start] === word) {
+    found.set(start, 1);
+  }
+
+  // The word being typed matches every indexed term it is a prefix of
+  if (typing) {
+    for (let i = start; i < index.terms.length && index.terms[i].startsWith(word); i++) {
+      if (!found.has(i)) {
+        found.set(i, PREFIX_WEIGHT);
+      }
+    }
+  }
+
+  typoMatches(index, word, typing, found);
+
+  return Array.from(found.entries()).map(([term, weight]) => ({ term, weight }));
+}
+
+function postingCount(index: SearchIndex, expansions: Expansion[]): number {
+  return expansions.reduce((sum, { term }) => sum + index.postings[term].length, 0);
+}
+
+function rarestFirst(index: SearchIndex, expansions: Expansion[][]): Expansion[][] {
+  return expansions.slice().sort((a, b) => postingCount(index, a) - postingCount(index, b));
+}
+
+// Index of position in a sorted posting list, or -1
+function postingIndex(postings: number[], position: number): number {
+  let low = 0;
+  let high = postings.length - 1;
+
+  while (low <= high) {
+    const mid = (low + high) >>> 1;
+    if (postings[mid] < position) {
+      low = mid + 1;
+    } else if (postings[mid] > position) {
+      high = mid - 1;
+    } else {
+      return mid;
+    }
+  }
+
+  return -1;
+}
+
+function byScore(positions: number[], scoreOf: (position: number) => number): number[] {
+  return positions.sort((a, b) => scoreOf(b) - scoreOf(a) || a - b);
+}
+
+// Scores every deal the postings reach; ties go to the newest deal
+function rankAll(index: SearchIndex, expansions: Expansion[][]): number[] {
+  const scores = new Float64Array(index.total);
+  const best = new Float64Array(index.total);
+  // How many query words each position has matched so far
+  const matched = new Uint8Array(index.total);
+  let candidates: number[] = [];
+
+  rarestFirst(index, expansions).forEach((list, w) => {
+    const touched: number[] = [];
+
+    list.forEach(({ term, weight }) => {
+      const postings = index.postings[term];
+      const impacts = index.scores?.[term];
+
+      for (let i = 0; i < postings.length; i++) {
+        const position = postings[i];
+        if (matched[position] !== w) {
+          continue;
+        }
+        // A word counts once per deal, through its best matching term
+        const score = (impacts ? impacts[i] : 1) * weight;
+        if (best[position] === 0) {
+          touched.push(position);
+        }
+        if (score > best[position]) {
+          best[position] = score;
+        }
+      }
+    });
+
+    touched.forEach(position => {
+      matched[position] = w + 1;
+      scores[position] += best[position];
+      best[position] = 0;
+    });
+    candidates = touched;
+  });
+
+  return byScore(candidates, position => scores[position]);
+}
+
+/**
+ * Same scores as rankAll, but only for deals among earlier hits. Each word
+ * either walks its postings or looks every remaining hit up in them by binary
+ * search, whichever touches fewer entries, so a refined query costs about the
+ * size of the hits it starts from rather than the size of the catalog.
+ */
+function rankWithin(index: SearchIndex, expansions: Expansion[][], within: number[]): number[] {
+  const slots = new Map<number, number>();
+  within.forEach((position, slot) => slots.set(position, slot));
+
+  const scores = new Float64Array(within.length);
+  const best = new Float64Array(within.length);
+  const matched = new Uint8Array(within.length);
+  let alive = within.map((_, slot) => slot);
+
+  rarestFirst(index, expansions).forEach((list, w) => {
+    const lookupCost = alive.length * list.reduce(
+      (sum, { term }) => sum + Math.log2(index.postings[term].length + 1) + 1, 0
+    );
+
+    list.forEach(({ term, weight }) => {
+      const postings = index.postings[term];
+      const impacts = index.scores?.[term];
+      const offer = (slot: number, i: number) => {
+        const score = (impacts ? impacts[i] : 1) * weight;
+        if (score > best[slot]) {
+          best[slot] = score;
+        }
+      };
+
+      if (postings.length <= lookupCost) {
+        for (let i = 0; i < postings.length; i++) {
+          const slot = slots.get(postings[i]);
+          if (slot !== undefined && matched[slot] === w) {
+            offer(slot, i);
+          }
+        }
+      } else {
+        alive.forEach(slot => {
+          const i = postingIndex(postings, within[slot]);
+          if (i !== -1) {
+            offer(slot, i);
+          }
+        });
+      }
+    });
+
+    alive = alive.filter(slot => best[slot] > 0);
+    alive.forEach(slot => {
+      matched[slot] = w + 1;
+      scores[slot] += best[slot];
+    });
+    best.fill(0);
+  });
+
+  const rank = new Map<number, number>();
+  alive.forEach(slot => rank.set(within[slot], scores[slot]));
+  return byScore(alive.map(slot => within[slot]), position => rank.get(position)!);
+}
+
+export interface CachedSearch {
+  hits: SearchHits;
+  // The indexed terms each query word expanded to
+  expansions?: Expansion[][];
+}
+
+// Earlier hits can seed a refined query only if no word now matches a term it did not match then
+function narrows(expansions: Expansion[][], earlier: Expansion[][]): boolean {
+  return earlier.every((list, i) => {
+    const terms = new Set(list.map(({ term }) => term));
+    return expansions[i].every(({ term }) => terms.has(term));
+  });
+}
+
+/**
+ * Returns the deals matching every query word, best first (ties newest first),
+ * with the indexed terms that matched. All but the last word are taken as
+ * typed; the last one also matches as a prefix while the shopper is still
+ * typing it. With a cache, repeated queries are answered from it and refined
+ * ones are ranked within the earlier hits they narrow.
+ */
+export function searchIndex(index: SearchIndex, query: string, cache?: SearchCache<CachedSearch>): SearchHits {
+  const words = tokenize(query);
+  const typingLastWord = !/\s$/.test(query);
+
+  if (words.length === 0) {
+    return { positions: [], terms: [] };
+  }
+
+  const cached = cache?.get(words, typingLastWord);
+  if (cached) {
+    return cached.hits;
+  }
+
+  const expansions = words.map((word, i) => expandWord(index, word, typingLastWord && i === words.length - 1));
+  let positions: number[] = [];
+
+  if (expansions.every(list => list.length > 0)) {
+    // Adding a letter can let in typo matches the shorter word did not have, so check
+    const base = cache?.refinements(words).find(earlier =>
+      earlier.expansions !== undefined && narrows(expansions, earlier.expansions)
+    );
+    positions = base && base.hits.positions.length < index.total * NARROW_RATIO
+      ? rankWithin(index, expansions, base.hits.positions)
+      : rankAll(index, expansions);
+  }
+
+  const terms = new Set<string>();
+  expansions.forEach(list => list.forEach(({ term }) => terms.add(index.terms[term])));
+  const hits = { positions, terms: Array.from(terms) };
+
+  cache?.set(words, typingLastWord, { hits, expansions }, positions.length);
+  return hits;
+}
+
+/**
+ * Character ranges of text whose words are among the matched terms, as
+ * [start, end) offsets into the original string, accents and all.
+ */
+export function findMatches(text: string, terms: string[]): Array<[number, number]> {
+  const wanted = new Set(terms);
+  const ranges: Array<[number, number]> = [];
+  let word = '';
+  let start = -1;
+
+  const endWord = (end: number) => {
+    if (start !== -1 && wanted.has(word)) {
+      ranges.push([start, end]);
+    }
+    word = '';
+    start = -1;
+  };
+
+  for (let i = 0; i < (text || '').length; i++) {
+    const normalized = normalizeText(text[i]);
+    if (/^[a-z0-9]+$/.test(normalized)) {
+      if (start === -1) {
+        start = i;
+      }
+      word += normalized;
+    } else if (normalized !== '') {
+      endWord(i);
+    }
+  }
+  endWord((text || '').length);
+
+  return ranges;
+}
@@ -0,0 +1,74 @@
+import { isPrerendering } from './bootData';
+
+/**
+ * Registers public/sw.js when advanced.enablePWA is on, and removes it again
+ * when the flag is turned off so stale caches don't outlive the setting.
+ * Only active in production builds, like CRA's own service worker template.
+ */
+
+const SW_URL = '/sw.js';
+
+export interface CacheBucketStats {
+  hits: number;
+  misses: number;
+  hitRatio: number | null;
+}
+
+export type CacheStats = Record<'data' | 'static' | 'images', CacheBucketStats>;
+
+function isSupported(): boolean {
+  return process.env.NODE_ENV === 'production' && 'serviceWorker' in navigator && !isPrerendering();
+}
+
+export function registerServiceWorker() {
+  if (!isSupported()) {
+    return;
+  }
+
+  const register = () => {
+    navigator.serviceWorker.register(SW_URL).catch(err => {
+      console.error('Service worker registration failed:', err);
+    });
+  };
+
+  // Config usually arrives after the load event, but don't compete with it if not
+  if (document.readyState === 'complete') {
+    register();
+  } else {
+    window.addEventListener('load', register, { once: true });
+  }
+}
+
+export function unregisterServiceWorker() {
+  if (!('serviceWorker' in navigator)) {
+    return;
+  }
+
+  navigator.serviceWorker.getRegistrations()
+    .then(registrations => registrations
+      .filter(registration => registration.active?.scriptURL.endsWith(SW_URL))
+      .forEach(registration => registration.unregister()))
+    .catch(err => {
+      console.warn('Service worker unregistration failed:', err);
+    });
+}
+
+// Asks the active service worker for its per-strategy cache hit ratios
+export function getCacheStats(): Promise<CacheStats | null> {
+  const controller = isSupported() ? navigator.serviceWorker.controller : null;
+
+  if (!controller) {
+    return Promise.resolve(null);
+  }
+
+  return new Promise(resolve => {
+    const channel = new MessageChannel();
+    const timeout = setTimeout(() => resolve(null), 2000);
+
+    channel.port1.onmessage = event => {
+      clearTimeout(timeout);
+      resolve(event.data.stats as CacheStats);
+    };
+    controller.postMessage({ type: 'GET_CACHE_STATS' }, [channel.port2]);
+  });
+}
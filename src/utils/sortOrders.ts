@@ -0,0 +1,158 @@
+import { Bitset, createBitset, hasBit } from './bitset';
+
+/**
+ * Client side of the listing orders written by scripts/lib/sorts.js. Each order
+ * is a permutation of positions, downloaded once per dataset version the first
+ * time a shopper picks something other than newest. A result set (search hits,
+ * filtered ids) is put in an order without re-sorting deals: small sets are
+ * sorted by each position's rank, large ones are produced by walking the
+ * permutation and keeping members, only as far as the rows on screen need.
+ * Everything sized by the catalog (orders, ranks, the membership bitset) is
+ * allocated once when the file loads; switching order or result set only
+ * allocates for the result set itself.
+ */
+
+export type SortKey = 'newest' | 'discount' | 'price' | 'savings' | 'popularity';
+
+export const SORT_OPTIONS: { key: SortKey; label: string }[] = [
+  { key: 'newest', label: 'Newest' },
+  { key: 'discount', label: 'Biggest discount' },
+  { key: 'price', label: 'Lowest price' },
+  { key: 'savings', label: 'Highest savings' },
+  { key: 'popularity', label: 'Most popular' }
+];
+
+export interface SortsPayload {
+  format: 'sorts-v1';
+  version: string;
+  total: number;
+  orders: Record<string, number[]>;
+}
+
+// Below this share of the catalog, sorting members by rank beats walking the permutation
+const SMALL_SET_RATIO = 1 / 16;
+
+/**
+ * Positions of one result set in one order, produced on demand. take(limit)
+ * only advances as far as needed to return the first `limit` positions.
+ */
+export class SortedView {
+  readonly total: number;
+  private readonly collected: number[] = [];
+  private cursor = 0;
+
+  constructor(
+    private readonly order: Int32Array,
+    private readonly members: Bitset | null,
+    total: number,
+    presorted: number[] | null = null
+  ) {
+    this.total = total;
+    if (presorted) {
+      this.collected = presorted;
+      this.cursor = order.length;
+    }
+  }
+
+  take(limit: number): number[] {
+    const wanted = Math.min(limit, this.total);
+    const { order, members, collected } = this;
+
+    while (collected.length < wanted && this.cursor < order.length) {
+      const position = order[this.cursor++];
+      if (!members || hasBit(members, position)) {
+        collected.push(position);
+      }
+    }
+
+    return collected.slice(0, wanted);
+  }
+}
+
+export class SortOrders {
+  readonly version: string;
+  readonly total: number;
+  private readonly orders = new Map<string, Int32Array>();
+  private readonly ranks = new Map<string, Int32Array>();
+  // Membership of the last large result set. The buffer is shared, so only the
+  // latest view from view() may be advanced; switching sets clears just the old
+  // members' bits instead of allocating a new bitset.
+  private readonly bits: Bitset;
+  private lastMembers: ArrayLike<number> | null = null;
+
+  constructor(payload: SortsPayload) {
+    this.version = payload.version;
+    this.total = payload.total;
+    this.bits = createBitset(payload.total);
+    Object.keys(payload.orders).forEach(key => {
+      const order = Int32Array.from(payload.orders[key]);
+      const rank = new Int32Array(order.length);
+      for (let i = 0; i < order.length; i++) {
+        rank[order[i]] = i;
+      }
+      this.orders.set(key, order);
+      this.ranks.set(key, rank);
+    });
+  }
+
+  has(key: SortKey): boolean {
+    return this.orders.has(key);
+  }
+
+  private membership(members: ArrayLike<number>): Bitset {
+    const { bits, lastMembers } = this;
+    if (members !== lastMembers) {
+      if (lastMembers) {
+        for (let i = 0; i < lastMembers.length; i++) {
+          bits[lastMembers[i] >>> 5] = 0;
+        }
+      }
+      for (let i = 0; i < members.length; i++) {
+        bits[members[i] >>> 5] |= 1 << (members[i] & 31);
+      }
+      this.lastMembers = members;
+    }
+    return bits;
+  }
+
+  // `members` null means the whole catalog
+  view(key: SortKey, members: ArrayLike<number> | null): SortedView | null {
+    const order = this.orders.get(key);
+    if (!order) {
+      return null;
+    }
+
+    if (!members) {
+      return new SortedView(order, null, order.length);
+    }
+
+    if (members.length < this.total * SMALL_SET_RATIO) {
+      const rank = this.ranks.get(key) as Int32Array;
+      const sorted = Array.from(members).sort((a, b) => rank[a] - rank[b]);
+      return new SortedView(order, null, sorted.length, sorted);
+    }
+
+    return new SortedView(order, this.membership(members), members.length);
+  }
+}
+
+const sortsCache = new Map<string, Promise<SortOrders>>();
+
+export function loadSortOrders(url: string): Promise<SortOrders> {
+  let pending = sortsCache.get(url);
+
+  if (!pending) {
+    pending = fetch(url)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Failed to load sort orders: ${response.status}`);
+        }
+        return response.json() as Promise<SortsPayload>;
+      })
+      .then(payload => new SortOrders(payload));
+    pending.catch(() => sortsCache.delete(url));
+    sortsCache.set(url, pending);
+  }
+
+  return pending;
+}
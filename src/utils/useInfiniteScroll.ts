@@ -0,0 +1,34 @@
+import { useEffect, useRef } from 'react';
+
+// Calls onReachEnd whenever the returned sentinel element scrolls into view
+export function useInfiniteScroll<T extends HTMLElement = HTMLDivElement>(
+  onReachEnd: () => void,
+  enabled: boolean,
+  rootMargin: string = '600px'
+) {
+  const sentinelRef = useRef<T>(null);
+  const callbackRef = useRef(onReachEnd);
+
+  callbackRef.current = onReachEnd;
+
+  useEffect(() => {
+    const sentinel = sentinelRef.current;
+    if (!enabled || !sentinel) {
+      return;
+    }
+
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(entry => entry.isIntersecting)) {
+        callbackRef.current();
+      }
+    }, { rootMargin });
+
+    observer.observe(sentinel);
+
+    return () => {
+      observer.disconnect();
+    };
+  }, [enabled, rootMargin]);
+
+  return sentinelRef;
+}
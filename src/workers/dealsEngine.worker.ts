@@ -0,0 +1,76 @@
+/* eslint-disable no-restricted-globals */
+import { DealDataset, DealQuery, EngineRequest, EngineResponse, loadDealDataset, runDealQuery } from '../utils/dealQuery';
+
+/**
+ * Deals engine worker: holds the full dataset and answers search queries off the
+ * main thread. Queries are coalesced so a burst of keystrokes only runs the
+ * newest one; superseded requests never get a reply.
+ */
+
+const ctx = self as unknown as {
+  postMessage(message: EngineResponse, transfer?: Transferable[]): void;
+  onmessage: ((event: MessageEvent<EngineRequest>) => void) | null;
+};
+
+let datasetPromise: Promise<DealDataset> | null = null;
+let pendingQuery: { requestId: number; query: DealQuery } | null = null;
+let scheduled = false;
+
+function post(message: EngineResponse) {
+  if (message.type === 'result') {
+    ctx.postMessage(message, [message.ids.buffer, message.featuredIds.buffer]);
+  } else {
+    ctx.postMessage(message);
+  }
+}
+
+async function runPendingQuery() {
+  scheduled = false;
+
+  const next = pendingQuery;
+  pendingQuery = null;
+
+  if (!next || !datasetPromise) {
+    return;
+  }
+
+  try {
+    const dataset = await datasetPromise;
+
+    // A newer keystroke arrived while the dataset was loading
+    if (pendingQuery) {
+      return;
+    }
+
+    const { ids, featuredIds, terms } = runDealQuery(dataset, next.query);
+    post({ type: 'result', requestId: next.requestId, ids, featuredIds, terms });
+  } catch (error) {
+    post({
+      type: 'error',
+      requestId: next.requestId,
+      message: error instanceof Error ? error.message : 'Query failed'
+    });
+  }
+}
+
+ctx.onmessage = (event: MessageEvent<EngineRequest>) => {
+  const message = event.data;
+
+  if (message.type === 'load') {
+    datasetPromise = loadDealDataset(message.manifest);
+    datasetPromise
+      .then(dataset => post({ type: 'ready', version: dataset.manifest.version, total: dataset.table.total }))
+      .catch(error => post({ type: 'error', message: error instanceof Error ? error.message : 'Load failed' }));
+    return;
+  }
+
+  if (message.type === 'query') {
+    pendingQuery = { requestId: message.requestId, query: message.query };
+
+    // Defer so queued messages can replace this query before it runs
+    if (!scheduled) {
+      scheduled = true;
+      setTimeout(runPendingQuery, 0);
+    }
+  }
+};